@@ -27,7 +27,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserInDB:
         raise credentials_exception
 
     user_service = UserService()
-    user = await user_service.get_user_by_username(username)
+    user = await user_service.get_authenticated_user(username)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Kinds of values offered by autocomplete
+SOLUTION_NAMES = "solutions"
+TAG_NAMES = "tags"
+CATEGORY_NAMES = "categories"
+AUTOCOMPLETE_KINDS = (SOLUTION_NAMES, TAG_NAMES, CATEGORY_NAMES)
+
+
+_SEPARATORS = re.compile(r"[\s\-_/]+")
+
+
+def normalize(text: str) -> str:
+    """Normalize text for case-insensitive prefix matching, hyphens and underscores separate words"""
+    return _SEPARATORS.sub(" ", text.lower()).strip()
+
+
+def _inner_word_keys(value: str) -> List[str]:
+    """Suffixes of a value starting at its second and later words,
+    so "comp" matches "Docker Compose" as well as "Compass"."""
+    words = normalize(value).split(" ")
+    return [" ".join(words[i:]) for i in range(1, len(words))]
+
+
+class PrefixIndex:
+    """Case-insensitive prefix index over sorted arrays, searched with bisect.
+
+    Whole values and inner words are kept in separate arrays so values starting with
+    the prefix are found first, and each lookup stops after limit matches. Values are
+    reference counted, so a name shared by several solutions stays in the index until
+    the last one is removed.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.counts: Counter = Counter(values)
+        self.values: List[Tuple[str, str]] = sorted((normalize(value), value) for value in self.counts)
+        self.inner_words: List[Tuple[str, str]] = sorted(
+            (key, value) for value in self.counts for key in _inner_word_keys(value)
+        )
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add(self, value: str) -> None:
+        """Add a value, or increase its count if it is already indexed"""
+        self.counts[value] += 1
+        if self.counts[value] == 1:
+            insort(self.values, (normalize(value), value))
+            for key in _inner_word_keys(value):
+                insort(self.inner_words, (key, value))
+
+    def remove(self, value: str) -> None:
+        """Decrease the count of a value and drop it when it reaches zero"""
+        if self.counts.get(value, 0) <= 0:
+            return
+        self.counts[value] -= 1
+        if self.counts[value] == 0:
+            del self.counts[value]
+            self._delete(self.values, (normalize(value), value))
+            for key in _inner_word_keys(value):
+                self._delete(self.inner_words, (key, value))
+
+    @staticmethod
+    def _delete(keys: List[Tuple[str, str]], entry: Tuple[str, str]) -> None:
+        position = bisect_left(keys, entry)
+        if position < len(keys) and keys[position] == entry:
+            del keys[position]
+
+    def search(self, prefix: str, limit: int = 10) -> List[str]:
+        """Get up to limit values with a word starting with prefix, values starting with it first"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        matches: List[str] = []
+        for keys in (self.values, self.inner_words):
+            position = bisect_left(keys, (prefix, ""))
+            while position < len(keys) and len(matches) < limit:
+                key, value = keys[position]
+                if not key.startswith(prefix):
+                    break
+                if value not in matches:
+                    matches.append(value)
+                position += 1
+        return matches
+
+
+class AutocompleteIndex:
+    """In-memory prefix indexes of approved solution names, tag names and category names.
+
+    Loaded at startup, updated by the services on writes in this process and rebuilt
+    every SEARCH_INDEX_REFRESH_SECONDS to pick up writes from other worker processes.
+    Outside the application lifespan (e.g. scripts) it is loaded on first use.
+    """
+
+    def __init__(self):
+        self.indexes: Dict[str, PrefixIndex] = {kind: PrefixIndex() for kind in AUTOCOMPLETE_KINDS}
+        self.ready = False
+        self.db: Optional[AsyncIOMotorDatabase] = None
+        self.worker: Optional[asyncio.Task] = None
+
+    async def load(self, db: AsyncIOMotorDatabase) -> None:
+        """Build fresh prefix indexes from the database and swap them in"""
+        solution_names = [
+            doc["name"] async for doc in db.solutions.find({"review_status": "APPROVED"}, {"name": 1})
+        ]
+        tag_names = [doc["name"] async for doc in db.tags.find({}, {"name": 1})]
+        category_names = [doc["name"] async for doc in db.categories.find({}, {"name": 1})]
+
+        self.indexes = {
+            SOLUTION_NAMES: PrefixIndex(solution_names),
+            TAG_NAMES: PrefixIndex(tag_names),
+            CATEGORY_NAMES: PrefixIndex(category_names),
+        }
+        self.db = db
+        self.ready = True
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        """Load the indexes and start the periodic rebuild"""
+        await self.load(db)
+        logger.info(
+            "Loaded autocomplete index with "
+            + ", ".join(f"{len(index)} {kind}" for kind, index in self.indexes.items())
+        )
+        if settings.SEARCH_INDEX_REFRESH_SECONDS > 0 and self.worker is None:
+            self.worker = asyncio.create_task(self._refresh())
+
+    async def stop(self) -> None:
+        """Stop the periodic rebuild"""
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+        self.ready = False
+
+    async def _refresh(self) -> None:
+        while True:
+            await asyncio.sleep(settings.SEARCH_INDEX_REFRESH_SECONDS)
+            try:
+                await self.load(self.db)
+            except Exception as e:
+                logger.error(f"Failed to rebuild autocomplete index: {str(e)}")
+
+    def add(self, kind: str, value: str) -> None:
+        """Add a value written in this process"""
+        if self.ready:
+            self.indexes[kind].add(value)
+
+    def remove(self, kind: str, value: str) -> None:
+        """Remove a value deleted in this process"""
+        if self.ready:
+            self.indexes[kind].remove(value)
+
+    def replace(self, kind: str, old_value: Optional[str], new_value: Optional[str]) -> None:
+        """Replace a renamed value, None stands for no value"""
+        if old_value == new_value:
+            return
+        if old_value is not None:
+            self.remove(kind, old_value)
+        if new_value is not None:
+            self.add(kind, new_value)
+
+    async def search(
+        self, db: AsyncIOMotorDatabase, prefix: str, kinds: Iterable[str] = AUTOCOMPLETE_KINDS, limit: int = 10
+    ) -> Dict[str, List[str]]:
+        """Get up to limit completions of prefix for each kind
+
+        Args:
+            db: Database to load the indexes from if they are not loaded yet
+            prefix: Text typed so far
+            kinds: Kinds of values to complete
+            limit: Maximum number of completions per kind
+
+        Returns:
+            Dictionary mapping each kind to its completions
+        """
+        if not self.ready:
+            await self.load(db)
+        return {kind: self.indexes[kind].search(prefix, limit) for kind in kinds}
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,141 @@
+import logging
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cache region names
+TAGS_CACHE = "tags"
+CATEGORIES_CACHE = "categories"
+AVATARS_CACHE = "avatars"
+AUTH_USERS_CACHE = "auth_users"
+USER_NAMES_CACHE = "user_names"
+TECH_RADAR_CACHE = "tech_radar"
+FUZZY_TERMS_CACHE = "fuzzy_terms"
+SOLUTION_FACETS_CACHE = "solution_facets"
+
+# Default (maxsize, ttl in seconds) for each cache region
+CACHE_REGIONS: Dict[str, Tuple[int, int]] = {
+    # Cleared on writes in this process, the TTL bounds staleness across workers
+    TAGS_CACHE: (100, 300),
+    CATEGORIES_CACHE: (100, 300),
+    AVATARS_CACHE: (1000, 86400),
+    AUTH_USERS_CACHE: (settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL_SECONDS),
+    USER_NAMES_CACHE: (5000, 300),
+    # Rebuilt on change in this process, the TTL bounds staleness across workers
+    TECH_RADAR_CACHE: (1, 300),
+    FUZZY_TERMS_CACHE: (1000, 3600),
+    # Keyed by filter, cleared on solution writes, the TTL bounds staleness across workers
+    SOLUTION_FACETS_CACHE: (256, 300),
+}
+
+_MISSING = object()
+
+
+class CacheRegion:
+    """A named, size-bounded TTL cache (least recently used entries are evicted first)
+    with hit/miss counters."""
+
+    def __init__(self, name: str, maxsize: int, ttl: int):
+        self.name = name
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, counting the lookup as a hit or a miss"""
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value in the cache"""
+        self.cache[key] = value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Remove a single key, or every entry if no key is given"""
+        if key is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(key, None)
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get usage statistics for this region"""
+        return {
+            "name": self.name,
+            "size": len(self.cache),
+            "maxsize": self.cache.maxsize,
+            "ttl": self.cache.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+class CacheRegistry:
+    """Application-scoped registry of named cache regions shared by all services"""
+
+    def __init__(self, regions: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.region_config = dict(CACHE_REGIONS if regions is None else regions)
+        self.regions: Dict[str, CacheRegion] = {}
+
+    def region(self, name: str) -> CacheRegion:
+        """Get a cache region by name, creating it on first use"""
+        if name not in self.regions:
+            maxsize, ttl = self.region_config.get(name, (100, 3600))
+            self.regions[name] = CacheRegion(name, maxsize=maxsize, ttl=ttl)
+        return self.regions[name]
+
+    def invalidate(self, *names: str) -> None:
+        """Clear the given regions. Regions that were never used are skipped."""
+        for name in names:
+            if name in self.regions:
+                self.regions[name].invalidate()
+
+    def clear(self) -> None:
+        """Clear every region"""
+        for region in self.regions.values():
+            region.invalidate()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get usage statistics for every region"""
+        return {name: region.stats() for name, region in self.regions.items()}
+
+
+class Caches:
+    registry: Optional[CacheRegistry] = None
+
+
+caches = Caches()
+
+
+def init_cache_registry() -> CacheRegistry:
+    """Create the application cache registry, called once at startup"""
+    caches.registry = CacheRegistry()
+    logger.info("Initialized cache registry")
+    return caches.registry
+
+
+def close_cache_registry() -> None:
+    """Log cache statistics and drop the application cache registry"""
+    if caches.registry is not None:
+        for name, stats in caches.registry.stats().items():
+            logger.info(f"Cache region '{name}': {stats['hits']} hits, {stats['misses']} misses")
+        caches.registry.clear()
+        caches.registry = None
+
+
+def get_cache_registry() -> CacheRegistry:
+    """Get the application cache registry.
+    Outside the application lifespan (e.g. scripts) a registry is created on first use."""
+    if caches.registry is None:
+        caches.registry = CacheRegistry()
+    return caches.registry
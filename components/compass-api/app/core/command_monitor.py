@@ -0,0 +1,112 @@
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo import monitoring
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.core.request_context import RequestContext, current_request
+
+logger = logging.getLogger(__name__)
+
+# Buckets in seconds, most commands finish within a few milliseconds
+COMMAND_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Fields holding the filter of a command, in the order they are looked up
+FILTER_FIELDS = ("filter", "query", "pipeline")
+
+# Fields holding the statements of bulk write commands and the filter key inside each statement
+STATEMENT_FIELDS = {"update": ("updates", "q"), "delete": ("deletes", "q")}
+
+mongodb_command_duration_seconds = metrics_registry.histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency in seconds by collection and command",
+    ("collection", "command"),
+    buckets=COMMAND_BUCKETS,
+)
+mongodb_command_failures_total = metrics_registry.counter(
+    "mongodb_command_failures_total", "Failed MongoDB commands by collection and command", ("collection", "command")
+)
+
+
+def redact(value: Any) -> Any:
+    """Replace the values of a filter with "?" keeping field names and operators,
+    so slow query logs show the query shape without user data"""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return "?"
+
+
+def command_collection(command_name: str, command: Dict[str, Any]) -> str:
+    """Get the collection a command runs against, "-" for database commands"""
+    if command_name == "getMore":
+        return command.get("collection", "-")
+    collection = command.get(command_name)
+    return collection if isinstance(collection, str) else "-"
+
+
+def command_filter(command_name: str, command: Dict[str, Any]) -> Any:
+    """Get the filter or pipeline of a command, None if it has none"""
+    if command_name in STATEMENT_FIELDS:
+        field, key = STATEMENT_FIELDS[command_name]
+        return [statement.get(key) for statement in command.get(field, [])]
+    for field in FILTER_FIELDS:
+        if field in command:
+            return command[field]
+    return None
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Records the latency of every MongoDB command and logs slow ones.
+
+    Registered on the Motor client, the callbacks run on Motor's executor threads
+    for every command, so they only keep a reference to the started command and do
+    the formatting for slow commands only.
+    """
+
+    def __init__(self, slow_command_ms: int):
+        self.slow_command_ms = slow_command_ms
+        # Started commands by (connection, request id): collection, command and request
+        self.pending: Dict[Tuple[Any, int], Tuple[str, Dict[str, Any], Optional[RequestContext]]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.pending[(event.connection_id, event.request_id)] = (
+            command_collection(event.command_name, event.command),
+            event.command,
+            current_request.get(),
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finished(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        started = self._finished(event)
+        if started is not None:
+            mongodb_command_failures_total.inc((started[0], event.command_name))
+
+    def _finished(self, event) -> Optional[Tuple[str, Dict[str, Any], Optional[RequestContext]]]:
+        started = self.pending.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return None
+
+        collection, command, request = started
+        duration = event.duration_micros / 1_000_000
+        mongodb_command_duration_seconds.observe((collection, event.command_name), duration)
+        if request is not None:
+            request.record_query(duration)
+
+        duration_ms = event.duration_micros / 1000
+        if self.slow_command_ms and duration_ms >= self.slow_command_ms:
+            query = command_filter(event.command_name, command)
+            logger.warning(
+                f"Slow MongoDB command: {event.command_name} on {event.database_name}.{collection} "
+                f"took {duration_ms:.0f}ms, request: {request.request if request else '-'}, "
+                f"filter: {json.dumps(redact(query)) if query is not None else '-'}"
+            )
+        return started
+
+
+command_monitor = CommandMonitor(settings.MONGODB_SLOW_COMMAND_MS)
@@ -10,6 +10,46 @@ class Settings(BaseSettings):
     MONGODB_TLS_CERT_PATH: Optional[str] = None
     MONGODB_TLS_CA_PATH: Optional[str] = None
     MONGODB_TLS_KEY_PATH: Optional[str] = None
+    MONGODB_ENSURE_INDEXES: bool = True
+    MONGODB_UNIQUE_INDEXES: bool = False
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGODB_COMPRESSORS: Optional[str] = None  # e.g. "zstd,snappy,zlib"
+    MONGODB_READ_PREFERENCE: str = "primary"
+    # Command latency metrics and slow command log, 0 disables the log
+    MONGODB_COMMAND_MONITORING: bool = True
+    MONGODB_SLOW_COMMAND_MS: int = 100
+
+    # History settings
+    HISTORY_WRITE_MODE: Literal["async", "sync"] = "async"
+    HISTORY_QUEUE_SIZE: int = 10000
+    HISTORY_BATCH_SIZE: int = 100
+    HISTORY_FLUSH_INTERVAL_MS: int = 500
+    # Retries of a failed batch insert, with exponential backoff starting at HISTORY_RETRY_BACKOFF_MS
+    HISTORY_WRITE_RETRIES: int = 3
+    HISTORY_RETRY_BACKOFF_MS: int = 100
+
+    # Authenticated user cache, kept short so deactivation takes effect on every worker quickly
+    AUTH_USER_CACHE_SIZE: int = 1000
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+
+    # Solution search: in-memory BM25 index or the MongoDB $text index
+    SEARCH_BACKEND: Literal["memory", "mongo"] = "memory"
+    SEARCH_INDEX_REFRESH_SECONDS: int = 300
+
+    # Password hashing settings
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_WAIT_WARNING_MS: int = 1000
+
+    # Request metrics exposed on /metrics
+    METRICS_ENABLED: bool = True
+
+    # Per-request MongoDB round trips: Server-Timing header and a warning over the budget, 0 disables it
+    SERVER_TIMING_ENABLED: bool = True
+    REQUEST_QUERY_BUDGET: int = 20
 
     # JWT settings
     JWT_SECRET_KEY: str
@@ -29,6 +69,15 @@ class Settings(BaseSettings):
     AVATAR_SERVER_URL: str = ""
     AVATAR_SERVER_ENABLED: bool = False
 
+    # Shared HTTP client for the auth and avatar servers
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_CLIENT_HTTP2: bool = False  # Requires the h2 package
+    HTTP_CLIENT_VERIFY_SSL: bool = False
+
     # Default Admin settings
     DEFAULT_ADMIN_USERNAME: str = "admin"
     DEFAULT_ADMIN_PASSWORD: str
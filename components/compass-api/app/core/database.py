@@ -1,11 +1,5 @@
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+# The application uses a single MongoDB client, created in connect_to_mongo() at startup.
+# This module is kept so existing imports of get_database keep working.
+from app.core.mongodb import get_database
 
-from app.core.config import settings
-
-client = AsyncIOMotorClient(settings.MONGODB_URL)
-database = client[settings.DATABASE_NAME]
-
-
-def get_database() -> AsyncIOMotorDatabase:
-    """Get database instance."""
-    return database
+__all__ = ["get_database"]
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Error code of inserts of a record that an earlier attempt already wrote
+DUPLICATE_KEY_ERROR = 11000
+
+
+class HistoryRecorder:
+    """Write-behind recorder for history records.
+
+    Records are put on a bounded in-process queue and a background task inserts them
+    in batches with insert_many. When the queue is full, callers wait for free space
+    instead of dropping records. While the recorder is not running (sync mode, tests,
+    scripts) records are written directly.
+
+    History is the audit log, so a failed batch is retried with exponential backoff
+    and then written one record at a time. Only records that still fail are dropped.
+    """
+
+    def __init__(self):
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.collection: Optional[AsyncIOMotorCollection] = None
+        self.batch_size = settings.HISTORY_BATCH_SIZE
+        self.flush_interval = settings.HISTORY_FLUSH_INTERVAL_MS / 1000
+        self.retries = settings.HISTORY_WRITE_RETRIES
+        self.retry_backoff = settings.HISTORY_RETRY_BACKOFF_MS / 1000
+        self.failed_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self.worker is not None and not self.worker.done()
+
+    def start(self, collection: AsyncIOMotorCollection) -> None:
+        """Start the background task that drains the queue"""
+        if self.running:
+            return
+        self.collection = collection
+        self.queue = asyncio.Queue(maxsize=settings.HISTORY_QUEUE_SIZE)
+        self.worker = asyncio.create_task(self._run())
+        logger.info("Started history recorder")
+
+    async def stop(self) -> None:
+        """Flush all queued records and stop the background task"""
+        if not self.running:
+            return
+        await self.queue.join()
+        self.worker.cancel()
+        try:
+            await self.worker
+        except asyncio.CancelledError:
+            pass
+        self.worker = None
+        logger.info("Stopped history recorder")
+
+    async def record(self, documents: List[Dict[str, Any]]) -> None:
+        """Queue history documents for insertion, waiting while the queue is full"""
+        for document in documents:
+            await self.queue.put(document)
+
+    async def _run(self) -> None:
+        """Collect queued records into batches and insert them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Insert a batch, retrying failed records with backoff and then one at a time"""
+        pending = batch
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                await self.collection.insert_many(pending, ordered=False)
+                return
+            except BulkWriteError as e:
+                # Unordered inserts write every record they can, only the failed ones are retried
+                failed = sorted(
+                    error["index"]
+                    for error in e.details.get("writeErrors", [])
+                    if error.get("code") != DUPLICATE_KEY_ERROR
+                )
+                if not failed and not e.details.get("writeConcernErrors"):
+                    return
+                if failed:
+                    pending = [pending[index] for index in failed]
+                error = str(e)
+            except Exception as e:
+                error = str(e)
+            logger.warning(f"Failed to write {len(pending)} history records (attempt {attempt + 1}): {error}")
+
+        # Write the remaining records one by one, so a single bad record doesn't drop the others
+        for document in pending:
+            try:
+                await self.collection.insert_one(document)
+            except DuplicateKeyError:
+                pass
+            except Exception as e:
+                self.failed_count += 1
+                logger.error(
+                    f"Dropped history record of {document.get('object_type')} {document.get('object_id')}: {str(e)}"
+                )
+
+
+history_recorder = HistoryRecorder()
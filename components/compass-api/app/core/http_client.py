@@ -0,0 +1,65 @@
+import logging
+from typing import Any, Dict
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClient:
+    client: httpx.AsyncClient = None
+
+
+http = HTTPClient()
+
+
+def get_http_client_options() -> Dict[str, Any]:
+    """Get connection pool, keep-alive, timeout and HTTP/2 options for the shared HTTP client."""
+    options = {
+        "verify": settings.HTTP_CLIENT_VERIFY_SSL,
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "timeout": httpx.Timeout(
+            settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+        ),
+    }
+
+    if settings.HTTP_CLIENT_HTTP2:
+        try:
+            import h2  # noqa: F401
+
+            options["http2"] = True
+        except ImportError:
+            logger.warning("HTTP_CLIENT_HTTP2 is enabled but the h2 package is not installed, using HTTP/1.1")
+
+    return options
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """Create the shared HTTP client, called once at startup"""
+    if http.client is None:
+        http.client = httpx.AsyncClient(**get_http_client_options())
+        logger.info("Created shared HTTP client")
+    return http.client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections"""
+    if http.client is not None:
+        await http.client.aclose()
+        http.client = None
+        logger.info("Closed shared HTTP client")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client.
+    Outside the application lifespan (e.g. scripts) the client is created on first use."""
+    if http.client is None:
+        http.client = httpx.AsyncClient(**get_http_client_options())
+    return http.client
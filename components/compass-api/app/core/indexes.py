@@ -0,0 +1,155 @@
+import logging
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Field weights for the solution text search index
+SOLUTION_TEXT_WEIGHTS = {
+    "name": 10,  # Highest priority
+    "brief": 8,  # Second priority
+    "description": 5,  # Third priority
+    "category": 3,
+    "department": 3,
+    "team": 3,
+    "maintainer_name": 2,
+    "pros": 1,
+    "cons": 1,
+}
+
+# Case-insensitive comparison of solution names
+NAME_COLLATION = {"locale": "en", "strength": 2}
+
+
+def build_index_manifest(enforce_unique: bool = False) -> Dict[str, List[IndexModel]]:
+    """Build the declarative list of indexes for each collection
+
+    Indexes backing keyset pagination end with _id, the tie breaker of every paginated sort.
+
+    Args:
+        enforce_unique: Whether natural keys (slug, username, names) get unique indexes
+
+    Returns:
+        Dictionary mapping collection names to their index models
+    """
+
+    def natural_key(keys: List[tuple]) -> IndexModel:
+        return IndexModel(keys, unique=enforce_unique)
+
+    return {
+        "solutions": [
+            natural_key([("slug", ASCENDING)]),
+            IndexModel([("name", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("rating", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("rating_count", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("name", ASCENDING)], name="name_ci", collation=NAME_COLLATION),
+            IndexModel([("category", ASCENDING)]),
+            IndexModel([("department", ASCENDING)]),
+            IndexModel([("tags", ASCENDING)]),
+            IndexModel([("review_status", ASCENDING), ("recommend_status", ASCENDING)]),
+            IndexModel([("recommend_status", ASCENDING)]),
+            IndexModel([("created_by", ASCENDING)]),
+            IndexModel([("maintainer_id", ASCENDING)]),
+            IndexModel(
+                [(field, TEXT) for field in SOLUTION_TEXT_WEIGHTS],
+                weights=SOLUTION_TEXT_WEIGHTS,
+            ),
+        ],
+        "ratings": [
+            natural_key([("solution_slug", ASCENDING), ("username", ASCENDING)]),
+            IndexModel([("solution_slug", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("username", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ],
+        "comments": [
+            IndexModel([("solution_slug", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("username", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ],
+        "users": [
+            natural_key([("username", ASCENDING)]),
+        ],
+        "history": [
+            IndexModel(
+                [("object_type", ASCENDING), ("object_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]
+            ),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ],
+        "tags": [
+            natural_key([("name", ASCENDING)]),
+            IndexModel([("usage_count", ASCENDING), ("name", ASCENDING)]),
+        ],
+        "categories": [
+            natural_key([("name", ASCENDING)]),
+            IndexModel([("radar_quadrant", ASCENDING), ("name", ASCENDING)]),
+        ],
+    }
+
+
+def _index_differs(expected: Dict[str, Any], existing: Dict[str, Any]) -> bool:
+    """Check whether an existing index has different keys or uniqueness than expected"""
+    expected_keys = list(expected["key"].items())
+    existing_keys = [(field, direction) for field, direction in existing["key"]]
+    if expected.get("weights"):
+        # Text indexes are stored as _fts/_ftsx keys, compare weights instead
+        return existing.get("weights") != expected["weights"]
+    return existing_keys != expected_keys or bool(existing.get("unique")) != bool(expected.get("unique"))
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> Dict[str, Dict[str, List[str]]]:
+    """Reconcile the index manifest with the database
+
+    Missing indexes are created. Indexes that exist with different options, and
+    indexes that are not in the manifest, are only reported so they can be fixed
+    manually without the API dropping indexes on startup.
+
+    Args:
+        db: The database to reconcile
+
+    Returns:
+        Dictionary mapping collection names to created, drifted, unknown and failed index names
+    """
+    manifest = build_index_manifest(enforce_unique=settings.MONGODB_UNIQUE_INDEXES)
+    report = {}
+
+    for collection_name, index_models in manifest.items():
+        collection = db[collection_name]
+        existing_indexes = await collection.index_information()
+        result = {"created": [], "drifted": [], "unknown": [], "failed": []}
+
+        expected_names = set()
+        for index_model in index_models:
+            expected = index_model.document
+            name = expected["name"]
+            expected_names.add(name)
+
+            if name in existing_indexes:
+                if _index_differs(expected, existing_indexes[name]):
+                    result["drifted"].append(name)
+                continue
+
+            try:
+                await collection.create_indexes([index_model])
+                result["created"].append(name)
+            except OperationFailure as e:
+                # e.g. duplicate values for a unique index or a conflicting text index
+                logger.error(f"Failed to create index {collection_name}.{name}: {str(e)}")
+                result["failed"].append(name)
+
+        result["unknown"] = [name for name in existing_indexes if name != "_id_" and name not in expected_names]
+
+        for name in result["created"]:
+            logger.info(f"Created index {collection_name}.{name}")
+        for name in result["drifted"]:
+            logger.warning(f"Index {collection_name}.{name} differs from the index manifest")
+        for name in result["unknown"]:
+            logger.warning(f"Index {collection_name}.{name} is not in the index manifest")
+
+        report[collection_name] = result
+
+    return report
@@ -1,8 +1,9 @@
 import logging
 from typing import Any, Dict
 
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
+from app.core.command_monitor import command_monitor
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -17,11 +18,26 @@ db = MongoDB()
 
 
 def get_mongodb_options() -> Dict[str, Any]:
-    """Get MongoDB connection options including TLS/SSL if certificates are provided."""
+    """Get MongoDB connection options including pool settings and TLS/SSL if certificates are provided."""
     options = {
-        "serverSelectionTimeoutMS": 5000  # 5 second timeout
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "readPreference": settings.MONGODB_READ_PREFERENCE,
     }
 
+    if settings.MONGODB_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.MONGODB_MAX_IDLE_TIME_MS
+
+    if settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS
+
+    if settings.MONGODB_COMPRESSORS:
+        options["compressors"] = settings.MONGODB_COMPRESSORS
+
+    if settings.MONGODB_COMMAND_MONITORING:
+        options["event_listeners"] = [command_monitor]
+
     # Add TLS/SSL options if certificates are provided
     if any(
         [
@@ -55,7 +71,10 @@ async def connect_to_mongo():
         # Verify the connection
         await db.client.server_info()
         db.db = db.client[settings.DATABASE_NAME]
-        logger.info(f"Connected to MongoDB database: {settings.DATABASE_NAME}")
+        logger.info(
+            f"Connected to MongoDB database: {settings.DATABASE_NAME} "
+            f"(maxPoolSize={options['maxPoolSize']}, minPoolSize={options['minPoolSize']})"
+        )
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {str(e)}")
         raise
@@ -65,12 +84,15 @@ async def close_mongo_connection():
     try:
         if db.client is not None:
             db.client.close()
+            db.client = None
+            db.db = None
             logger.info("Closed MongoDB connection")
     except Exception as e:
         logger.error(f"Error closing MongoDB connection: {str(e)}")
 
 
-def get_database():
+def get_database() -> AsyncIOMotorDatabase:
+    """Get the database of the shared, lifecycle-managed client"""
     if db.db is None:
         raise RuntimeError("Database not initialized. Make sure to call connect_to_mongo() first.")
     return db.db
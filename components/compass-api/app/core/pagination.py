@@ -0,0 +1,98 @@
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson import ObjectId, json_util
+from pymongo import ASCENDING, DESCENDING
+
+
+def encode_cursor(sort_value: Any, object_id: ObjectId) -> str:
+    """Encode the sort key and _id of the last item of a page into an opaque cursor"""
+    payload = json_util.dumps({"v": sort_value, "id": object_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    """Decode an opaque cursor into the sort key and _id it points after
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        object_id = payload["id"]
+        if not isinstance(object_id, ObjectId):
+            raise ValueError("Invalid cursor")
+        return payload["v"], object_id
+    except (binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(sort_field: str, sort_direction: int, cursor: str) -> Dict[str, Any]:
+    """Build a filter matching the items that come after the cursor in (sort_field, _id) order
+
+    Missing and null values sort before every other value, which is mirrored here so
+    items without a sort value are not skipped.
+    """
+    sort_value, object_id = decode_cursor(cursor)
+    after = "$gt" if sort_direction == ASCENDING else "$lt"
+    same_value = {sort_field: sort_value, "_id": {after: object_id}}
+
+    if sort_value is None:
+        if sort_direction == ASCENDING:
+            return {"$or": [same_value, {sort_field: {"$ne": None}}]}
+        return same_value
+
+    next_values = {sort_field: {after: sort_value}}
+    if sort_direction == DESCENDING:
+        next_values = {"$or": [next_values, {sort_field: None}]}
+    return {"$or": [next_values, same_value]}
+
+
+def apply_cursor(query: Dict[str, Any], sort_field: str, sort_direction: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict a query to the items after the cursor, if one is given"""
+    if not cursor:
+        return query
+    keyset = keyset_filter(sort_field, sort_direction, cursor)
+    return {"$and": [query, keyset]} if query else keyset
+
+
+async def count_page_total(collection: Any, query: Dict[str, Any], cursor: Optional[str]) -> Optional[int]:
+    """Count the items matching a query for a paginated response
+
+    Cursor pages return None, the total comes with the first page: counting every match
+    again would make each deep page cost a scan of the whole result. Without a filter the
+    count is taken from the collection metadata.
+    """
+    if cursor:
+        return None
+    if not query:
+        return await collection.estimated_document_count()
+    return await collection.count_documents(query)
+
+
+def keyset_sort(sort_field: str, sort_direction: int) -> List[Tuple[str, int]]:
+    """Sort specification with _id as tie breaker so cursors are stable"""
+    return [(sort_field, sort_direction), ("_id", sort_direction)]
+
+
+def next_page_cursor(items: Sequence[Any], limit: int, sort: str) -> Optional[str]:
+    """Build the cursor for the page after the given items
+
+    Args:
+        items: Items of the current page, models or documents
+        limit: Requested page size
+        sort: Sort parameter used for the page, prefixed with - for descending order
+
+    Returns:
+        The next cursor, or None if this is the last page
+    """
+    if not items or len(items) < limit:
+        return None
+
+    sort_field = sort.lstrip("-")
+    last = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last.get(sort_field), last["_id"])
+    return encode_cursor(getattr(last, sort_field, None), last.id)
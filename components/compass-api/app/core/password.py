@@ -1,7 +1,20 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
 from passlib.context import CryptContext
 
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash."""
@@ -11,3 +24,75 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return pwd_context.hash(password)
+
+
+password_hash_wait_seconds = metrics_registry.histogram(
+    "password_hash_wait_seconds", "Time password hashing calls waited for a worker in seconds"
+)
+password_hash_pending = metrics_registry.gauge(
+    "password_hash_pending", "Password hashing calls running or waiting for a worker"
+)
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated, bounded thread pool so it does not block the event loop.
+
+    At most PASSWORD_HASH_WORKERS hashes run at the same time, further calls wait in
+    the executor queue. The time calls spend waiting and the number of pending calls
+    are exposed on /metrics.
+    """
+
+    def __init__(self):
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> None:
+        """Create the executor, called once at startup"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+
+    def stop(self) -> None:
+        """Shut the executor down, waiting for running calls"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a password function in the executor, recording how long it waited for a worker"""
+        # Outside the application lifespan (e.g. scripts) the executor is created on first use
+        self.start()
+        submitted = time.perf_counter()
+        started = submitted
+
+        def timed() -> T:
+            # Only take the timestamp on the worker, metrics are updated on the event loop
+            nonlocal started
+            started = time.perf_counter()
+            return func(*args)
+
+        password_hash_pending.inc()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, timed)
+        finally:
+            password_hash_pending.dec()
+            self._record_wait(started - submitted)
+
+    def _record_wait(self, wait: float) -> None:
+        password_hash_wait_seconds.observe((), wait)
+        if wait * 1000 > settings.PASSWORD_HASH_WAIT_WARNING_MS:
+            pending = password_hash_pending.values.get((), 0)
+            logger.warning(f"Password hashing waited {wait * 1000:.0f} ms for a worker ({pending} pending)")
+
+
+password_hasher = PasswordHasher()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash without blocking the event loop."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash without blocking the event loop."""
+    return await password_hasher.run(get_password_hash, password)
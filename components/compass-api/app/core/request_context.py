@@ -0,0 +1,80 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestContext:
+    """The request being served and the MongoDB work done for it"""
+
+    __slots__ = ("request", "started_at", "queries", "db_seconds", "lock")
+
+    def __init__(self, request: str):
+        self.request = request
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def record_query(self, duration: float) -> None:
+        """Count a MongoDB round trip, called by the command monitor on Motor's executor threads"""
+        with self.lock:
+            self.queries += 1
+            self.db_seconds += duration
+
+    def server_timing(self) -> str:
+        """Format the Server-Timing header value: time in the database and in total so far"""
+        total_ms = (time.perf_counter() - self.started_at) * 1000
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f"total;dur={total_ms:.1f}"
+        )
+
+
+# Context of the request being served, None outside requests. Motor runs commands on its
+# executor with a copy of the caller's context, so command listeners see the request that
+# issued the command.
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+
+class RequestContextMiddleware:
+    """ASGI middleware tracking the MongoDB round trips of each request.
+
+    Adds a Server-Timing header with the number of queries and the time spent in the
+    database, and logs a warning when a request makes more than REQUEST_QUERY_BUDGET
+    queries, which usually means a query per item in a loop.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext(f"{scope['method']} {scope['path']}")
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.SERVER_TIMING_ENABLED:
+                MutableHeaders(scope=message).append("Server-Timing", context.server_timing())
+            await send(message)
+
+        token = current_request.set(context)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            if 0 < settings.REQUEST_QUERY_BUDGET < context.queries:
+                logger.warning(
+                    f"Request {context.request} made {context.queries} MongoDB queries "
+                    f"({context.db_seconds * 1000:.0f}ms), over the budget of {settings.REQUEST_QUERY_BUDGET}"
+                )
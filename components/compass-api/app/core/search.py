@@ -0,0 +1,449 @@
+import asyncio
+import heapq
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.core.cache import FUZZY_TERMS_CACHE, get_cache_registry
+from app.core.config import settings
+from app.core.indexes import SOLUTION_TEXT_WEIGHTS
+from app.models.solution import Solution
+
+logger = logging.getLogger(__name__)
+
+# Search results are grouped by recommend status (ADOPT first), other statuses come last
+RECOMMEND_STATUS_ORDER = {"ADOPT": 0, "TRIAL": 1, "ASSESS": 2, "HOLD": 3}
+
+# Fields of the in-memory index: the $text index fields plus tags, which fuzzy search corrects to
+SEARCH_FIELD_WEIGHTS = {**SOLUTION_TEXT_WEIGHTS, "tags": 4}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Fuzzy matching: score factor of corrected terms and the n-gram size of the vocabulary index
+FUZZY_MATCH_BOOST = 0.8
+NGRAM_SIZE = 3
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _field_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return str(value)
+
+
+def max_edit_distance(term: str) -> int:
+    """Number of typos tolerated in a term, short terms must match exactly"""
+    if len(term) <= 3:
+        return 0
+    if len(term) <= 7:
+        return 1
+    return 2
+
+
+def bounded_edit_distance(source: str, target: str, max_distance: int) -> int:
+    """Levenshtein distance, or max_distance + 1 as soon as it is known to exceed max_distance"""
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i]
+        for j, target_char in enumerate(target, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (source_char != target_char))
+            )
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def _ngrams(term: str) -> Set[str]:
+    padded = f"${term}$"
+    return {padded[i : i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+class FuzzyVocabulary:
+    """N-gram index over a vocabulary of terms for typo-tolerant lookups.
+
+    Candidates for a misspelled term are the terms sharing enough n-grams with it
+    (each edit changes at most NGRAM_SIZE n-grams), which are then verified with a
+    bounded edit distance. Terms are reference counted across documents.
+    """
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.ngrams: Dict[str, Set[str]] = defaultdict(set)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.counts
+
+    def add(self, terms: Iterable[str]) -> bool:
+        """Add terms, returns whether a new term entered the vocabulary"""
+        changed = False
+        for term in terms:
+            self.counts[term] += 1
+            if self.counts[term] == 1:
+                changed = True
+                for gram in _ngrams(term):
+                    self.ngrams[gram].add(term)
+        return changed
+
+    def remove(self, terms: Iterable[str]) -> bool:
+        """Remove terms, returns whether a term left the vocabulary"""
+        changed = False
+        for term in terms:
+            if self.counts.get(term, 0) <= 0:
+                continue
+            self.counts[term] -= 1
+            if self.counts[term] == 0:
+                changed = True
+                del self.counts[term]
+                for gram in _ngrams(term):
+                    self.ngrams[gram].discard(term)
+                    if not self.ngrams[gram]:
+                        del self.ngrams[gram]
+        return changed
+
+    def similar_terms(self, term: str) -> List[str]:
+        """Get the vocabulary terms within the tolerated edit distance of term, closest first"""
+        max_distance = max_edit_distance(term)
+        if max_distance == 0:
+            return []
+
+        grams = _ngrams(term)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self.ngrams.get(gram, ()))
+
+        min_shared = len(grams) - NGRAM_SIZE * max_distance
+        matches = []
+        for candidate, count in shared.items():
+            if count < min_shared:
+                continue
+            distance = bounded_edit_distance(term, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+        return [candidate for _, candidate in sorted(matches)]
+
+
+def _solution_vocabulary(solution: Solution) -> List[str]:
+    """Terms of a solution's name and tags used to correct misspelled queries"""
+    return list(set(tokenize(solution.name) + tokenize(" ".join(solution.tags or []))))
+
+
+def _rank_key(solution: Solution, score: float) -> Tuple[int, float, float]:
+    status_order = RECOMMEND_STATUS_ORDER.get(solution.recommend_status, len(RECOMMEND_STATUS_ORDER))
+    return (status_order, -score, -solution.rating)
+
+
+class InvertedIndex:
+    """Field-weighted inverted index with BM25 scoring.
+
+    Term frequencies are weighted by the field they occur in, so a match in the name
+    counts as much as ten matches in pros or cons.
+    """
+
+    def __init__(self, weights: Dict[str, int]):
+        self.weights = weights
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.doc_terms: Dict[str, Dict[str, float]] = {}
+        self.doc_lengths: Dict[str, float] = {}
+        self.total_length = 0.0
+        # BM25 length normalization per document, recalculated after the index changed
+        self.norms: Optional[Dict[str, float]] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: str, fields: Dict[str, Any]) -> None:
+        """Index a document, replacing a previous version with the same ID"""
+        self.remove(doc_id)
+
+        terms: Dict[str, float] = defaultdict(float)
+        length = 0.0
+        for field, weight in self.weights.items():
+            tokens = tokenize(_field_text(fields.get(field)))
+            length += weight * len(tokens)
+            for token in tokens:
+                terms[token] += weight
+
+        for term, frequency in terms.items():
+            self.postings[term][doc_id] = frequency
+        self.doc_terms[doc_id] = dict(terms)
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        self.norms = None
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document from the index, if present"""
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        self.norms = None
+
+    def _get_norms(self) -> Dict[str, float]:
+        if self.norms is None:
+            average_length = self.total_length / len(self.doc_lengths) or 1.0
+            self.norms = {
+                doc_id: BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                for doc_id, length in self.doc_lengths.items()
+            }
+        return self.norms
+
+    def score(self, terms: List[str], boosts: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """Calculate BM25 scores of all documents matching any of the terms
+
+        Args:
+            terms: Query terms
+            boosts: Optional score factors per term, 1.0 for terms not listed
+        """
+        doc_count = len(self.doc_lengths)
+        if not doc_count:
+            return {}
+        norms = self._get_norms()
+
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            factor = idf * (BM25_K1 + 1) * (boosts.get(term, 1.0) if boosts else 1.0)
+            for doc_id, frequency in postings.items():
+                scores[doc_id] += factor * frequency / (frequency + norms[doc_id])
+        return scores
+
+
+class MongoTextSearchBackend:
+    """Search backend using the weighted $text index of the solutions collection"""
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def search(
+        self, keyword: str, skip: int = 0, limit: int = 100, fuzzy: bool = False
+    ) -> Tuple[List[Solution], int]:
+        """Search approved solutions, ranked by recommend status, text relevance and rating.
+        Fuzzy matching needs the in-memory index, this backend always matches exact (stemmed) words."""
+        cursor = self.collection.find(
+            {"$text": {"$search": keyword}, "review_status": "APPROVED"},
+            {"score": {"$meta": "textScore"}},
+        )
+        matches = [(Solution(**doc), doc.get("score", 0.0)) async for doc in cursor]
+        matches.sort(key=lambda match: _rank_key(*match))
+        return [solution for solution, _ in matches[skip : skip + limit]], len(matches)
+
+
+class SolutionSearchIndex:
+    """In-memory search backend for approved solutions.
+
+    The index is loaded at startup and kept in sync by SolutionService and RatingService
+    writes in this process. Writes made by other worker processes are picked up by a
+    periodic rebuild every SEARCH_INDEX_REFRESH_SECONDS.
+    """
+
+    def __init__(self):
+        self.index = InvertedIndex(SEARCH_FIELD_WEIGHTS)
+        self.vocabulary = FuzzyVocabulary()
+        self.solutions: Dict[str, Solution] = {}
+        self.slugs: Dict[str, str] = {}
+        # Corrections of misspelled queries, cleared when the vocabulary changes
+        self.fuzzy_cache = get_cache_registry().region(FUZZY_TERMS_CACHE)
+        self.ready = False
+        self.collection: Optional[AsyncIOMotorCollection] = None
+        self.worker: Optional[asyncio.Task] = None
+        # Writes made while a rebuild is running, replayed on the rebuilt index
+        self.rebuild_writes: Optional[List[Tuple[Callable[..., None], Tuple[Any, ...]]]] = None
+
+    @staticmethod
+    def _build(docs: List[Dict[str, Any]]) -> Tuple[InvertedIndex, FuzzyVocabulary, Dict[str, Solution]]:
+        """Build the index structures from solution documents, runs in a worker thread"""
+        index = InvertedIndex(SEARCH_FIELD_WEIGHTS)
+        vocabulary = FuzzyVocabulary()
+        solutions: Dict[str, Solution] = {}
+        for doc in docs:
+            solution = Solution(**doc)
+            solutions[str(solution.id)] = solution
+            index.add(str(solution.id), doc)
+            vocabulary.add(_solution_vocabulary(solution))
+        return index, vocabulary, solutions
+
+    async def load(self, collection: AsyncIOMotorCollection) -> int:
+        """Build a fresh index from the approved solutions and swap it in.
+
+        The index is built in a worker thread so searches keep being served from the
+        current index. Writes made during the rebuild are applied to the current index
+        and replayed on the new one after the swap.
+        """
+        self.rebuild_writes = []
+        try:
+            docs = await collection.find({"review_status": "APPROVED"}).to_list(length=None)
+            index, vocabulary, solutions = await asyncio.to_thread(self._build, docs)
+        except BaseException:
+            self.rebuild_writes = None
+            raise
+
+        self.index = index
+        self.vocabulary = vocabulary
+        self.fuzzy_cache = get_cache_registry().region(FUZZY_TERMS_CACHE)
+        self.fuzzy_cache.invalidate()
+        self.solutions = solutions
+        self.slugs = {solution.slug: solution_id for solution_id, solution in solutions.items()}
+        self.ready = True
+
+        writes, self.rebuild_writes = self.rebuild_writes, None
+        for write, args in writes:
+            write(*args)
+        return len(self.solutions)
+
+    def _record_rebuild_write(self, write: Callable[..., None], *args: Any) -> None:
+        if self.rebuild_writes is not None:
+            self.rebuild_writes.append((write, args))
+
+    async def start(self, collection: AsyncIOMotorCollection) -> None:
+        """Load the index and start the periodic rebuild"""
+        self.collection = collection
+        count = await self.load(collection)
+        logger.info(f"Loaded search index with {count} solutions")
+        if settings.SEARCH_INDEX_REFRESH_SECONDS > 0 and self.worker is None:
+            self.worker = asyncio.create_task(self._refresh())
+
+    async def stop(self) -> None:
+        """Stop the periodic rebuild and drop the index"""
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+        self.ready = False
+
+    async def _refresh(self) -> None:
+        while True:
+            await asyncio.sleep(settings.SEARCH_INDEX_REFRESH_SECONDS)
+            try:
+                await self.load(self.collection)
+            except Exception as e:
+                logger.error(f"Failed to rebuild search index: {str(e)}")
+
+    def index_solution(self, doc: Dict[str, Any]) -> None:
+        """Add or update a solution from its document, removing it if it is not approved"""
+        self._record_rebuild_write(self.index_solution, doc)
+        if not self.ready:
+            return
+        solution_id = str(doc["_id"])
+        self._remove(solution_id)
+        if doc.get("review_status") != "APPROVED":
+            return
+        solution = Solution(**doc)
+        self.solutions[solution_id] = solution
+        self.slugs[solution.slug] = solution_id
+        self.index.add(solution_id, doc)
+        if self.vocabulary.add(_solution_vocabulary(solution)):
+            self.fuzzy_cache.invalidate()
+
+    def remove_solution(self, solution_id: str) -> None:
+        """Remove a solution from the index"""
+        self._record_rebuild_write(self.remove_solution, solution_id)
+        self._remove(solution_id)
+
+    def _remove(self, solution_id: str) -> None:
+        solution = self.solutions.pop(solution_id, None)
+        if solution is None:
+            return
+        self.slugs.pop(solution.slug, None)
+        self.index.remove(solution_id)
+        if self.vocabulary.remove(_solution_vocabulary(solution)):
+            self.fuzzy_cache.invalidate()
+
+    def update_rating(self, slug: str, rating: float, rating_count: int) -> None:
+        """Update the rating shown in results, the text index is unchanged"""
+        self._record_rebuild_write(self.update_rating, slug, rating, rating_count)
+        solution_id = self.slugs.get(slug)
+        if solution_id is not None:
+            self.solutions[solution_id] = self.solutions[solution_id].model_copy(
+                update={"rating": rating, "rating_count": rating_count}
+            )
+
+    def _fuzzy_terms(self, terms: List[str]) -> Dict[str, float]:
+        """Expand query terms with vocabulary terms they are likely misspellings of
+
+        Terms found in the index are kept as they are. Other terms are replaced by the
+        similar solution name and tag terms, which score slightly lower than exact matches.
+        Expansions are cached per normalized query.
+
+        Returns:
+            Dictionary mapping the terms to search for to their score factors
+        """
+        cache_key = " ".join(sorted(set(terms)))
+        expanded = self.fuzzy_cache.get(cache_key)
+        if expanded is None:
+            expanded = {}
+            for term in set(terms):
+                if term in self.vocabulary or term in self.index.postings:
+                    expanded[term] = 1.0
+                    continue
+                for similar in self.vocabulary.similar_terms(term):
+                    expanded.setdefault(similar, FUZZY_MATCH_BOOST)
+            self.fuzzy_cache.set(cache_key, expanded)
+        return expanded
+
+    async def search(
+        self, keyword: str, skip: int = 0, limit: int = 100, fuzzy: bool = False
+    ) -> Tuple[List[Solution], int]:
+        """Search approved solutions, ranked by recommend status, BM25 relevance and rating
+
+        Args:
+            keyword: Search query, documents matching any of its words are returned
+            skip: Number of results to skip
+            limit: Maximum number of results to return
+            fuzzy: Whether to tolerate misspelled words
+
+        Returns:
+            Tuple of (solutions, total number of matches)
+        """
+        terms = tokenize(keyword)
+        if fuzzy:
+            boosts = self._fuzzy_terms(terms)
+            scores = self.index.score(list(boosts), boosts)
+        else:
+            scores = self.index.score(terms)
+        solutions = self.solutions
+        top = heapq.nsmallest(
+            skip + limit,
+            scores.items(),
+            key=lambda item: _rank_key(solutions[item[0]], item[1]),
+        )
+        return [solutions[solution_id] for solution_id, _ in top[skip:]], len(scores)
+
+
+search_index = SolutionSearchIndex()
+
+
+def get_search_backend(collection: AsyncIOMotorCollection):
+    """Get the configured search backend.
+    The Mongo $text backend is used when configured, or while the in-memory index is not loaded (e.g. scripts)."""
+    if settings.SEARCH_BACKEND == "memory" and search_index.ready:
+        return search_index
+    return MongoTextSearchBackend(collection)
@@ -5,7 +5,8 @@ import httpx
 import jwt
 
 from app.core.config import settings
-from app.core.password import verify_password
+from app.core.http_client import get_http_client
+from app.core.password import verify_password_async
 from app.models.user import UserCreate, UserInDB
 
 
@@ -30,72 +31,70 @@ async def verify_credentials(username: str, password: str) -> bool:
     if username == "admin":
         if not user:
             return False
-        return verify_password(password, user.hashed_password)
+        return await verify_password_async(password, user.hashed_password)
 
     if not settings.AUTH_SERVER_ENABLED:
         # Development mode - verify password against local database
         if not user:
             return False
-        return verify_password(password, user.hashed_password)
+        return await verify_password_async(password, user.hashed_password)
 
     try:
-        # Create a transport that skips SSL verification
-        transport = httpx.AsyncHTTPTransport(verify=False)
-        async with httpx.AsyncClient(transport=transport) as client:
-            data = {
-                settings.AUTH_SERVER_USERNAME_FIELD: username,
-                settings.AUTH_SERVER_PASSWORD_FIELD: password,
-            }
-            headers = {
-                "Content-Type": "application/json"
-                if settings.AUTH_SERVER_CONTENT_TYPE == "json"
-                else "application/x-www-form-urlencoded"
-            }
-
-            if settings.AUTH_SERVER_CONTENT_TYPE == "form":
-                response = await client.post(settings.AUTH_SERVER_URL, data=data, headers=headers, timeout=5.0)
+        client = get_http_client()
+        data = {
+            settings.AUTH_SERVER_USERNAME_FIELD: username,
+            settings.AUTH_SERVER_PASSWORD_FIELD: password,
+        }
+        headers = {
+            "Content-Type": "application/json"
+            if settings.AUTH_SERVER_CONTENT_TYPE == "json"
+            else "application/x-www-form-urlencoded"
+        }
+
+        if settings.AUTH_SERVER_CONTENT_TYPE == "form":
+            response = await client.post(settings.AUTH_SERVER_URL, data=data, headers=headers)
+        else:
+            response = await client.post(settings.AUTH_SERVER_URL, json=data, headers=headers)
+
+        if response.status_code != 200:
+            return False
+
+        # Parse response JSON
+        try:
+            auth_data = response.json()
+            # Get full_name from configured field or fallback to username
+            full_name = auth_data.get(settings.AUTH_SERVER_FULLNAME_FIELD, username)
+            # Get email from configured field or use fallback
+            email = auth_data.get(settings.AUTH_SERVER_EMAIL_FIELD, f"{username}@external.auth")
+
+            # Create or update local user
+            from app.services.user_service import UserService
+
+            user_service = UserService()
+            if not user:
+                # Create new user
+                user_create = UserCreate(
+                    username=username,
+                    password="",  # Empty password for external auth users
+                    email=email,
+                    full_name=full_name,
+                    is_active=True,
+                    is_superuser=False,
+                )
+                await user_service.create_user(user_create)
             else:
-                response = await client.post(settings.AUTH_SERVER_URL, json=data, headers=headers, timeout=5.0)
-
-            if response.status_code != 200:
-                return False
-
-            # Parse response JSON
-            try:
-                auth_data = response.json()
-                # Get full_name from configured field or fallback to username
-                full_name = auth_data.get(settings.AUTH_SERVER_FULLNAME_FIELD, username)
-                # Get email from configured field or use fallback
-                email = auth_data.get(settings.AUTH_SERVER_EMAIL_FIELD, f"{username}@external.auth")
-
-                # Create or update local user
-                from app.services.user_service import UserService
-
-                user_service = UserService()
-                if not user:
-                    # Create new user
-                    user_create = UserCreate(
-                        username=username,
-                        password="",  # Empty password for external auth users
-                        email=email,
-                        full_name=full_name,
-                        is_active=True,
-                        is_superuser=False,
-                    )
-                    await user_service.create_user(user_create)
-                else:
-                    # If user exists but is not active, deny login
-                    if not user.is_active:
-                        return False
-
-                    # Update existing user's info if changed
-                    if user.full_name != full_name or user.email != email:
-                        await user_service.update_external_user(username=username, full_name=full_name, email=email)
-
-                return True
-            except (ValueError, KeyError):
-                # If response is not valid JSON or missing required fields
-                return False
+                # If user exists but is not active, deny login
+                if not user.is_active:
+                    return False
+
+                # Update existing user's info if changed
+                if user.full_name != full_name or user.email != email:
+                    await user_service.update_external_user(username=username, full_name=full_name, email=email)
+
+            return True
+        except (ValueError, KeyError):
+            # If response is not valid JSON or missing required fields
+            return False
 
     except httpx.RequestError:
         # If auth server is unreachable, fail closed for security
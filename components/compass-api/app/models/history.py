@@ -104,3 +104,4 @@ class HistoryQuery(BaseModel):
     end_date: Optional[datetime] = Field(None, description="Filter changes before this date")
     skip: int = Field(0, description="Number of records to skip (for pagination)")
     limit: int = Field(20, description="Maximum number of records to return (for pagination)")
+    cursor: Optional[str] = Field(None, description="Cursor of the previous page (for keyset pagination)")
@@ -1,7 +1,9 @@
-from typing import Generic, Optional, TypeVar
+from typing import Dict, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
+from app.models.search import FacetCount
+
 T = TypeVar("T")
 
 
@@ -14,6 +16,12 @@ class StandardResponse(BaseModel, Generic[T]):
     total: Optional[int] = Field(None, description="Total number of items (for list endpoints)")
     skip: Optional[int] = Field(None, description="Number of items skipped (for list endpoints)")
     limit: Optional[int] = Field(None, description="Maximum number of items (for list endpoints)")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, None on the last page (for keyset paginated endpoints)"
+    )
+    facets: Optional[Dict[str, List[FacetCount]]] = Field(
+        None, description="Counts per value of each facet field under the current filters (if requested)"
+    )
 
     @classmethod
     def of(cls, data: T) -> "StandardResponse[T]":
@@ -26,6 +34,23 @@ class StandardResponse(BaseModel, Generic[T]):
         return cls(success=False, detail=message)
 
     @classmethod
-    def paginated(cls, data: T, total: int, skip: int = 0, limit: int = 20) -> "StandardResponse[T]":
+    def paginated(
+        cls,
+        data: T,
+        total: int,
+        skip: int = 0,
+        limit: int = 20,
+        next_cursor: Optional[str] = None,
+        facets: Optional[Dict[str, List[FacetCount]]] = None,
+    ) -> "StandardResponse[T]":
         """Create a paginated response with data"""
-        return cls(success=True, data=data, total=total, skip=skip, limit=limit, detail=None)
+        return cls(
+            success=True,
+            data=data,
+            total=total,
+            skip=skip,
+            limit=limit,
+            next_cursor=next_cursor,
+            facets=facets,
+            detail=None,
+        )
@@ -0,0 +1,18 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AutocompleteSuggestions(BaseModel):
+    """Autocomplete suggestions for a prefix"""
+
+    solutions: List[str] = Field(default_factory=list, description="Names of approved solutions")
+    tags: List[str] = Field(default_factory=list, description="Tag names")
+    categories: List[str] = Field(default_factory=list, description="Category names")
+
+
+class FacetCount(BaseModel):
+    """Number of solutions with a facet value"""
+
+    value: Optional[str] = Field(None, description="Facet value, None for solutions without a value")
+    count: int = Field(..., description="Number of matching solutions")
@@ -16,17 +16,20 @@ class TechRadarEntry(BaseModel):
     label: str = Field(..., description="Solution name")
     link: str = Field(..., description="Link to solution detail page")
     active: bool = Field(True, description="Whether the solution is approved")
-    moved: int = Field(default=0, description="Movement indicator (always 0)")
+    moved: int = Field(
+        default=0,
+        description="Movement since the previous radar period (-1 moved out, 0 unchanged, 1 moved in, 2 new)",
+    )
 
 
 class TechRadarData(BaseModel):
     """Tech Radar data model"""
 
-    date: str = Field(..., description="Current date in YYYY-MM format")
+    date: str = Field(..., description="Radar period in YYYY-MM format")
     entries: List[TechRadarEntry] = Field(default_factory=list, description="List of tech radar entries")
 
     @classmethod
     def create_current(cls, entries: List[TechRadarEntry]) -> "TechRadarData":
         """Create a TechRadarData instance with current date"""
-        current_date = datetime.now().strftime("%Y-%m")
+        current_date = datetime.utcnow().strftime("%Y-%m")
         return cls(date=current_date, entries=entries)
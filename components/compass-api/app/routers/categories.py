@@ -35,15 +35,9 @@ async def get_categories(
     category_service: CategoryService = Depends(),
 ) -> StandardResponse[List[Category]]:
     """Get all categories with pagination and sorting. Default sorting is by radar_quadrant ascending."""
-    categories = await category_service.get_categories(skip=skip, limit=limit, sort=sort)
+    categories_with_usage = await category_service.get_categories_with_usage(skip=skip, limit=limit, sort=sort)
     total = await category_service.count_categories()
 
-    # Convert to Category model with usage count
-    categories_with_usage = []
-    for category in categories:
-        category_with_usage = await category_service.get_category_with_usage(category)
-        categories_with_usage.append(category_with_usage)
-
     return StandardResponse.paginated(data=categories_with_usage, total=total, skip=skip, limit=limit)
 
 
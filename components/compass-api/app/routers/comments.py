@@ -3,6 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core.auth import get_current_active_user
+from app.core.pagination import next_page_cursor
 from app.models.comment import (
     Comment,
     CommentCreate,
@@ -34,6 +35,7 @@ async def get_all_comments(
     solution_slug: Optional[str] = Query(
         None, description="Filter comments by solution slug (supports partial matching)"
     ),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page, replaces skip"),
     comment_service: CommentService = Depends(),
 ) -> StandardResponse[list[Comment]]:
     """
@@ -46,12 +48,16 @@ async def get_all_comments(
     - sort: Sort field (created_at, updated_at). Prefix with - for descending order
     - type: Filter comments by type (OFFICIAL or USER)
     - solution_slug: Filter comments by solution slug (supports partial matching)
+    - cursor: Cursor from next_cursor of the previous page. Pages after the cursor instead of skipping,
+      total is only returned on the first page
     """
     try:
         comments, total = await comment_service.get_comments(
-            skip=skip, limit=limit, sort=sort, type=type, solution_slug=solution_slug
+            skip=skip, limit=limit, sort=sort, type=type, solution_slug=solution_slug, cursor=cursor
+        )
+        return StandardResponse.paginated(
+            comments, total, 0 if cursor else skip, limit, next_cursor=next_page_cursor(comments, limit, sort)
         )
-        return StandardResponse.paginated(comments, total, skip, limit)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
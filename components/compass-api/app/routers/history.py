@@ -4,6 +4,7 @@ from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from app.core.pagination import next_page_cursor
 from app.models.history import ChangeType, HistoryQuery, HistoryRecord
 from app.models.response import StandardResponse
 from app.services.history_service import HistoryService
@@ -25,6 +26,7 @@ async def get_history(
     end_date: Optional[datetime] = Query(None, description="Filter changes before this date (ISO format)"),
     skip: int = Query(0, description="Number of records to skip (for pagination)"),
     limit: int = Query(20, description="Maximum number of records to return (for pagination)"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page, replaces skip"),
     history_service: HistoryService = Depends(),
 ) -> Any:
     """
@@ -32,6 +34,8 @@ async def get_history(
 
     Returns a list of history records matching the specified filters,
     sorted by change date in descending order (newest first).
+    Pass next_cursor of the previous page as cursor to page without skipping,
+    total is only returned on the first page then.
     """
     query = HistoryQuery(
         object_type=object_type,
@@ -43,11 +47,20 @@ async def get_history(
         end_date=end_date,
         skip=skip,
         limit=limit,
+        cursor=cursor,
     )
 
     try:
         history_records, total = await history_service.get_history_records(query)
-        return StandardResponse.paginated(history_records, total, skip, limit)
+        return StandardResponse.paginated(
+            history_records,
+            total,
+            0 if cursor else skip,
+            limit,
+            next_cursor=next_page_cursor(history_records, limit, "-created_at"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting history records: {str(e)}")
         raise HTTPException(
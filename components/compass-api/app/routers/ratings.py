@@ -3,6 +3,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core.auth import get_current_active_user
+from app.core.pagination import next_page_cursor
 from app.models.rating import Rating, RatingCreate
 from app.models.response import StandardResponse
 from app.models.user import User
@@ -118,6 +119,7 @@ async def get_all_ratings(
         None, description="Filter ratings by solution slug (supports partial matching)"
     ),
     score: Optional[int] = Query(None, ge=1, le=5, description="Filter ratings by exact score (1-5)"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page, replaces page"),
     rating_service: RatingService = Depends(),
 ):
     """
@@ -129,17 +131,26 @@ async def get_all_ratings(
     - **sort**: Field to sort by (created_at, updated_at, score). Prefix with - for descending order
     - **solution_slug**: Filter ratings by solution slug (supports partial matching)
     - **score**: Filter ratings by exact score (1-5)
+    - **cursor**: Cursor from next_cursor of the previous page, pages after the cursor instead of using page.
+      Total is only returned on the first page
     """
     try:
-        skip = (page - 1) * page_size
+        skip = 0 if cursor else (page - 1) * page_size
         ratings, total = await rating_service.get_ratings(
             skip=skip,
             limit=page_size,
             sort=sort,
             solution_slug=solution_slug,
             score=score,
+            cursor=cursor,
+        )
+        return StandardResponse.paginated(
+            data=ratings,
+            total=total,
+            skip=skip,
+            limit=page_size,
+            next_cursor=next_page_cursor(ratings, page_size, sort),
         )
-        return StandardResponse.paginated(data=ratings, total=total, skip=skip, limit=page_size)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
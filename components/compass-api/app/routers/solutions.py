@@ -1,12 +1,14 @@
 import logging
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import Response
 
 from app.core.auth import get_current_active_user, get_current_superuser
+from app.core.pagination import next_page_cursor
 from app.models.history import HistoryRecord
 from app.models.response import StandardResponse
+from app.models.search import AutocompleteSuggestions, FacetCount
 from app.models.solution import Solution, SolutionCreate, SolutionInDB, SolutionUpdate
 from app.models.user import User
 from app.services.comment_service import CommentService
@@ -56,6 +58,8 @@ async def get_solutions(
     review_status: Optional[str] = Query(None, description="Filter by review status (PENDING/APPROVED/REJECTED)"),
     tags: Optional[str] = Query(None, description="Filter by tags (comma-separated list of tag names)"),
     sort: str = Query("name", description="Sort field (prefix with - for descending order)"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page, replaces skip"),
+    facets: bool = Query(False, description="Include counts by category, department, recommend_status, stage, tags"),
     solution_service: SolutionService = Depends(),
 ) -> Any:
     """Get all solutions with pagination, filtering and sorting.
@@ -68,7 +72,11 @@ async def get_solutions(
     - stage: Filter by stage (DEVELOPING/UAT/PRODUCTION/DEPRECATED/RETIRED)
     - review_status: Filter by review status (PENDING/APPROVED/REJECTED)
     - tags: Filter by tags (comma-separated list of tag names)
-    - sort: Sort field (name, category, created_at, updated_at). Prefix with - for descending order
+    - sort: Sort field (name, category, created_at, updated_at, rating, rating_count). Prefix with - for descending order
+    - cursor: Cursor from next_cursor of the previous page. Pages after the cursor instead of skipping
+    - facets: Include value counts of category, department, recommend_status, stage and tags under the filters
+
+    total is the number of solutions matching the filters.
     """
     try:
         # Validate enum values if provided
@@ -104,7 +112,7 @@ async def get_solutions(
         if tags:
             tag_list = [tag.strip() for tag in tags.split(",")]
 
-        solutions = await solution_service.get_solutions_with_ratings(
+        solutions, total, facet_counts = await solution_service.get_solutions_with_ratings(
             skip=skip,
             limit=limit,
             category=category,
@@ -115,9 +123,17 @@ async def get_solutions(
             review_status=review_status,
             tags=tag_list,
             sort=sort,
+            cursor=cursor,
+            include_facets=facets,
+        )
+        return StandardResponse.paginated(
+            data=solutions,
+            total=total,
+            skip=0 if cursor else skip,
+            limit=limit,
+            next_cursor=next_page_cursor(solutions, limit, sort),
+            facets=facet_counts,
         )
-        total = await solution_service.count_solutions()
-        return StandardResponse.paginated(data=solutions, total=total, skip=skip, limit=limit)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -142,23 +158,93 @@ async def get_departments(solution_service: SolutionService = Depends()):
         raise HTTPException(status_code=500, detail=f"Error getting departments: {str(e)}")
 
 
+@router.get("/facets/", response_model=StandardResponse[Dict[str, List[FacetCount]]])
+async def get_solution_facets(
+    category: Optional[str] = None,
+    department: Optional[str] = None,
+    team: Optional[str] = None,
+    recommend_status: Optional[str] = Query(
+        None, description="Filter by recommendation status (ADOPT/TRIAL/ASSESS/HOLD)"
+    ),
+    stage: Optional[str] = Query(
+        None,
+        description="Filter by stage (DEVELOPING/UAT/PRODUCTION/DEPRECATED/RETIRED)",
+    ),
+    review_status: Optional[str] = Query(None, description="Filter by review status (PENDING/APPROVED/REJECTED)"),
+    tags: Optional[str] = Query(None, description="Filter by tags (comma-separated list of tag names)"),
+    solution_service: SolutionService = Depends(),
+) -> Any:
+    """Get the filter counts for the catalogue sidebar.
+
+    Takes the same filters as the solution list and counts the matching solutions by
+    category, department, team, recommend_status, stage, review_status and tags.
+
+    Returns:
+    - data: Dictionary mapping each field to its values and counts, most frequent first
+    """
+    try:
+        # Convert comma-separated tags to list if provided
+        tag_list = None
+        if tags:
+            tag_list = [tag.strip() for tag in tags.split(",")]
+
+        facets = await solution_service.get_facets(
+            category=category,
+            department=department,
+            team=team,
+            recommend_status=recommend_status,
+            stage=stage,
+            review_status=review_status,
+            tags=tag_list,
+        )
+        return StandardResponse.of(facets)
+    except Exception as e:
+        logger.error(f"Error getting solution facets: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error getting solution facets: {str(e)}")
+
+
 @router.get("/search/", response_model=StandardResponse[List[Solution]])
 async def search_solutions(
     keyword: str = Query(..., description="Search keyword to match against solution fields"),
+    skip: int = Query(0, ge=0, description="Number of results to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of results to return"),
+    fuzzy: bool = Query(False, description="Tolerate misspelled words, e.g. 'kubernets' or 'postgress'"),
     solution_service: SolutionService = Depends(),
 ) -> Any:
     """Search solutions by keyword using text similarity.
     Searches across name, category, description, team, maintainer name, pros and cons.
-    Returns all matches sorted by relevance score.
+    Returns approved matches sorted by recommend status, then relevance score and rating.
+    With fuzzy=true, words that match nothing are corrected to similar words of solution names and tags.
     """
     try:
-        solutions = await solution_service.search_solutions(keyword)
-        return StandardResponse.of(solutions)
+        solutions, total = await solution_service.search_solutions(keyword, skip=skip, limit=limit, fuzzy=fuzzy)
+        return StandardResponse.paginated(data=solutions, total=total, skip=skip, limit=limit)
     except Exception as e:
         logger.error(f"Error searching solutions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error searching solutions: {str(e)}")
 
 
+@router.get("/autocomplete/", response_model=StandardResponse[AutocompleteSuggestions])
+async def autocomplete(
+    prefix: str = Query(..., min_length=1, description="Text typed so far"),
+    types: List[Literal["solutions", "tags", "categories"]] = Query(
+        ["solutions", "tags", "categories"], description="Kinds of names to suggest"
+    ),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions per kind"),
+    solution_service: SolutionService = Depends(),
+) -> Any:
+    """Suggest solution, tag and category names for a search box while typing.
+    A name matches when any of its words starts with the prefix (case-insensitive),
+    names starting with the prefix come first. Only approved solutions are suggested.
+    """
+    try:
+        suggestions = await solution_service.autocomplete(prefix, types, limit)
+        return StandardResponse.of(AutocompleteSuggestions(**suggestions))
+    except Exception as e:
+        logger.error(f"Error getting autocomplete suggestions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error getting autocomplete suggestions: {str(e)}")
+
+
 @router.get("/my/", response_model=StandardResponse[List[Solution]])
 async def get_my_solutions(
     skip: int = 0,
@@ -1,6 +1,6 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
 from app.models.tech_radar import TechRadarData
 from app.services.tech_radar_service import TechRadarService
@@ -10,18 +10,38 @@ router = APIRouter()
 
 @router.get("/data", response_model=TechRadarData)
 async def get_tech_radar_data(
+    request: Request,
+    response: Response,
+    date: Optional[str] = Query(
+        None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Radar period in YYYY-MM format, defaults to current"
+    ),
     tech_radar_service: TechRadarService = Depends(),
 ) -> TechRadarData:
     """Get tech radar data in Zalando Tech Radar format.
 
+    The radar is served from a snapshot that is rebuilt when solutions or categories change.
+    Responses carry an ETag, send it back in If-None-Match to get 304 Not Modified.
+
     Returns a list of all approved solutions with their:
     - quadrant (from category's radar_quadrant)
     - ring (mapped from recommend_status: ADOPT=1, TRIAL=2, ASSESS=3, HOLD=4)
     - label (solution name)
     - active (always true for approved solutions)
-    - moved (always 0)
+    - moved (since the previous month: -1 moved out, 0 unchanged, 1 moved in, 2 new)
+
+    Pass date to get the radar as it was at the end of a past month. Months without a stored
+    snapshot are rebuilt from the change history, without solutions deleted since then.
+    Months before the first history record return 404.
     """
-    return await tech_radar_service.get_tech_radar_data()
+    snapshot = await tech_radar_service.get_tech_radar_snapshot(date)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No tech radar for {date}")
+    data, etag = snapshot
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return data
 
 
 @router.get("/quadrants", response_model=List[Dict[str, str]])
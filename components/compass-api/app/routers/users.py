@@ -1,6 +1,5 @@
 from typing import Any, List, Optional
 
-from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import Response
 
@@ -17,10 +16,6 @@ from app.services.user_service import UserService
 
 router = APIRouter()
 
-# Create a cache with 1-day TTL (86400 seconds)
-avatar_cache = TTLCache(maxsize=1000, ttl=86400)
-
-
 @router.post("/", response_model=StandardResponse[User], status_code=status.HTTP_201_CREATED)
 async def create_user(
     user: UserCreate,
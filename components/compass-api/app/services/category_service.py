@@ -1,19 +1,23 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from bson import ObjectId
-from cachetools import TTLCache, keys
+from cachetools import keys
 
+from app.core.autocomplete import CATEGORY_NAMES, autocomplete_index
+from app.core.cache import CATEGORIES_CACHE, SOLUTION_FACETS_CACHE, get_cache_registry
 from app.core.database import get_database
+from app.core.search import search_index
 from app.models.category import Category, CategoryCreate, CategoryInDB, CategoryUpdate
+from app.services.tech_radar_service import invalidate_tech_radar
 
 
 class CategoryService:
     def __init__(self):
         self.db = get_database()
         self.collection = self.db.categories
-        # Create a cache with 1-hour TTL
-        self.categories_cache = TTLCache(maxsize=1, ttl=3600)
+        # Shared application-wide cache region, cleared on every category write
+        self.categories_cache = get_cache_registry().region(CATEGORIES_CACHE)
 
     async def create_category(self, category: CategoryCreate, username: Optional[str] = None) -> CategoryInDB:
         """Create a new category"""
@@ -34,7 +38,10 @@ class CategoryService:
 
         result = await self.collection.insert_one(category_dict)
         # Clear cache since data has been updated
-        self.categories_cache.clear()
+        self.categories_cache.invalidate()
+        # Approved solutions that already use this category name can appear on the radar now
+        invalidate_tech_radar()
+        autocomplete_index.add(CATEGORY_NAMES, category_dict["name"])
         return await self.get_category_by_id(str(result.inserted_id))
 
     async def get_category_by_id(self, category_id: str) -> Optional[CategoryInDB]:
@@ -75,8 +82,9 @@ class CategoryService:
         cache_key = keys.hashkey(skip, limit, sort)
 
         # Try to get data from cache
-        if cache_key in self.categories_cache:
-            return self.categories_cache[cache_key]
+        cached = self.categories_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Parse sort parameter
         sort_field = sort.lstrip("-")
@@ -94,7 +102,7 @@ class CategoryService:
         result = [CategoryInDB(**category) for category in categories]
 
         # Store result in cache
-        self.categories_cache[cache_key] = result
+        self.categories_cache.set(cache_key, result)
         return result
 
     async def update_category_by_id(
@@ -128,6 +136,10 @@ class CategoryService:
                     }
                 },
             )
+            # Category names are part of the search index
+            async for solution in self.db.solutions.find({"category": update_dict["name"]}):
+                search_index.index_solution(solution)
+            get_cache_registry().invalidate(SOLUTION_FACETS_CACHE)
 
         update_dict["updated_at"] = datetime.utcnow()
         if username:
@@ -135,7 +147,12 @@ class CategoryService:
 
         result = await self.collection.update_one({"_id": ObjectId(category_id)}, {"$set": update_dict})
         # Clear cache since data has been updated
-        self.categories_cache.clear()
+        self.categories_cache.invalidate()
+        if "name" in update_dict or "radar_quadrant" in update_dict:
+            invalidate_tech_radar()
+        if result.modified_count:
+            new_name = update_dict.get("name", existing_category.name)
+            autocomplete_index.replace(CATEGORY_NAMES, existing_category.name, new_name)
         if result.modified_count:
             return await self.get_category_by_id(category_id)
         return existing_category
@@ -154,19 +171,58 @@ class CategoryService:
 
         result = await self.collection.delete_one({"_id": ObjectId(category_id)})
         # Clear cache since data has been updated
-        self.categories_cache.clear()
+        self.categories_cache.invalidate()
+        if result.deleted_count:
+            autocomplete_index.remove(CATEGORY_NAMES, category.name)
         return result.deleted_count > 0
 
     async def count_categories(self) -> int:
         """Get total number of categories"""
-        return await self.collection.count_documents({})
+        cache_key = keys.hashkey("count")
+        cached = self.categories_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        total = await self.collection.count_documents({})
+        self.categories_cache.set(cache_key, total)
+        return total
 
     async def get_category_usage_count(self, name: str) -> int:
         """Get the number of approved solutions using this category"""
         return await self.db.solutions.count_documents({"category": name})
 
+    async def get_category_usage_counts(self) -> Dict[str, int]:
+        """Get the number of solutions using each category, counted in one $group
+
+        Cached alongside the category list. Solution writes that change a category
+        clear the cache.
+
+        Returns:
+            Dictionary mapping category names to solution counts, unused categories are absent
+        """
+        cache_key = keys.hashkey("usage_counts")
+        cached = self.categories_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        pipeline = [{"$group": {"_id": "$category", "count": {"$sum": 1}}}]
+        usage_counts = {doc["_id"]: doc["count"] async for doc in self.db.solutions.aggregate(pipeline)}
+        self.categories_cache.set(cache_key, usage_counts)
+        return usage_counts
+
     async def get_category_with_usage(self, category: CategoryInDB) -> Category:
         """Convert CategoryInDB to Category with usage count"""
         category_dict = category.model_dump()
-        usage_count = await self.get_category_usage_count(category.name)
-        return Category(**category_dict, usage_count=usage_count)
+        usage_counts = await self.get_category_usage_counts()
+        return Category(**category_dict, usage_count=usage_counts.get(category.name, 0))
+
+    async def get_categories_with_usage(
+        self, skip: int = 0, limit: int = 100, sort: str = "radar_quadrant"
+    ) -> List[Category]:
+        """Get categories with pagination and sorting, with usage counts from a single aggregation"""
+        categories = await self.get_categories(skip=skip, limit=limit, sort=sort)
+        usage_counts = await self.get_category_usage_counts()
+        return [
+            Category(**category.model_dump(), usage_count=usage_counts.get(category.name, 0))
+            for category in categories
+        ]
@@ -6,6 +6,7 @@ from fastapi import HTTPException, status
 from pymongo import ASCENDING, DESCENDING
 
 from app.core.database import get_database
+from app.core.pagination import apply_cursor, count_page_total, keyset_sort
 from app.models.comment import (
     Comment,
     CommentCreate,
@@ -26,11 +27,24 @@ class CommentService:
 
     async def _convert_to_comment(self, comment_data: dict) -> Comment:
         """Private helper method to convert comment data to Comment model with full name"""
-        # Get user's full name from user service
-        user_info = await self.user_service.get_user_info(comment_data["username"])
-        if user_info:
-            comment_data["full_name"] = user_info["full_name"]
-        return Comment(**comment_data)
+        return (await self._convert_to_comments([comment_data]))[0]
+
+    async def _convert_to_comments(self, comments_data: List[dict]) -> List[Comment]:
+        """Private helper method to convert a page of comment data to Comment models,
+        resolving all full names with one batched lookup"""
+        for comment_data in comments_data:
+            # If username is missing, use created_by as fallback
+            if "username" not in comment_data:
+                comment_data["username"] = comment_data["created_by"]
+
+        full_names = await self.user_service.get_full_names([comment["username"] for comment in comments_data])
+        comments = []
+        for comment_data in comments_data:
+            full_name = full_names[comment_data["username"]]
+            if full_name is not None:
+                comment_data["full_name"] = full_name
+            comments.append(Comment(**comment_data))
+        return comments
 
     async def get_comments(
         self,
@@ -39,8 +53,11 @@ class CommentService:
         sort: str = "-created_at",  # Default sort by created_at desc
         type: Optional[CommentType] = None,
         solution_slug: Optional[str] = None,
-    ) -> Tuple[List[Comment], int]:
-        """Get all comments with pagination, sorting and optional type filtering."""
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Comment], Optional[int]]:
+        """Get all comments with pagination, sorting and optional type filtering.
+        Pass the cursor of the previous page for keyset pagination, skip is ignored and the
+        total is not counted then."""
         query = {}
         if type:
             query["type"] = type
@@ -59,18 +76,20 @@ class CommentService:
         if sort_field not in VALID_SORT_FIELDS:
             raise ValueError(f"Invalid sort field: {sort_field}. Valid fields are: {', '.join(VALID_SORT_FIELDS)}")
 
+        # Keyset pagination: continue after the cursor instead of skipping
+        page_query = apply_cursor(query, sort_field, sort_direction, cursor)
+        if cursor:
+            skip = 0
+
         # Execute query with sort
-        cursor = self.collection.find(query).sort(sort_field, sort_direction).skip(skip).limit(limit)
+        db_cursor = (
+            self.collection.find(page_query).sort(keyset_sort(sort_field, sort_direction)).skip(skip).limit(limit)
+        )
 
         # Convert to Comment objects with user full names
-        comments = []
-        async for comment in cursor:
-            # If username is missing, use created_by as fallback
-            if "username" not in comment:
-                comment["username"] = comment["created_by"]
-            comments.append(await self._convert_to_comment(comment))
+        comments = await self._convert_to_comments(await db_cursor.to_list(length=None))
 
-        total = await self.collection.count_documents(query)
+        total = await count_page_total(self.collection, query, cursor)
 
         return comments, total
 
@@ -91,12 +110,7 @@ class CommentService:
         cursor = self.collection.find(query).sort(sort_field, DESCENDING).skip(skip).limit(limit)
 
         # Convert to Comment objects with user full names
-        comments = []
-        async for comment in cursor:
-            # If username is missing, use created_by as fallback
-            if "username" not in comment:
-                comment["username"] = comment["created_by"]
-            comments.append(await self._convert_to_comment(comment))
+        comments = await self._convert_to_comments(await cursor.to_list(length=None))
 
         total = await self.collection.count_documents(query)
         return comments, total
@@ -233,9 +247,7 @@ class CommentService:
         cursor = self.collection.find(query).sort(sort_field, sort_direction).skip(skip).limit(limit)
 
         # Convert to Comment objects with user full names
-        comments = []
-        async for comment in cursor:
-            comments.append(await self._convert_to_comment(comment))
+        comments = await self._convert_to_comments(await cursor.to_list(length=None))
 
         total = await self.collection.count_documents(query)
         return comments, total
@@ -3,6 +3,8 @@ from typing import Dict, List, Optional
 from pymongo import DESCENDING
 
 from app.core.database import get_database
+from app.core.history_recorder import history_recorder
+from app.core.pagination import apply_cursor, count_page_total, keyset_sort
 from app.models.history import ChangeType, HistoryQuery, HistoryRecord
 
 
@@ -23,10 +25,33 @@ class HistoryService:
         Returns:
             The ID of the created record
         """
-        result = await self.collection.insert_one(record.model_dump(by_alias=True))
-        return str(result.inserted_id)
+        ids = await self.create_history_records([record])
+        return ids[0]
 
-    async def get_history_records(self, query: HistoryQuery) -> tuple[List[HistoryRecord], int]:
+    async def create_history_records(self, records: List[HistoryRecord]) -> List[str]:
+        """
+        Create multiple history records
+
+        Records are handed to the write-behind recorder when it is running,
+        otherwise they are inserted in a single insert_many.
+
+        Args:
+            records: The history records to create
+
+        Returns:
+            The IDs of the created records
+        """
+        if not records:
+            return []
+
+        documents = [record.model_dump(by_alias=True) for record in records]
+        if history_recorder.running:
+            await history_recorder.record(documents)
+        else:
+            await self.collection.insert_many(documents)
+        return [str(document["_id"]) for document in documents]
+
+    async def get_history_records(self, query: HistoryQuery) -> tuple[List[HistoryRecord], Optional[int]]:
         """
         Get history records based on query parameters
 
@@ -34,7 +59,7 @@ class HistoryService:
             query: Query parameters
 
         Returns:
-            A tuple of (records, total_count)
+            A tuple of (records, total_count), total_count is None for pages after a cursor
         """
         # Build filter criteria
         filter_criteria = {}
@@ -64,17 +89,17 @@ class HistoryService:
         if date_criteria:
             filter_criteria["created_at"] = date_criteria
 
-        # Get total count
-        total = await self.collection.count_documents(filter_criteria)
+        # Get total count, only on the first page of a cursor walk
+        total = await count_page_total(self.collection, filter_criteria, query.cursor)
 
-        # Get paginated records
-        cursor = self.collection.find(filter_criteria)
+        # Get paginated records, continuing after the cursor if one is given
+        cursor = self.collection.find(apply_cursor(filter_criteria, "created_at", DESCENDING, query.cursor))
 
         # Sort by created_at in descending order (newest first)
-        cursor = cursor.sort("created_at", DESCENDING)
+        cursor = cursor.sort(keyset_sort("created_at", DESCENDING))
 
-        # Apply pagination
-        cursor = cursor.skip(query.skip).limit(query.limit)
+        # Apply pagination, keyset pagination replaces skip
+        cursor = cursor.skip(0 if query.cursor else query.skip).limit(query.limit)
 
         # Convert to HistoryRecord objects
         records = [HistoryRecord(**record) async for record in cursor]
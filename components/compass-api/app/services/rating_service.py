@@ -1,16 +1,33 @@
+from collections import defaultdict
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 from bson import ObjectId
 from fastapi import HTTPException, status
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, UpdateOne
 
 from app.core.database import get_database
+from app.core.pagination import apply_cursor, count_page_total, keyset_sort
+from app.core.search import search_index
 from app.models.rating import Rating, RatingCreate, RatingInDB
 from app.services.user_service import UserService
 
 VALID_SORT_FIELDS = {"created_at", "updated_at", "score"}
 
+# Rating statistics maintained on solution documents
+RATING_STATS_PROJECTION = {"slug": 1, "rating": 1, "rating_count": 1, "rating_distribution": 1}
+RECONCILE_BATCH_SIZE = 1000
+
+
+def empty_rating_stats() -> Dict:
+    """Rating statistics of a solution without any ratings"""
+    return {
+        "rating": 0,
+        "rating_sum": 0,
+        "rating_count": 0,
+        "rating_distribution": {str(i): 0 for i in range(1, 6)},
+    }
+
 
 class RatingService:
     def __init__(self):
@@ -19,11 +36,19 @@ class RatingService:
 
     async def _convert_to_rating(self, rating_data: dict) -> Rating:
         """Private helper method to convert rating data to Rating model with full name"""
-        # Get user's full name from user service
-        user_info = await self.user_service.get_user_info(rating_data["username"])
-        if user_info:
-            rating_data["full_name"] = user_info["full_name"]
-        return Rating(**rating_data)
+        return (await self._convert_to_ratings([rating_data]))[0]
+
+    async def _convert_to_ratings(self, ratings_data: List[dict]) -> List[Rating]:
+        """Private helper method to convert a page of rating data to Rating models,
+        resolving all full names with one batched lookup"""
+        full_names = await self.user_service.get_full_names([rating["username"] for rating in ratings_data])
+        ratings = []
+        for rating_data in ratings_data:
+            full_name = full_names[rating_data["username"]]
+            if full_name is not None:
+                rating_data["full_name"] = full_name
+            ratings.append(Rating(**rating_data))
+        return ratings
 
     async def get_ratings(
         self,
@@ -32,9 +57,12 @@ class RatingService:
         sort: str = "-created_at",  # Default sort by created_at desc
         solution_slug: Optional[str] = None,
         score: Optional[int] = None,
-    ) -> Tuple[List[Rating], int]:
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Rating], Optional[int]]:
         """Get all ratings with pagination and sorting.
-        Default sort is by created_at in descending order (newest first)."""
+        Default sort is by created_at in descending order (newest first).
+        Pass the cursor of the previous page for keyset pagination, skip is ignored and the
+        total is not counted then."""
 
         # Build query
         query = {}
@@ -59,10 +87,17 @@ class RatingService:
         if sort_field not in VALID_SORT_FIELDS:
             raise ValueError(f"Invalid sort field: {sort_field}. Valid fields are: {', '.join(VALID_SORT_FIELDS)}")
 
+        # Keyset pagination: continue after the cursor instead of skipping
+        page_query = apply_cursor(query, sort_field, sort_direction, cursor)
+        if cursor:
+            skip = 0
+
         # Execute query with sort
-        cursor = self.db.ratings.find(query).sort(sort_field, sort_direction).skip(skip).limit(limit)
-        ratings = [await self._convert_to_rating(rating) async for rating in cursor]
-        total = await self.db.ratings.count_documents(query)
+        db_cursor = (
+            self.db.ratings.find(page_query).sort(keyset_sort(sort_field, sort_direction)).skip(skip).limit(limit)
+        )
+        ratings = await self._convert_to_ratings(await db_cursor.to_list(length=None))
+        total = await count_page_total(self.db.ratings, query, cursor)
 
         return ratings, total
 
@@ -72,7 +107,7 @@ class RatingService:
         query = {"solution_slug": solution_slug}
         sort_field = "created_at" if sort_by == "created_at" else "score"
         cursor = self.db.ratings.find(query).sort(sort_field, DESCENDING).skip(skip).limit(limit)
-        ratings = [await self._convert_to_rating(rating) async for rating in cursor]
+        ratings = await self._convert_to_ratings(await cursor.to_list(length=None))
         total = await self.db.ratings.count_documents(query)
         return ratings, total
 
@@ -84,37 +119,159 @@ class RatingService:
 
     async def get_rating_summary(self, solution_slug: str) -> Dict:
         """Get rating summary statistics for a solution"""
+        summaries = await self.get_rating_summaries([solution_slug])
+        return summaries[solution_slug]
+
+    async def get_rating_summaries(self, solution_slugs: List[str]) -> Dict[str, Dict]:
+        """Get rating summary statistics for multiple solutions in a single query
+
+        Statistics are read from the rating fields maintained on the solution documents.
+
+        Args:
+            solution_slugs: List of solution slugs to summarize
+
+        Returns:
+            Dictionary mapping each requested slug to its rating summary,
+            solutions without ratings get an empty summary
+        """
+        summaries = {slug: self._empty_rating_summary() for slug in solution_slugs}
+        if not solution_slugs:
+            return summaries
+
+        cursor = self.db.solutions.find({"slug": {"$in": list(set(solution_slugs))}}, RATING_STATS_PROJECTION)
+        async for solution in cursor:
+            summaries[solution["slug"]] = self._rating_summary_from_solution(solution)
+
+        return summaries
+
+    def _empty_rating_summary(self) -> Dict:
+        """Rating summary for a solution without any ratings"""
+        return {
+            "average": 0,
+            "count": 0,
+            "distribution": {str(i): 0 for i in range(1, 6)},
+        }
+
+    def _rating_summary_from_solution(self, solution: dict) -> Dict:
+        """Build a rating summary from the rating fields of a solution document"""
+        summary = self._empty_rating_summary()
+        summary["average"] = solution.get("rating", 0)
+        summary["count"] = solution.get("rating_count", 0)
+        summary["distribution"].update(solution.get("rating_distribution") or {})
+        return summary
+
+    def _calculate_average(self, rating_sum: int, rating_count: int) -> float:
+        """Calculate the rounded average score"""
+        return round(rating_sum / rating_count, 2) if rating_count > 0 else 0
+
+    async def _update_rating_stats(
+        self,
+        solution_slug: str,
+        added_score: Optional[int] = None,
+        removed_score: Optional[int] = None,
+    ) -> None:
+        """Incrementally update the rating statistics stored on a solution document
+
+        Counters are changed with an atomic $inc. The average is then written only if
+        no other rating write changed the counters in between, otherwise that write
+        will store the newer average.
+
+        Args:
+            solution_slug: The slug of the rated solution
+            added_score: Score of a rating that was added
+            removed_score: Score of a rating that was removed
+        """
+        inc: Dict[str, int] = defaultdict(int)
+        for score, sign in ((added_score, 1), (removed_score, -1)):
+            if score is not None:
+                inc["rating_sum"] += sign * score
+                inc["rating_count"] += sign
+                inc[f"rating_distribution.{score}"] += sign
+
+        inc = {field: value for field, value in inc.items() if value != 0}
+        if not inc:
+            return
+
+        stats = await self.db.solutions.find_one_and_update(
+            {"slug": solution_slug},
+            {"$inc": inc},
+            projection={"rating_sum": 1, "rating_count": 1},
+            return_document=True,
+        )
+        if not stats:
+            return
+
+        rating = self._calculate_average(stats["rating_sum"], stats["rating_count"])
+        await self.db.solutions.update_one(
+            {"_id": stats["_id"], "rating_sum": stats["rating_sum"], "rating_count": stats["rating_count"]},
+            {"$set": {"rating": rating}},
+        )
+        search_index.update_rating(solution_slug, rating, stats["rating_count"])
+
+    async def reconcile_rating_stats(self, solution_slugs: Optional[List[str]] = None) -> int:
+        """Recompute the rating statistics stored on solutions from the ratings collection
+
+        Used to backfill solutions created before the statistics were maintained and to
+        repair drift. Writes that happen while the job runs may need another pass.
+
+        Args:
+            solution_slugs: Optional list of solution slugs to reconcile. If None, reconciles all solutions.
+
+        Returns:
+            Number of solutions whose statistics were written
+        """
+        solution_query = {"slug": {"$in": solution_slugs}} if solution_slugs is not None else {}
+        rating_query = {"solution_slug": {"$in": solution_slugs}} if solution_slugs is not None else {}
+
         pipeline = [
-            {"$match": {"solution_slug": solution_slug}},
+            {"$match": rating_query},
             {
                 "$group": {
-                    "_id": None,
-                    "average": {"$avg": "$score"},
-                    "count": {"$sum": 1},
-                    "scores": {"$push": "$score"},
+                    "_id": "$solution_slug",
+                    "rating_sum": {"$sum": "$score"},
+                    "rating_count": {"$sum": 1},
+                    **{f"score_{i}": {"$sum": {"$cond": [{"$eq": ["$score", i]}, 1, 0]}} for i in range(1, 6)},
                 }
             },
         ]
 
-        result = await self.db.ratings.aggregate(pipeline).to_list(1)
-        if not result:
-            return {
-                "average": 0,
-                "count": 0,
-                "distribution": {str(i): 0 for i in range(1, 6)},
-            }
+        # Reset every solution first so solutions without ratings end up with empty statistics
+        result = await self.db.solutions.update_many(solution_query, {"$set": empty_rating_stats()})
+
+        operations = []
+        async for stats in self.db.ratings.aggregate(pipeline):
+            operations.append(
+                UpdateOne(
+                    {"slug": stats["_id"]},
+                    {
+                        "$set": {
+                            "rating": self._calculate_average(stats["rating_sum"], stats["rating_count"]),
+                            "rating_sum": stats["rating_sum"],
+                            "rating_count": stats["rating_count"],
+                            "rating_distribution": {str(i): stats[f"score_{i}"] for i in range(1, 6)},
+                        }
+                    },
+                )
+            )
+            if len(operations) >= RECONCILE_BATCH_SIZE:
+                await self.db.solutions.bulk_write(operations, ordered=False)
+                operations = []
 
-        summary = result[0]
-        # Calculate distribution
-        distribution = {str(i): 0 for i in range(1, 6)}
-        for score in summary["scores"]:
-            distribution[str(score)] += 1
+        if operations:
+            await self.db.solutions.bulk_write(operations, ordered=False)
 
-        return {
-            "average": round(summary["average"], 2),
-            "count": summary["count"],
-            "distribution": distribution,
-        }
+        return result.matched_count
+
+    async def backfill_rating_stats(self) -> int:
+        """Reconcile rating statistics for solutions that don't have them yet
+
+        Returns:
+            Number of solutions that were backfilled
+        """
+        solution_slugs = await self.db.solutions.distinct("slug", {"rating_count": {"$exists": False}})
+        if not solution_slugs:
+            return 0
+        return await self.reconcile_rating_stats(solution_slugs)
 
     async def create_or_update_rating(self, solution_slug: str, rating: RatingCreate, username: str) -> RatingInDB:
         # First check if solution exists
@@ -128,8 +285,8 @@ class RatingService:
         now = datetime.utcnow()
         rating_data = rating.model_dump()
 
-        # Try to update existing rating first
-        result = await self.db.ratings.update_one(
+        # Try to update existing rating first, keeping the previous score for the statistics
+        previous_rating = await self.db.ratings.find_one_and_update(
             {"solution_slug": solution_slug, "username": username},
             {
                 "$set": {
@@ -139,10 +296,11 @@ class RatingService:
                     "updated_at": now,
                 }
             },
+            projection={"score": 1},
         )
 
         # If no existing rating was updated, create a new one
-        if result.modified_count == 0:
+        if previous_rating is None:
             new_rating = {
                 "solution_slug": solution_slug,
                 "username": username,
@@ -153,8 +311,13 @@ class RatingService:
                 "updated_at": now,
             }
             await self.db.ratings.insert_one(new_rating)
+            await self._update_rating_stats(solution_slug, added_score=new_rating["score"])
             return RatingInDB(**new_rating)
 
+        await self._update_rating_stats(
+            solution_slug, added_score=rating_data["score"], removed_score=previous_rating["score"]
+        )
+
         # Return the updated rating
         return await self.get_user_rating(solution_slug, username)
 
@@ -181,7 +344,7 @@ class RatingService:
         cursor = self.db.ratings.find(query).sort(sort_field, sort_direction).skip(skip).limit(limit)
 
         # Convert to Rating objects with user full names
-        ratings = [await self._convert_to_rating(rating) async for rating in cursor]
+        ratings = await self._convert_to_ratings(await cursor.to_list(length=None))
         total = await self.db.ratings.count_documents(query)
 
         return ratings, total
@@ -230,10 +393,15 @@ class RatingService:
         update_dict = rating_update.model_dump()
         update_dict.update({"updated_at": datetime.utcnow(), "updated_by": username})
 
-        result = await self.db.ratings.find_one_and_update(
-            {"_id": ObjectId(rating_id)}, {"$set": update_dict}, return_document=True
+        # Read the document as it was before the update so the statistics use the replaced score
+        previous = await self.db.ratings.find_one_and_update({"_id": ObjectId(rating_id)}, {"$set": update_dict})
+        if not previous:
+            return None
+
+        await self._update_rating_stats(
+            previous["solution_slug"], added_score=update_dict["score"], removed_score=previous["score"]
         )
-        return RatingInDB(**result) if result else None
+        return RatingInDB(**{**previous, **update_dict})
 
     async def delete_rating(self, rating_id: str, username: str, is_superuser: bool) -> bool:
         """Delete a rating.
@@ -247,8 +415,14 @@ class RatingService:
                 detail="You don't have permission to delete this rating",
             )
 
-        result = await self.db.ratings.delete_one({"_id": ObjectId(rating_id)})
-        return result.deleted_count > 0
+        deleted = await self.db.ratings.find_one_and_delete(
+            {"_id": ObjectId(rating_id)}, projection={"solution_slug": 1, "score": 1}
+        )
+        if not deleted:
+            return False
+
+        await self._update_rating_stats(deleted["solution_slug"], removed_score=deleted["score"])
+        return True
 
     async def get_solution_adopted_usernames(self, solution_slug: str) -> set[str]:
         """Get unique usernames of adopted users who rated a solution.
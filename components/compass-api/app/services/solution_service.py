@@ -1,20 +1,54 @@
 import re
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from bson import ObjectId
 from fastapi import logger
 from pymongo import ASCENDING, DESCENDING
 
+from app.core.autocomplete import SOLUTION_NAMES, autocomplete_index
+from app.core.cache import CATEGORIES_CACHE, SOLUTION_FACETS_CACHE, TAGS_CACHE, get_cache_registry
 from app.core.database import get_database
-from app.models.history import ChangeType
+from app.core.indexes import NAME_COLLATION
+from app.core.pagination import apply_cursor, keyset_sort
+from app.core.search import get_search_backend, search_index
+from app.models.history import ChangeType, HistoryRecord
 from app.models.solution import Solution, SolutionCreate, SolutionInDB, SolutionUpdate
 from app.services.category_service import CategoryService
 from app.services.history_service import HistoryService
-from app.services.rating_service import RatingService
-from app.services.tag_service import TagService
+from app.services.rating_service import empty_rating_stats
+from app.services.tag_service import TagService, approved_tags
+from app.services.tech_radar_service import TECH_RADAR_SOLUTION_FIELDS, invalidate_tech_radar
 
-VALID_SORT_FIELDS = {"name", "category", "created_at", "updated_at"}
+VALID_SORT_FIELDS = {"name", "category", "created_at", "updated_at", "rating", "rating_count"}
+
+# Fields with value counts alongside the solution list
+SOLUTION_FACET_FIELDS = ("category", "department", "recommend_status", "stage", "tags")
+
+# Fields with value counts for the catalogue sidebar, one per list filter
+FILTER_FACET_FIELDS = ("category", "department", "team", "recommend_status", "stage", "review_status", "tags")
+
+
+def build_facet_pipelines(fields) -> Dict[str, List[dict]]:
+    """Build $facet sub-pipelines counting solutions per value of each field, most frequent first.
+    Array fields such as tags count each element."""
+    pipelines = {}
+    for field in fields:
+        stages = [{"$unwind": f"${field}"}] if field == "tags" else []
+        stages += [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ]
+        pipelines[field] = stages
+    return pipelines
+
+
+def facet_counts(result: dict, fields) -> Dict[str, List[dict]]:
+    """Convert the buckets of a $facet result into value/count pairs for each field"""
+    return {
+        field: [{"value": bucket["_id"], "count": bucket["count"]} for bucket in result.get(field, [])]
+        for field in fields
+    }
 
 
 def generate_slug(name: str) -> str:
@@ -35,8 +69,29 @@ class SolutionService:
         self.collection = self.db.solutions
         self.category_service = CategoryService()
         self.tag_service = TagService()
-        self.rating_service = RatingService()
         self.history_service = HistoryService()
+        self.search_backend = get_search_backend(self.collection)
+
+    def _invalidate_caches(self, changed_fields: Optional[set] = None) -> None:
+        """Clear shared caches that are derived from solution data
+
+        Args:
+            changed_fields: Fields changed by an update, None for inserts and deletes
+        """
+        get_cache_registry().invalidate(TAGS_CACHE)
+        if changed_fields is None or "category" in changed_fields:
+            # Category usage counts are cached with the category list
+            get_cache_registry().invalidate(CATEGORIES_CACHE)
+        if changed_fields is None or changed_fields & set(FILTER_FACET_FIELDS):
+            get_cache_registry().invalidate(SOLUTION_FACETS_CACHE)
+        if changed_fields is None or changed_fields & TECH_RADAR_SOLUTION_FIELDS:
+            invalidate_tech_radar()
+
+    def _remove_from_search(self, solution: SolutionInDB) -> None:
+        """Remove a deleted solution from the in-memory search and autocomplete indexes"""
+        search_index.remove_solution(str(solution.id))
+        if solution.review_status == "APPROVED":
+            autocomplete_index.remove(SOLUTION_NAMES, solution.name)
 
     async def _get_user_info(self, username: str) -> Optional[dict]:
         """Get user information from users collection
@@ -148,10 +203,8 @@ class SolutionService:
         exact_match = await self.collection.find_one({"name": name})
         exists = exact_match is not None
 
-        # Count similar names (case-insensitive)
-        similar_count = await self.collection.count_documents(
-            {"name": {"$regex": f"^{re.escape(name)}$", "$options": "i"}}
-        )
+        # Count similar names (case-insensitive), the collation matches the name_ci index
+        similar_count = await self.collection.count_documents({"name": name}, collation=NAME_COLLATION)
 
         return exists, similar_count
 
@@ -173,17 +226,27 @@ class SolutionService:
             return 0
 
         result = await self.collection.delete_many({"name": name})
-
-        # Record history for each deleted solution
+        self._invalidate_caches()
         for solution in solutions:
-            await self.history_service.record_object_change(
-                object_type="solution",
-                object_id=str(solution.id),
-                object_name=solution.name,
-                change_type=ChangeType.DELETE,
-                username=username or "system",
-                change_summary=f"Deleted solution '{solution.name}' as part of bulk delete by name",
-            )
+            self._remove_from_search(solution)
+        await self.tag_service.adjust_usage_counts(
+            removed=[tag for solution in solutions for tag in approved_tags(solution.review_status, solution.tags)]
+        )
+
+        # Record history for all deleted solutions at once
+        await self.history_service.create_history_records(
+            [
+                HistoryRecord.create_record(
+                    object_type="solution",
+                    object_id=str(solution.id),
+                    object_name=solution.name,
+                    change_type=ChangeType.DELETE,
+                    username=username or "system",
+                    change_summary=f"Deleted solution '{solution.name}' as part of bulk delete by name",
+                )
+                for solution in solutions
+            ]
+        )
 
         return result.deleted_count
 
@@ -231,7 +294,8 @@ class SolutionService:
         if username:
             solution_dict["created_by"] = username
 
-        result = await self.collection.insert_one(solution_dict)
+        result = await self.collection.insert_one({**solution_dict, **empty_rating_stats()})
+        self._invalidate_caches()
         created_solution = await self.get_solution_by_id(str(result.inserted_id))
 
         # Record history for creation
@@ -267,8 +331,37 @@ class SolutionService:
         review_status: Optional[str] = None,
         tags: Optional[List[str]] = None,
         sort: str = "name",
+        cursor: Optional[str] = None,
     ) -> List[SolutionInDB]:
-        """Get all solutions with filtering and pagination"""
+        """Get all solutions with filtering and pagination.
+        Pass the cursor of the previous page for keyset pagination, skip is ignored then."""
+        solutions, _, _ = await self._find_solutions(
+            skip=skip,
+            limit=limit,
+            category=category,
+            department=department,
+            team=team,
+            recommend_status=recommend_status,
+            stage=stage,
+            review_status=review_status,
+            tags=tags,
+            sort=sort,
+            cursor=cursor,
+            include_total=False,
+        )
+        return [SolutionInDB(**solution) for solution in solutions]
+
+    def _build_solution_query(
+        self,
+        category: Optional[str] = None,
+        department: Optional[str] = None,
+        team: Optional[str] = None,
+        recommend_status: Optional[str] = None,
+        stage: Optional[str] = None,
+        review_status: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> dict:
+        """Build the solution filter from the list filters"""
         query = {}
 
         # Add filters if provided
@@ -287,6 +380,44 @@ class SolutionService:
         if tags:
             # Match solutions that have all the specified tags
             query["tags"] = {"$all": tags}
+        return query
+
+    async def _find_solutions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        department: Optional[str] = None,
+        team: Optional[str] = None,
+        recommend_status: Optional[str] = None,
+        stage: Optional[str] = None,
+        review_status: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        sort: str = "name",
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        include_facets: bool = False,
+    ) -> Tuple[List[dict], Optional[int], Optional[Dict[str, List[dict]]]]:
+        """Find a page of solution documents with filtering and pagination
+
+        Offset pages are read in one $facet aggregation together with the total number of
+        solutions matching the filters and the facet counts. Cursor pages are read with a
+        find on the filters and the cursor, the total and the facet counts are then counted
+        separately.
+
+        Returns:
+            Tuple of (documents, total, facets), total is None when include_total is not set
+            and facets is None unless include_facets is set
+        """
+        query = self._build_solution_query(
+            category=category,
+            department=department,
+            team=team,
+            recommend_status=recommend_status,
+            stage=stage,
+            review_status=review_status,
+            tags=tags,
+        )
 
         # Parse sort parameter
         sort_field = "name"
@@ -302,9 +433,80 @@ class SolutionService:
         if sort_field not in VALID_SORT_FIELDS:
             raise ValueError(f"Invalid sort field: {sort_field}. Valid fields are: {', '.join(VALID_SORT_FIELDS)}")
 
-        cursor = self.collection.find(query).sort(sort_field, sort_direction).skip(skip).limit(limit)
-        solutions = await cursor.to_list(length=limit)
-        return [SolutionInDB(**solution) for solution in solutions]
+        sort_keys = keyset_sort(sort_field, sort_direction)
+        counts = {"total": [{"$count": "count"}]} if include_total or include_facets else {}
+        if include_facets:
+            counts.update(build_facet_pipelines(SOLUTION_FACET_FIELDS))
+
+        if not cursor:
+            # Offset pages read the page, the total and the facet counts in one round trip
+            pipeline = [
+                {"$match": query},
+                {"$sort": dict(sort_keys)},
+                {"$facet": {"items": [{"$skip": skip}, {"$limit": limit}], **counts}},
+            ]
+            results = await self.collection.aggregate(pipeline, allowDiskUse=True).to_list(length=1)
+            result = results[0] if results else {}
+            documents = result.get("items", [])
+        else:
+            # Cursor pages are a plain find, so the filter, the keyset condition of the cursor
+            # and the sort all use the indexes and only the page itself is read. The total and
+            # the facet counts cover every match, not just the rest after the cursor
+            page = self.collection.find(apply_cursor(query, sort_field, sort_direction, cursor)).sort(sort_keys)
+            documents = await page.limit(limit).to_list(length=limit)
+            result = {}
+            if include_facets:
+                results = await self.collection.aggregate(
+                    [{"$match": query}, {"$facet": counts}], allowDiskUse=True
+                ).to_list(length=1)
+                result = results[0] if results else {}
+            elif include_total:
+                result = {"total": [{"count": await self.collection.count_documents(query)}]}
+
+        total = None
+        if include_total or include_facets:
+            total = result["total"][0]["count"] if result.get("total") else 0
+        facets = facet_counts(result, SOLUTION_FACET_FIELDS) if include_facets else None
+        return documents, total, facets
+
+    async def get_facets(
+        self,
+        category: Optional[str] = None,
+        department: Optional[str] = None,
+        team: Optional[str] = None,
+        recommend_status: Optional[str] = None,
+        stage: Optional[str] = None,
+        review_status: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> Dict[str, List[dict]]:
+        """Count the solutions matching the filters by each value of the filterable fields
+
+        All fields are counted in one $facet aggregation. Results are cached per filter
+        until a solution write changes one of the counted fields.
+
+        Returns:
+            Dictionary mapping each field to value/count pairs, most frequent first
+        """
+        key = (category, department, team, recommend_status, stage, review_status, tuple(sorted(tags or ())))
+        facets_cache = get_cache_registry().region(SOLUTION_FACETS_CACHE)
+        facets = facets_cache.get(key)
+        if facets is not None:
+            return facets
+
+        query = self._build_solution_query(
+            category=category,
+            department=department,
+            team=team,
+            recommend_status=recommend_status,
+            stage=stage,
+            review_status=review_status,
+            tags=tags,
+        )
+        pipeline = [{"$match": query}, {"$facet": build_facet_pipelines(FILTER_FACET_FIELDS)}]
+        results = await self.collection.aggregate(pipeline, allowDiskUse=True).to_list(length=1)
+        facets = facet_counts(results[0] if results else {}, FILTER_FACET_FIELDS)
+        facets_cache.set(key, facets)
+        return facets
 
     async def get_solution_by_slug(self, slug: str) -> Optional[SolutionInDB]:
         """Get a solution by slug"""
@@ -360,7 +562,22 @@ class SolutionService:
 
         result = await self.collection.update_one({"_id": existing_solution.id}, {"$set": update_dict})
         if result.modified_count:
-            updated_solution = await self.get_solution_by_id(str(existing_solution.id))
+            self._invalidate_caches(set(update_dict))
+            updated_doc = await self.collection.find_one({"_id": existing_solution.id})
+            updated_solution = SolutionInDB(**updated_doc) if updated_doc else None
+            if updated_doc:
+                search_index.index_solution(updated_doc)
+                autocomplete_index.replace(
+                    SOLUTION_NAMES,
+                    existing_solution.name if existing_solution.review_status == "APPROVED" else None,
+                    updated_doc["name"] if updated_doc.get("review_status") == "APPROVED" else None,
+                )
+                # Approving, unapproving or retagging a solution moves tag usage counts
+                if "tags" in update_dict or "review_status" in update_dict:
+                    await self.tag_service.adjust_usage_counts(
+                        removed=approved_tags(existing_solution.review_status, existing_solution.tags),
+                        added=approved_tags(updated_doc.get("review_status"), updated_doc.get("tags")),
+                    )
 
             # Record history
             if updated_solution:
@@ -403,6 +620,9 @@ class SolutionService:
         result = await self.collection.delete_one({"_id": ObjectId(solution_id)})
 
         if result.deleted_count > 0:
+            self._invalidate_caches()
+            self._remove_from_search(solution)
+            await self.tag_service.adjust_usage_counts(removed=approved_tags(solution.review_status, solution.tags))
             # Record deletion in history
             await self.history_service.record_object_change(
                 object_type="solution",
@@ -425,6 +645,9 @@ class SolutionService:
         result = await self.collection.delete_one({"slug": slug})
 
         if result.deleted_count > 0:
+            self._invalidate_caches()
+            self._remove_from_search(solution)
+            await self.tag_service.adjust_usage_counts(removed=approved_tags(solution.review_status, solution.tags))
             # Record deletion in history
             await self.history_service.record_object_change(
                 object_type="solution",
@@ -464,9 +687,15 @@ class SolutionService:
         review_status: Optional[str] = None,
         tags: Optional[List[str]] = None,
         sort: str = "name",
-    ) -> List[Solution]:
-        """Get solutions with ratings"""
-        solutions = await self.get_solutions(
+        cursor: Optional[str] = None,
+        include_facets: bool = False,
+    ) -> Tuple[List[Solution], int, Optional[Dict[str, List[dict]]]]:
+        """Get a page of solutions with ratings, the filtered total and optionally facet counts
+
+        Returns:
+            Tuple of (solutions, total matching the filters, facets or None)
+        """
+        solutions, total, facets = await self._find_solutions(
             skip=skip,
             limit=limit,
             category=category,
@@ -477,46 +706,31 @@ class SolutionService:
             review_status=review_status,
             tags=tags,
             sort=sort,
+            cursor=cursor,
+            include_facets=include_facets,
         )
 
-        # Convert to Solution model and add ratings
-        result = []
-        for solution_in_db in solutions:
-            # Convert to dict to allow adding rating fields
-            solution_dict = solution_in_db.model_dump()
-            rating_summary = await self.rating_service.get_rating_summary(solution_in_db.slug)
-            solution_dict["rating"] = rating_summary["average"]
-            solution_dict["rating_count"] = rating_summary["count"]
-            result.append(Solution(**solution_dict))
-
-        return result
+        # Rating fields are maintained on the solution documents
+        return [Solution(**solution) for solution in solutions], total, facets
 
     async def get_solution_by_id_with_rating(self, solution_id: str) -> Optional[Solution]:
         """Get a solution by ID with rating"""
-        solution = await self.get_solution_by_id(solution_id)
+        solution = await self.collection.find_one({"_id": ObjectId(solution_id)})
         if solution:
-            # Convert to dict to allow adding rating fields
-            solution_dict = solution.model_dump()
-            rating_summary = await self.rating_service.get_rating_summary(solution.slug)
-            solution_dict["rating"] = rating_summary["average"]
-            solution_dict["rating_count"] = rating_summary["count"]
-            return Solution(**solution_dict)
+            return Solution(**solution)
         return None
 
     async def get_solution_by_slug_with_rating(self, slug: str) -> Optional[Solution]:
         """Get a solution by slug with rating"""
-        solution = await self.get_solution_by_slug(slug)
+        solution = await self.collection.find_one({"slug": slug})
         if solution:
-            # Convert to dict to allow adding rating fields
-            solution_dict = solution.model_dump()
-            rating_summary = await self.rating_service.get_rating_summary(solution.slug)
-            solution_dict["rating"] = rating_summary["average"]
-            solution_dict["rating_count"] = rating_summary["count"]
-            return Solution(**solution_dict)
+            return Solution(**solution)
         return None
 
-    async def search_solutions(self, keyword: str) -> List[Solution]:
-        """Search solutions by keyword using text similarity
+    async def search_solutions(
+        self, keyword: str, skip: int = 0, limit: int = 100, fuzzy: bool = False
+    ) -> Tuple[List[Solution], int]:
+        """Search approved solutions by keyword using text similarity
         Searches across:
         - name (highest weight)
         - brief
@@ -526,80 +740,29 @@ class SolutionService:
         - team
         - maintainer_name
         - pros and cons
-        Returns all approved matches sorted by recommend_status (ADOPT first) and then by text relevance score
-        """
-        # Create text index with field weights if it doesn't exist
-        await self.collection.create_index(
-            [
-                ("name", "text"),
-                ("brief", "text"),
-                ("description", "text"),
-                ("category", "text"),
-                ("department", "text"),
-                ("team", "text"),
-                ("maintainer_name", "text"),
-                ("pros", "text"),
-                ("cons", "text"),
-            ],
-            weights={
-                "name": 10,  # Highest priority
-                "brief": 8,  # Second priority
-                "description": 5,  # Third priority
-                "category": 3,
-                "department": 3,
-                "team": 3,
-                "maintainer_name": 2,
-                "pros": 1,
-                "cons": 1,
-            },
-        )
-
-        # Create index for recommend_status for faster sorting
-        await self.collection.create_index([("recommend_status", 1)])
+        - tags (in-memory index only)
+        Matches are sorted by recommend_status (ADOPT first), then by text relevance and rating.
+        Uses the in-memory BM25 index (SEARCH_BACKEND=memory) or the weighted $text index,
+        see app/core/search.py. With fuzzy, misspelled words are matched to similar words of
+        solution names and tags (in-memory index only).
 
-        # Perform text search with simple match
-        pipeline = [{"$match": {"$text": {"$search": keyword}, "review_status": "APPROVED"}}]
+        Returns:
+            Tuple of (solutions, total number of matches)
+        """
+        return await self.search_backend.search(keyword, skip=skip, limit=limit, fuzzy=fuzzy)
 
-        solutions = await self.collection.aggregate(pipeline).to_list(length=None)
+    async def autocomplete(self, prefix: str, kinds: List[str], limit: int = 10) -> dict:
+        """Complete a prefix to solution, tag and category names from the in-memory prefix index
 
-        # Group solutions by recommend status and add ratings
-        adopt_solutions = []
-        trial_solutions = []
-        assess_solutions = []
-        hold_solutions = []
-        other_solutions = []
+        Args:
+            prefix: Text typed so far
+            kinds: Kinds of names to complete (solutions, tags, categories)
+            limit: Maximum number of suggestions per kind
 
-        # Add ratings and group by status
-        for solution in solutions:
-            rating_summary = await self.rating_service.get_rating_summary(solution["slug"])
-            solution["rating"] = rating_summary["average"]
-            solution["rating_count"] = rating_summary["count"]
-            solution_obj = Solution(**solution)
-
-            # Group by recommendation status
-            if solution["recommend_status"] == "ADOPT":
-                adopt_solutions.append(solution_obj)
-            elif solution["recommend_status"] == "TRIAL":
-                trial_solutions.append(solution_obj)
-            elif solution["recommend_status"] == "ASSESS":
-                assess_solutions.append(solution_obj)
-            elif solution["recommend_status"] == "HOLD":
-                hold_solutions.append(solution_obj)
-            else:
-                other_solutions.append(solution_obj)
-
-        # Sort each group by rating
-        for solutions_list in [
-            adopt_solutions,
-            trial_solutions,
-            assess_solutions,
-            hold_solutions,
-            other_solutions,
-        ]:
-            solutions_list.sort(key=lambda x: (x.rating or 0), reverse=True)
-
-        # Combine all groups maintaining order by status
-        return adopt_solutions + trial_solutions + assess_solutions + hold_solutions + other_solutions
+        Returns:
+            Dictionary mapping each kind to its suggestions
+        """
+        return await autocomplete_index.search(self.db, prefix, kinds, limit)
 
     async def get_user_solutions(
         self, username: str, skip: int = 0, limit: int = 100, sort: str = "name"
@@ -635,17 +798,8 @@ class SolutionService:
         cursor = self.collection.find(query).sort(sort_field, sort_direction).skip(skip).limit(limit)
         solutions = await cursor.to_list(length=limit)
 
-        # Convert to Solution model and add ratings
-        result = []
-        for solution in solutions:
-            # Convert to dict to allow adding rating fields
-            solution_dict = solution
-            rating_summary = await self.rating_service.get_rating_summary(solution["slug"])
-            solution_dict["rating"] = rating_summary["average"]
-            solution_dict["rating_count"] = rating_summary["count"]
-            result.append(Solution(**solution_dict))
-
-        return result
+        # Rating fields are maintained on the solution documents
+        return [Solution(**solution) for solution in solutions]
 
     async def count_user_solutions(self, username: str) -> int:
         """Get total number of solutions created by or maintained by the user"""
@@ -1,19 +1,31 @@
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from bson import ObjectId
-from cachetools import TTLCache, keys
+from cachetools import keys
+from pymongo import UpdateMany, UpdateOne
 
+from app.core.autocomplete import TAG_NAMES, autocomplete_index
+from app.core.cache import SOLUTION_FACETS_CACHE, TAGS_CACHE, get_cache_registry
 from app.core.database import get_database
+from app.core.search import search_index
 from app.models.tag import Tag, TagCreate, TagInDB, TagUpdate, format_tag_name
 
+RECONCILE_BATCH_SIZE = 500
+
+
+def approved_tags(review_status: Optional[str], tags: Optional[List[str]]) -> List[str]:
+    """Tags a solution contributes to tag usage counts, only approved solutions count"""
+    return (tags or []) if review_status == "APPROVED" else []
+
 
 class TagService:
     def __init__(self):
         self.db = get_database()
         self.collection = self.db.tags
-        # Create a cache with 1-hour TTL
-        self.tags_cache = TTLCache(maxsize=100, ttl=3600)
+        # Shared application-wide cache region, cleared on every tag or solution write
+        self.tags_cache = get_cache_registry().region(TAGS_CACHE)
 
     async def create_tag(self, tag: TagCreate, username: Optional[str] = None) -> TagInDB:
         """Create a new tag"""
@@ -28,14 +40,16 @@ class TagService:
         tag_dict = tag.model_dump()
         tag_dict["created_at"] = datetime.utcnow()
         tag_dict["updated_at"] = datetime.utcnow()
-        tag_dict["usage_count"] = 0
+        # Approved solutions may already carry the name, e.g. after the tag was deleted and recreated
+        tag_dict["usage_count"] = await self.get_tag_usage_count(formatted_name)
         if username:
             tag_dict["created_by"] = username
             tag_dict["updated_by"] = username
 
         result = await self.collection.insert_one(tag_dict)
         # Clear cache since data has been updated
-        self.tags_cache.clear()
+        self.tags_cache.invalidate()
+        autocomplete_index.add(TAG_NAMES, tag_dict["name"])
         return await self.get_tag_by_id(str(result.inserted_id))
 
     async def get_tag_by_id(self, tag_id: str) -> Optional[TagInDB]:
@@ -58,7 +72,8 @@ class TagService:
         return None
 
     async def get_tag_usage_counts(self, tag_names: List[str] = None) -> dict:
-        """Get usage counts for multiple tags in a single query
+        """Count tag usage from the solutions collection in a single aggregation.
+        Listings read the usage_count maintained on tag documents, this is for reconciling it.
 
         Args:
             tag_names: Optional list of tag names to get counts for. If None, gets counts for all tags.
@@ -94,47 +109,96 @@ class TagService:
         cache_key = keys.hashkey(skip, limit, show_all)
 
         # Try to get data from cache
-        if cache_key in self.tags_cache:
-            return self.tags_cache[cache_key]
+        cached = self.tags_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # Get all tags first
-        cursor = self.collection.find().sort("name", 1).skip(skip).limit(limit)
+        # Usage counts are maintained on the tag documents
+        query = {} if show_all else {"usage_count": {"$gt": 0}}
+        cursor = self.collection.find(query).sort("name", 1).skip(skip).limit(limit)
         tags = await cursor.to_list(length=limit)
-
-        if not tags:
-            return []
-
-        # Get usage counts for all tags in a single query
-        tag_names = [tag["name"] for tag in tags]
-        usage_counts = await self.get_tag_usage_counts(tag_names)
-
-        # Convert to Tag models with usage counts
-        result = []
-        for tag in tags:
-            tag_model = TagInDB(**tag)
-            usage_count = usage_counts.get(tag_model.name, 0)
-
-            # Only include tags with usage_count > 0 if show_all is False
-            if show_all or usage_count > 0:
-                tag_dict = tag_model.model_dump()
-                tag_dict["usage_count"] = usage_count
-                result.append(Tag(**tag_dict))
+        result = [Tag(**tag) for tag in tags]
 
         # Store result in cache
-        self.tags_cache[cache_key] = result
+        self.tags_cache.set(cache_key, result)
         return result
 
     async def get_tag_with_usage(self, tag: TagInDB) -> Tag:
         """Convert TagInDB to Tag with usage count"""
         tag_dict = tag.model_dump()
-        usage_counts = await self.get_tag_usage_counts([tag.name])
-        tag_dict["usage_count"] = usage_counts.get(tag.name, 0)
+        doc = await self.collection.find_one({"_id": tag.id}, {"usage_count": 1})
+        tag_dict["usage_count"] = (doc or {}).get("usage_count", 0)
         return Tag(**tag_dict)
 
     async def get_tag_usage_count(self, name: str) -> int:
         """Get the number of solutions using this tag"""
         return await self.db.solutions.count_documents({"tags": name, "review_status": "APPROVED"})
 
+    async def adjust_usage_counts(self, removed: Iterable[str] = (), added: Iterable[str] = ()) -> None:
+        """Update tag usage counters after approved solutions lost or gained tags
+
+        Args:
+            removed: Tag names to decrement, once per solution that no longer counts them
+            added: Tag names to increment, once per solution that now counts them
+        """
+        changes = Counter(added)
+        changes.subtract(Counter(removed))
+
+        # One update per distinct change, usually +1 and -1
+        names_by_change = defaultdict(list)
+        for name, change in changes.items():
+            if change:
+                names_by_change[change].append(name)
+        if not names_by_change:
+            return
+
+        await self.collection.bulk_write(
+            [
+                UpdateMany({"name": {"$in": names}}, {"$inc": {"usage_count": change}})
+                for change, names in names_by_change.items()
+            ],
+            ordered=False,
+        )
+        self.tags_cache.invalidate()
+
+    async def reconcile_usage_counts(self) -> int:
+        """Recompute the usage_count of every tag from the solutions collection
+
+        Used to repair drift, e.g. after solutions were changed directly in the database
+        or concurrent writes. Writes that happen while the job runs may need another pass.
+
+        Returns:
+            Number of tags whose usage_count was corrected
+        """
+        usage_counts = await self.get_tag_usage_counts()
+
+        corrected = 0
+        operations = []
+        async for tag in self.collection.find({}, {"name": 1, "usage_count": 1}):
+            usage_count = usage_counts.get(tag["name"], 0)
+            if tag.get("usage_count") != usage_count:
+                operations.append(UpdateOne({"_id": tag["_id"]}, {"$set": {"usage_count": usage_count}}))
+            if len(operations) >= RECONCILE_BATCH_SIZE:
+                await self.collection.bulk_write(operations, ordered=False)
+                corrected += len(operations)
+                operations = []
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+            corrected += len(operations)
+
+        if corrected:
+            self.tags_cache.invalidate()
+        return corrected
+
+    async def _reindex_solutions(self, query: dict) -> None:
+        """Refresh the search index entries of solutions whose tags were rewritten.
+        Fuzzy corrections are cleared by the index when its vocabulary changes."""
+        if not search_index.ready:
+            return
+        async for doc in self.db.solutions.find(query):
+            search_index.index_solution(doc)
+
     async def merge_tags(
         self, source_tag_id: str, target_tag_name: str, username: Optional[str] = None
     ) -> Optional[TagInDB]:
@@ -165,6 +229,13 @@ class TagService:
             if not target_tag:
                 return None
 
+            # Approved solutions with the source tag but not the target tag start counting the target
+            gained = await self.db.solutions.count_documents(
+                {"tags": {"$eq": source_tag.name, "$ne": target_tag.name}, "review_status": "APPROVED"}
+            )
+
+            affected_ids = await self.db.solutions.distinct("_id", {"tags": source_tag.name})
+
             # Update all solutions that use the source tag
             # First add the target tag to all solutions using source tag
             await self.db.solutions.update_many(
@@ -180,12 +251,17 @@ class TagService:
 
             # Then remove the source tag
             await self.db.solutions.update_many({"tags": source_tag.name}, {"$pull": {"tags": source_tag.name}})
+            get_cache_registry().invalidate(SOLUTION_FACETS_CACHE)
+            await self._reindex_solutions({"_id": {"$in": affected_ids}})
 
             # Delete the source tag
             await self.collection.delete_one({"_id": ObjectId(source_tag_id)})
+            if gained:
+                await self.collection.update_one({"_id": target_tag.id}, {"$inc": {"usage_count": gained}})
 
             # Clear cache since data has been updated
-            self.tags_cache.clear()
+            self.tags_cache.invalidate()
+            autocomplete_index.remove(TAG_NAMES, source_tag.name)
 
             # Return the target tag
             return target_tag
@@ -227,6 +303,11 @@ class TagService:
                             }
                         },
                     )
+                    get_cache_registry().invalidate(SOLUTION_FACETS_CACHE)
+                    await self._reindex_solutions({"tags": update_dict["name"]})
+                else:
+                    # Solutions keep the old name, so the renamed tag counts those with the new name
+                    update_dict["usage_count"] = await self.get_tag_usage_count(update_dict["name"])
 
             # Update the tag itself
             update_dict["updated_at"] = datetime.utcnow()
@@ -235,8 +316,9 @@ class TagService:
 
             result = await self.collection.update_one({"_id": ObjectId(tag_id)}, {"$set": update_dict})
             # Clear cache since data has been updated
-            self.tags_cache.clear()
+            self.tags_cache.invalidate()
             if result.modified_count:
+                autocomplete_index.replace(TAG_NAMES, tag.name, update_dict.get("name", tag.name))
                 return await self.get_tag_by_id(tag_id)
             return None
         except Exception as e:
@@ -257,6 +339,7 @@ class TagService:
                 return False
 
             # Remove tag from all solutions that use it
+            affected_ids = await self.db.solutions.distinct("_id", {"tags": tag.name})
             await self.db.solutions.update_many(
                 {"tags": tag.name},
                 {
@@ -264,11 +347,15 @@ class TagService:
                     "$set": {"updated_at": datetime.utcnow(), "updated_by": "system"},
                 },
             )
+            get_cache_registry().invalidate(SOLUTION_FACETS_CACHE)
+            await self._reindex_solutions({"_id": {"$in": affected_ids}})
 
             # Delete the tag
             result = await self.collection.delete_one({"_id": object_id})
             # Clear cache since data has been updated
-            self.tags_cache.clear()
+            self.tags_cache.invalidate()
+            if result.deleted_count:
+                autocomplete_index.remove(TAG_NAMES, tag.name)
             return result.deleted_count > 0
         except ValueError as e:
             raise e
@@ -285,24 +372,9 @@ class TagService:
         if not solution or not solution.get("tags"):
             return []
 
-        # Get all tags in a single query
+        # Get all tags with their usage counts in a single query
         tags = await self.collection.find({"name": {"$in": solution["tags"]}}).to_list(length=None)
-        if not tags:
-            return []
-
-        # Get usage counts for these tags in a single query
-        tag_names = [tag["name"] for tag in tags]
-        usage_counts = await self.get_tag_usage_counts(tag_names)
-
-        # Convert to Tag models with usage counts
-        result = []
-        for tag in tags:
-            tag_model = TagInDB(**tag)
-            tag_dict = tag_model.model_dump()
-            tag_dict["usage_count"] = usage_counts.get(tag_model.name, 0)
-            result.append(Tag(**tag_dict))
-
-        return result
+        return [Tag(**tag) for tag in tags]
 
     async def add_solution_tag_by_name(self, solution_slug: str, name: str) -> bool:
         """Add a tag to a solution by solution slug and tag name"""
@@ -320,6 +392,13 @@ class TagService:
             return False
 
         result = await self.db.solutions.update_one({"slug": solution_slug}, {"$addToSet": {"tags": formatted_name}})
+        # Clear cache since usage counts may have changed
+        self.tags_cache.invalidate()
+        if result.modified_count:
+            get_cache_registry().invalidate(SOLUTION_FACETS_CACHE)
+            if solution.get("review_status") == "APPROVED":
+                await self.adjust_usage_counts(added=[formatted_name])
+            await self._reindex_solutions({"_id": solution["_id"]})
         return result.modified_count > 0
 
     async def remove_solution_tag_by_name(self, solution_slug: str, name: str) -> bool:
@@ -338,6 +417,13 @@ class TagService:
             return False
 
         result = await self.db.solutions.update_one({"slug": solution_slug}, {"$pull": {"tags": formatted_name}})
+        # Clear cache since usage counts may have changed
+        self.tags_cache.invalidate()
+        if result.modified_count:
+            get_cache_registry().invalidate(SOLUTION_FACETS_CACHE)
+            if solution.get("review_status") == "APPROVED":
+                await self.adjust_usage_counts(removed=[formatted_name])
+            await self._reindex_solutions({"_id": solution["_id"]})
         return result.modified_count > 0
 
     async def count_tags(self, show_all: bool = False) -> int:
@@ -345,18 +431,5 @@ class TagService:
         Args:
             show_all: If True, count all tags; if False, only count tags with usage_count > 0
         """
-        if show_all:
-            return await self.collection.count_documents({})
-
-        # Get all tag names
-        cursor = self.collection.find({}, {"name": 1})
-        tag_names = [doc["name"] async for doc in cursor]
-
-        if not tag_names:
-            return 0
-
-        # Get usage counts in a single query
-        usage_counts = await self.get_tag_usage_counts(tag_names)
-
-        # Count tags with usage > 0
-        return len([count for count in usage_counts.values() if count > 0])
+        query = {} if show_all else {"usage_count": {"$gt": 0}}
+        return await self.collection.count_documents(query)
@@ -1,59 +1,275 @@
-from typing import Dict, List
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
+from app.core.cache import TECH_RADAR_CACHE, get_cache_registry
 from app.core.database import get_database
-from app.models.category import CategoryInDB
 from app.models.solution import RecommendStatusEnum
 from app.models.tech_radar import TechRadarData, TechRadarEntry
 
+# Solution fields that change the tech radar, updates to other fields keep the current snapshot
+TECH_RADAR_SOLUTION_FIELDS = {"review_status", "recommend_status", "category", "name", "slug"}
+
+# Status to ring mapping (0-based index)
+STATUS_TO_RING: Dict[RecommendStatusEnum, int] = {
+    "ADOPT": 0,
+    "TRIAL": 1,
+    "ASSESS": 2,
+    "HOLD": 3,
+}
+
+# Values of TechRadarEntry.moved
+MOVED_OUT = -1
+NOT_MOVED = 0
+MOVED_IN = 1
+NEW_ENTRY = 2
+
+
+def current_period() -> str:
+    """Get the current radar period in YYYY-MM format, in UTC like the stored timestamps"""
+    return datetime.utcnow().strftime("%Y-%m")
+
+
+def period_bounds(period: str) -> Tuple[datetime, datetime]:
+    """Get the start of a YYYY-MM radar period and the start of the next one"""
+    start = datetime.strptime(period, "%Y-%m")
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return start, end
+
+
+def invalidate_tech_radar() -> None:
+    """Drop the tech radar snapshot so it is rebuilt on the next request"""
+    get_cache_registry().invalidate(TECH_RADAR_CACHE)
+
 
 class TechRadarService:
     def __init__(self):
         self.db = get_database()
         self.solutions = self.db.solutions
         self.categories = self.db.categories
+        self.snapshots = self.db.tech_radar_snapshots
+        self.radar_cache = get_cache_registry().region(TECH_RADAR_CACHE)
 
     async def get_tech_radar_data(self) -> TechRadarData:
+        """Get the current tech radar data, see get_tech_radar_snapshot."""
+        data, _ = await self.get_tech_radar_snapshot()
+        return data
+
+    async def get_tech_radar_snapshot(self, date: Optional[str] = None) -> Optional[Tuple[TechRadarData, str]]:
+        """Get tech radar data together with its ETag.
+
+        The current snapshot is built once and kept until a solution or category change
+        that affects the radar invalidates it, or a new month starts. Every rebuild is
+        also stored as the snapshot of its period, so radars of past periods are read
+        back from the tech_radar_snapshots collection. Past periods without a stored
+        snapshot are rebuilt from the history on every request without being stored,
+        see build_tech_radar_data.
+
+        Args:
+            date: Radar period in YYYY-MM format, None for the current period
+
+        Returns:
+            Tuple of (data, etag), or None for a future period or one before the first history record
+        """
+        current_date = current_period()
+        if date and date != current_date:
+            if date > current_date:
+                return None
+            snapshot = await self.snapshots.find_one({"_id": date})
+            if snapshot:
+                return TechRadarData(date=snapshot["date"], entries=snapshot["entries"]), snapshot["etag"]
+            _, period_end = period_bounds(date)
+            if not await self.db.history.find_one({"created_at": {"$lt": period_end}}, {"_id": 1}):
+                return None
+            data = await self.build_tech_radar_data(date)
+            return data, self._etag(data)
+
+        snapshot = self.radar_cache.get("current")
+        if snapshot is None or snapshot[0].date != current_date:
+            snapshot = await self._store_snapshot(await self.build_tech_radar_data())
+            self.radar_cache.set("current", snapshot)
+        return snapshot
+
+    @staticmethod
+    def _etag(data: TechRadarData) -> str:
+        """Get the ETag of radar data"""
+        return f'"{hashlib.sha256(data.model_dump_json().encode()).hexdigest()[:32]}"'
+
+    async def _store_snapshot(self, data: TechRadarData) -> Tuple[TechRadarData, str]:
+        """Store radar data as the snapshot of its period and return it with its ETag"""
+        etag = self._etag(data)
+        await self.snapshots.replace_one(
+            {"_id": data.date},
+            {**data.model_dump(), "etag": etag, "updated_at": datetime.utcnow()},
+            upsert=True,
+        )
+        return data, etag
+
+    async def get_period_start_statuses(
+        self, period_start: datetime, period_end: Optional[datetime] = None
+    ) -> Dict[str, Optional[str]]:
+        """Get the recommend status each solution had when the radar period started.
+
+        Only solutions whose recommend_status changed in the period are returned,
+        all others are unchanged. Uses one aggregation sorted like the history index on
+        (object_type, object_id, created_at DESC, _id DESC): the oldest change of each
+        solution in the period, the last one of its group, holds the status before it.
+        None means the solution was created in the period.
+
+        Args:
+            period_start: Start of the radar period
+            period_end: End of the radar period, None for the current period
+
+        Returns:
+            Dictionary mapping solution IDs to their recommend status at period_start
+        """
+        created_at = {"$gte": period_start}
+        if period_end is not None:
+            created_at["$lt"] = period_end
+        pipeline = [
+            {
+                "$match": {
+                    "object_type": "solution",
+                    "created_at": created_at,
+                    "changed_fields.field_name": "recommend_status",
+                }
+            },
+            {"$sort": {"object_id": 1, "created_at": -1, "_id": -1}},
+            {
+                "$group": {
+                    "_id": "$object_id",
+                    "changed_fields": {"$last": "$changed_fields"},
+                }
+            },
+            {
+                "$project": {
+                    "change": {
+                        "$arrayElemAt": [
+                            {
+                                "$filter": {
+                                    "input": "$changed_fields",
+                                    "cond": {"$eq": ["$$this.field_name", "recommend_status"]},
+                                }
+                            },
+                            0,
+                        ]
+                    }
+                }
+            },
+        ]
+
+        statuses = {}
+        async for result in self.db.history.aggregate(pipeline, allowDiskUse=True):
+            statuses[result["_id"]] = result["change"].get("old_value")
+        return statuses
+
+    @staticmethod
+    def _calculate_moved(ring: int, previous_status: Optional[str]) -> int:
+        """Compare a ring with the ring of the status at the start of the period"""
+        previous_ring = STATUS_TO_RING.get(previous_status)
+        if previous_ring is None:
+            return NEW_ENTRY
+        if ring < previous_ring:
+            return MOVED_IN
+        if ring > previous_ring:
+            return MOVED_OUT
+        return NOT_MOVED
+
+    async def get_solutions_at(self, moment: datetime) -> List[dict]:
+        """Get the radar fields of the solutions as they were at a past moment.
+
+        Starts from the current solutions created before the moment and reverts the
+        changes recorded in the history since then, newest first. Deleted solutions
+        are not included, their history records don't hold their fields.
+
+        Args:
+            moment: Point in time to rebuild the solutions at
+
+        Returns:
+            Solution documents with _id and the TECH_RADAR_SOLUTION_FIELDS
+        """
+        projection = {field: 1 for field in TECH_RADAR_SOLUTION_FIELDS}
+        solutions = {
+            str(solution["_id"]): solution
+            async for solution in self.solutions.find({"created_at": {"$not": {"$gte": moment}}}, projection)
+        }
+
+        cursor = self.db.history.find(
+            {
+                "object_type": "solution",
+                "change_type": "update",
+                "created_at": {"$gte": moment},
+                "changed_fields.field_name": {"$in": list(TECH_RADAR_SOLUTION_FIELDS)},
+            },
+            {"object_id": 1, "changed_fields": 1},
+        ).sort([("created_at", -1), ("_id", -1)])
+        async for record in cursor:
+            solution = solutions.get(record["object_id"])
+            if solution is None:
+                continue
+            for change in record["changed_fields"]:
+                if change["field_name"] in TECH_RADAR_SOLUTION_FIELDS:
+                    solution[change["field_name"]] = change.get("old_value")
+        return list(solutions.values())
+
+    async def build_tech_radar_data(self, date: Optional[str] = None) -> TechRadarData:
         """Generate tech radar data from approved solutions.
         Only includes solutions whose categories have radar_quadrant >= 0.
+        Movement is relative to the start of the month.
+
+        Past months are rebuilt from the history: solutions deleted since then are
+        missing, and categories are mapped to their current radar quadrant.
+
+        Args:
+            date: Past radar period in YYYY-MM format, None for the current period
         """
-        # Get all approved solutions
-        cursor = self.solutions.find({"review_status": "APPROVED"})
-
-        # Status to ring mapping (0-based index)
-        status_to_ring: Dict[RecommendStatusEnum, int] = {
-            "ADOPT": 0,
-            "TRIAL": 1,
-            "ASSESS": 2,
-            "HOLD": 3,
-        }
+        period = date or current_period()
+        period_start, period_end = period_bounds(period)
+        previous_statuses = await self.get_period_start_statuses(period_start, period_end if date else None)
 
-        entries: List[TechRadarEntry] = []
-        async for solution in cursor:
-            # Get category information
-            category_data = await self.categories.find_one({"name": solution["category"]})
-            if not category_data:
-                continue  # Skip if category not found
+        # Map category names to radar quadrants, the first category wins for duplicate names
+        quadrants: Dict[str, int] = {}
+        async for category in self.categories.find({}, {"name": 1, "radar_quadrant": 1}):
+            quadrants.setdefault(category["name"], category.get("radar_quadrant", -1))
 
-            # Parse category data using CategoryInDB model
-            category = CategoryInDB(**category_data)
+        # Get all approved solutions
+        if date:
+            solutions = [
+                solution
+                for solution in await self.get_solutions_at(period_end)
+                if solution.get("review_status") == "APPROVED"
+            ]
+        else:
+            solutions = await self.solutions.find(
+                {"review_status": "APPROVED"}, {"name": 1, "slug": 1, "category": 1, "recommend_status": 1}
+            ).to_list(length=None)
 
-            # Skip if radar_quadrant is negative
-            if category.radar_quadrant < 0:
+        entries: List[TechRadarEntry] = []
+        for solution in solutions:
+            quadrant = quadrants.get(solution.get("category"), -1)
+            # Skip if category not found or radar_quadrant is negative
+            if quadrant < 0 or solution.get("recommend_status") not in STATUS_TO_RING:
                 continue
 
+            ring = STATUS_TO_RING[solution["recommend_status"]]
+            solution_id = str(solution["_id"])
+            if solution_id in previous_statuses:
+                moved = self._calculate_moved(ring, previous_statuses[solution_id])
+            else:
+                moved = NOT_MOVED
+
             # Create radar entry
             entry = TechRadarEntry(
-                quadrant=category.radar_quadrant,
-                ring=status_to_ring[solution["recommend_status"]],
+                quadrant=quadrant,
+                ring=ring,
                 label=solution["name"],
                 link=f"/solutions/{solution.get('slug', '')}",
                 active=True,  # Always true for approved solutions
-                moved=0,  # Always 0 as per requirements
+                moved=moved,
             )
             entries.append(entry)
 
-        # Create and return radar data with current date
-        return TechRadarData.create_current(entries)
+        return TechRadarData(date=period, entries=entries)
 
     async def get_radar_quadrants(self) -> List[Dict[str, str]]:
         """Get radar quadrants from categories collection.
@@ -1,22 +1,38 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import httpx
-from cachetools import TTLCache, keys
+from cachetools import keys
 from fastapi import HTTPException, status
 
+from app.core.cache import AUTH_USERS_CACHE, AVATARS_CACHE, USER_NAMES_CACHE, get_cache_registry
 from app.core.config import settings
+from app.core.http_client import get_http_client
 from app.core.mongodb import get_database
-from app.core.password import get_password_hash, verify_password
+from app.core.password import get_password_hash_async, verify_password_async
 from app.models.user import User, UserCreate, UserInDB, UserPasswordUpdate, UserUpdate
 
 
+_MISSING = object()
+
+
 class UserService:
     def __init__(self):
         self.db = get_database()
         self.collection = self.db.users
-        # Create a cache with 1-day TTL (86400 seconds)
-        self.avatar_cache = TTLCache(maxsize=1000, ttl=86400)
+        # Shared application-wide cache region with 1-day TTL (86400 seconds)
+        self.avatar_cache = get_cache_registry().region(AVATARS_CACHE)
+        # Short-lived cache of users resolved from access tokens
+        self.auth_user_cache = get_cache_registry().region(AUTH_USERS_CACHE)
+        # Display names shared across requests, plus a memo for the lifetime of this service (one request)
+        self.full_name_cache = get_cache_registry().region(USER_NAMES_CACHE)
+        self.full_names: Dict[str, Optional[str]] = {}
+
+    def _invalidate_user_caches(self, *usernames: str) -> None:
+        """Drop users from the user caches after they were created, changed or deleted."""
+        for username in usernames:
+            self.auth_user_cache.invalidate(username)
+            self.full_name_cache.invalidate(username)
+            self.full_names.pop(username, None)
 
     async def _get_user_or_404(self, username: str) -> UserInDB:
         """Get a user by username or raise 404 if not found."""
@@ -94,10 +110,19 @@ class UserService:
             return UserInDB(**user_dict)
         return None
 
+    async def get_authenticated_user(self, username: str) -> Optional[UserInDB]:
+        """Get the user behind an access token, served from the authenticated user cache when possible."""
+        user = self.auth_user_cache.get(username)
+        if user is None:
+            user = await self.get_user_by_username(username)
+            if user is not None:
+                self.auth_user_cache.set(username, user)
+        return user
+
     async def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Authenticate a user."""
         user = await self.get_user_by_username(username)
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(password, user.hashed_password):
             return None
         return User.model_validate(user)
 
@@ -153,12 +178,14 @@ class UserService:
             {
                 "created_at": datetime.utcnow(),
                 "updated_at": datetime.utcnow(),
-                "hashed_password": get_password_hash(user.password) if user.password else "",
+                "hashed_password": await get_password_hash_async(user.password) if user.password else "",
             }
         )
 
         result = await self.collection.insert_one(user_dict)
         user_dict["_id"] = result.inserted_id
+        # Unknown usernames are cached as None
+        self._invalidate_user_caches(user.username)
         return User(**user_dict)
 
     async def update_user_password(
@@ -180,18 +207,19 @@ class UserService:
                 detail="External users cannot change their password",
             )
 
-        if not verify_password(password_update.current_password, user.hashed_password):
+        if not await verify_password_async(password_update.current_password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect",
             )
 
         update_data = self._prepare_update_data(
-            {"hashed_password": get_password_hash(password_update.new_password)},
+            {"hashed_password": await get_password_hash_async(password_update.new_password)},
             current_username,
         )
 
         result = await self.collection.update_one({"username": username}, {"$set": update_data})
+        self._invalidate_user_caches(username)
         return result.modified_count > 0
 
     async def update_user_by_username(
@@ -222,6 +250,7 @@ class UserService:
         result = await self.collection.find_one_and_update(
             {"username": username}, {"$set": update_data}, return_document=True
         )
+        self._invalidate_user_caches(username, update_data.get("username", username))
         return User(**result) if result else None
 
     async def update_external_user(self, username: str, full_name: str, email: str) -> Optional[User]:
@@ -231,6 +260,7 @@ class UserService:
         result = await self.collection.find_one_and_update(
             {"username": username}, {"$set": update_data}, return_document=True
         )
+        self._invalidate_user_caches(username)
         return User(**result) if result else None
 
     async def admin_update_user(
@@ -254,7 +284,7 @@ class UserService:
             update_dict = {k: v for k, v in update_dict.items() if k in allowed_fields}
         else:
             if new_password is not None:
-                update_dict["hashed_password"] = get_password_hash(new_password)
+                update_dict["hashed_password"] = await get_password_hash_async(new_password)
             if "username" in update_dict:
                 update_dict["username"] = update_dict["username"].lower()
                 await self._check_username_uniqueness(update_dict["username"], username)
@@ -264,6 +294,7 @@ class UserService:
         result = await self.collection.find_one_and_update(
             {"username": username}, {"$set": update_data}, return_document=True
         )
+        self._invalidate_user_caches(username, update_data.get("username", username))
         return User(**result) if result else None
 
     async def admin_delete_user(self, username: str, admin_username: str) -> bool:
@@ -284,6 +315,7 @@ class UserService:
             )
 
         result = await self.collection.delete_one({"username": username})
+        self._invalidate_user_caches(username)
         return result.deleted_count > 0
 
     async def count_users(
@@ -319,6 +351,39 @@ class UserService:
             return {"username": username, "full_name": user["full_name"]}
         return None
 
+    async def get_full_names(self, usernames: List[str]) -> Dict[str, Optional[str]]:
+        """Resolve the full names of many users with at most one query.
+
+        Names are looked up in the request memo and the shared cache first, the
+        remaining usernames are fetched together with a single $in query.
+
+        Args:
+            usernames: Usernames to resolve, duplicates are allowed
+
+        Returns:
+            Dictionary mapping each username to its full name, or None for unknown users
+        """
+        missing = []
+        for username in dict.fromkeys(usernames):
+            if username in self.full_names:
+                continue
+            # Users without a full name and unknown users are cached as None too
+            full_name = self.full_name_cache.get(username, _MISSING)
+            if full_name is not _MISSING:
+                self.full_names[username] = full_name
+            else:
+                missing.append(username)
+
+        if missing:
+            cursor = self.collection.find({"username": {"$in": missing}}, {"username": 1, "full_name": 1})
+            async for user in cursor:
+                self.full_names[user["username"]] = user.get("full_name")
+            for username in missing:
+                self.full_names.setdefault(username, None)
+                self.full_name_cache.set(username, self.full_names[username])
+
+        return {username: self.full_names[username] for username in usernames}
+
     async def get_users_by_usernames(self, usernames: List[str]) -> List[User]:
         """Get multiple users by their usernames.
 
@@ -355,8 +420,9 @@ class UserService:
         cache_key = keys.hashkey(username, settings.AVATAR_SERVER_ENABLED, settings.AVATAR_SERVER_URL)
 
         # Try to get from cache
-        if cache_key in self.avatar_cache:
-            return (self.avatar_cache[cache_key]["content"], self.avatar_cache[cache_key]["media_type"])
+        cached = self.avatar_cache.get(cache_key)
+        if cached is not None:
+            return cached["content"], cached["media_type"]
 
         # Generate or fetch avatar
         if settings.AVATAR_SERVER_ENABLED and settings.AVATAR_SERVER_URL:
@@ -365,7 +431,7 @@ class UserService:
             content, media_type = self._generate_svg_avatar(username)
 
         # Cache the response
-        self.avatar_cache[cache_key] = {"content": content, "media_type": media_type}
+        self.avatar_cache.set(cache_key, {"content": content, "media_type": media_type})
 
         return content, media_type
 
@@ -382,10 +448,9 @@ class UserService:
         """
         try:
             avatar_url = settings.AVATAR_SERVER_URL.format(username=username)
-            async with httpx.AsyncClient(verify=False) as client:
-                response = await client.get(avatar_url)
-                if response.status_code == 200:
-                    return response.content, response.headers.get("content-type", "image/png")
+            response = await get_http_client().get(avatar_url)
+            if response.status_code == 200:
+                return response.content, response.headers.get("content-type", "image/png")
         except Exception:
             # Log error if needed
             pass
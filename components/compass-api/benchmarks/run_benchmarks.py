@@ -0,0 +1,269 @@
+"""
+Benchmark the hot read endpoints of the API in-process.
+
+The app runs with its full lifespan (indexes, search index, caches) against a throwaway
+database: either a temporary mongod started by this script, or a fresh database on an
+existing server. The database is seeded with deterministic data at the requested scale,
+each endpoint is warmed up and then called with a fixed concurrency, and throughput and
+latency percentiles are written as JSON so runs can be diffed.
+
+Usage:
+    python benchmarks/run_benchmarks.py --solutions 5000 --output results.json
+    python benchmarks/run_benchmarks.py --mongodb-url mongodb://localhost:27017 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings that have no default, the benchmark doesn't log in
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DEFAULT_ADMIN_PASSWORD", "benchmark")
+
+import httpx  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from benchmarks.seed import NAME_WORDS, TAG_WORDS, seed_database  # noqa: E402
+
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+class TemporaryMongod:
+    """A mongod on a free local port with its data in a temporary directory"""
+
+    def __init__(self, binary: str):
+        self.binary = binary
+        self.dbpath: Optional[str] = None
+        self.process: Optional[subprocess.Popen] = None
+        self.url: Optional[str] = None
+
+    def start(self) -> str:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        self.dbpath = tempfile.mkdtemp(prefix="compass-bench-")
+        self.process = subprocess.Popen(
+            [self.binary, "--dbpath", self.dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.url = f"mongodb://127.0.0.1:{port}"
+        return self.url
+
+    def stop(self) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=30)
+        if self.dbpath is not None:
+            shutil.rmtree(self.dbpath, ignore_errors=True)
+
+
+async def wait_for_mongo(url: str, timeout: float = 30) -> str:
+    """Wait until the server accepts connections and return its version"""
+    client = AsyncIOMotorClient(url, serverSelectionTimeoutMS=int(timeout * 1000))
+    try:
+        info = await client.server_info()
+        return info["version"]
+    finally:
+        client.close()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def endpoints(slugs: List[str]) -> Dict[str, Callable[[int], str]]:
+    """Hot endpoints, each a function of the request number returning the URL to call"""
+    return {
+        "solutions_list": lambda i: "/api/solutions/?limit=20",
+        "solutions_list_filtered": lambda i: f"/api/solutions/?limit=20&tags={TAG_WORDS[i % len(TAG_WORDS)]}",
+        "solution_detail": lambda i: f"/api/solutions/{slugs[i % len(slugs)]}",
+        "solution_search": lambda i: f"/api/solutions/search/?keyword={NAME_WORDS[i % len(NAME_WORDS)]}&limit=20",
+        "solution_facets": lambda i: "/api/solutions/facets/",
+        "tech_radar": lambda i: "/api/tech-radar/data",
+        "tags": lambda i: "/api/tags/",
+        "categories": lambda i: "/api/categories/",
+        "solution_comments": lambda i: f"/api/comments/solution/{slugs[i % len(slugs)]}",
+        "solution_ratings": lambda i: f"/api/ratings/solution/{slugs[i % len(slugs)]}",
+    }
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient, url_for: Callable[[int], str], requests: int, concurrency: int, warmup: int
+) -> Dict[str, Any]:
+    """Call an endpoint requests times with concurrency workers and summarize the latencies"""
+    for i in range(warmup):
+        await client.get(url_for(i))
+
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            response = await client.get(url_for(i))
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+            match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+        "db_queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    mongod = None
+    url = args.mongodb_url
+    if url is None:
+        binary = shutil.which("mongod")
+        if binary is None:
+            raise SystemExit("mongod was not found on PATH, pass --mongodb-url to use an existing server")
+        mongod = TemporaryMongod(binary)
+        url = mongod.start()
+
+    database_name = f"compass_bench_{uuid.uuid4().hex[:8]}"
+    seed_client = None
+    try:
+        server_version = await wait_for_mongo(url)
+
+        # Seed before startup so the app builds its indexes and in-memory indexes from the data
+        seed_client = AsyncIOMotorClient(url)
+        db = seed_client[database_name]
+        seed_start = time.perf_counter()
+        counts = await seed_database(
+            db,
+            solutions=args.solutions,
+            ratings_per_solution=args.ratings_per_solution,
+            comments_per_solution=args.comments_per_solution,
+            history_per_solution=args.history_per_solution,
+            users=args.users,
+            tags=args.tags,
+            seed=args.seed,
+        )
+        seed_seconds = time.perf_counter() - seed_start
+        slugs = [doc["slug"] async for doc in db.solutions.find({"review_status": "APPROVED"}, {"slug": 1}).limit(500)]
+
+        settings.MONGODB_URL = url
+        settings.DATABASE_NAME = database_name
+        # Query counts are reported per endpoint, skip the per-request budget warnings
+        settings.REQUEST_QUERY_BUDGET = 0
+        from main import app
+
+        results = {}
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                for name, url_for in endpoints(slugs).items():
+                    if args.only and name not in args.only:
+                        continue
+                    results[name] = await run_endpoint(client, url_for, args.requests, args.concurrency, args.warmup)
+                    latency = results[name]["latency_ms"]
+                    print(
+                        f"{name:<26} {results[name]['throughput_rps']:>8} req/s  "
+                        f"p50 {latency['p50']:>7}ms  p95 {latency['p95']:>7}ms  p99 {latency['p99']:>7}ms",
+                        file=sys.stderr,
+                    )
+
+        return {
+            "config": {
+                "solutions": args.solutions,
+                "ratings_per_solution": args.ratings_per_solution,
+                "comments_per_solution": args.comments_per_solution,
+                "history_per_solution": args.history_per_solution,
+                "users": args.users,
+                "tags": args.tags,
+                "seed": args.seed,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "warmup": args.warmup,
+                "search_backend": settings.SEARCH_BACKEND,
+            },
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "mongodb": server_version,
+            },
+            "seed": {"documents": counts, "seconds": round(seed_seconds, 2)},
+            "results": results,
+        }
+    finally:
+        if seed_client is not None:
+            if not args.keep_database:
+                await seed_client.drop_database(database_name)
+            seed_client.close()
+        if mongod is not None:
+            mongod.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the hot read endpoints of the API")
+    parser.add_argument(
+        "--mongodb-url",
+        default=None,
+        help="Use a throwaway database on this server instead of starting a temporary mongod",
+    )
+    parser.add_argument("--solutions", type=int, default=1000, help="Number of solutions to seed")
+    parser.add_argument("--ratings-per-solution", type=int, default=10, help="Average ratings per solution")
+    parser.add_argument("--comments-per-solution", type=int, default=5, help="Average comments per solution")
+    parser.add_argument("--history-per-solution", type=int, default=3, help="History records per solution")
+    parser.add_argument("--users", type=int, default=200, help="Number of users to seed")
+    parser.add_argument("--tags", type=int, default=100, help="Number of tags to seed")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed of the generated data")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent requests")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per endpoint before measuring")
+    parser.add_argument("--only", nargs="+", help="Only run these endpoints")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--keep-database", action="store_true", help="Don't drop the seeded database")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
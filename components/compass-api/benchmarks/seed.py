@@ -0,0 +1,344 @@
+"""
+Deterministic bulk data for benchmarks and load tests, written straight to MongoDB with
+insert_many. The same seed and scale always produce the same documents, so runs are comparable.
+"""
+
+import asyncio
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.models.tag import format_tag_name
+from app.services.solution_service import generate_slug
+
+# Fixed clock so the generated timestamps don't depend on when the data is seeded
+BASE_TIME = datetime(2024, 1, 1)
+
+CATEGORIES = [
+    ("Languages & Frameworks", 1),
+    ("Frontend", 1),
+    ("Platforms", 2),
+    ("Databases", 2),
+    ("Messaging", 2),
+    ("Tools", 3),
+    ("Observability", 3),
+    ("Security", 3),
+    ("Techniques", 4),
+    ("Data & AI", 4),
+]
+
+NAME_WORDS = [
+    "kube", "flux", "atlas", "nova", "pulse", "forge", "stream", "vault", "beacon", "orbit",
+    "spark", "relay", "prism", "harbor", "quartz", "ember", "summit", "vector", "cobalt", "delta",
+    "lumen", "matrix", "nimbus", "onyx", "pilot", "raven", "sentry", "tensor", "vertex", "zenith",
+]
+NAME_SUFFIXES = ["DB", "Gateway", "Engine", "Hub", "Studio", "Cloud", "Mesh", "Lake", "Flow", "Kit"]
+
+TAG_WORDS = [
+    "python", "java", "go", "rust", "typescript", "react", "vue", "kubernetes", "docker", "terraform",
+    "postgres", "mongodb", "redis", "kafka", "grpc", "graphql", "oauth", "monitoring", "logging", "tracing",
+    "ci-cd", "testing", "serverless", "ml", "etl", "caching", "search", "queue", "storage", "networking",
+]
+
+DESCRIPTION_WORDS = [
+    "scalable", "platform", "service", "deployment", "cluster", "pipeline", "analytics", "secure", "latency",
+    "throughput", "container", "orchestration", "dashboard", "integration", "automation", "compliance",
+    "replication", "streaming", "observability", "workflow", "schema", "migration", "cache", "index",
+]
+
+DEPARTMENTS = ["Engineering", "Platform", "Data", "Security", "Infrastructure", "Product"]
+STAGES = ["DEVELOPING", "UAT", "PRODUCTION", "DEPRECATED", "RETIRED"]
+RECOMMEND_STATUSES = ["ADOPT", "TRIAL", "ASSESS", "HOLD"]
+ADOPTION_LEVELS = ["PILOT", "TEAM", "DEPARTMENT", "ENTERPRISE", "INDUSTRY"]
+# Most solutions in a live catalogue are approved
+REVIEW_STATUSES = ["APPROVED"] * 8 + ["PENDING", "REJECTED"]
+
+# Seeded users can't log in: a valid bcrypt hash of a random secret that was thrown away,
+# so login verifies it like any other hash and rejects every password
+UNUSABLE_PASSWORD_HASH = "$2b$12$dpGlSzHnMHK04eJNb3Kr0u.Zr7K9.XWlwb1Q.kFNNfZ7VzBg088fe"
+
+
+def _object_id(rng: random.Random) -> ObjectId:
+    return ObjectId(rng.randbytes(12))
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(DESCRIPTION_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _timestamp(rng: random.Random, days: int = 365) -> datetime:
+    return BASE_TIME + timedelta(seconds=rng.randrange(days * 86400))
+
+
+def generate_users(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    """Generate user documents named user0 .. user{count - 1}"""
+    users = []
+    for i in range(count):
+        created_at = _timestamp(rng)
+        users.append(
+            {
+                "_id": _object_id(rng),
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "full_name": f"User {i}",
+                "hashed_password": UNUSABLE_PASSWORD_HASH,
+                "is_active": True,
+                "is_superuser": False,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+    return users
+
+
+def generate_categories(rng: random.Random) -> List[Dict[str, Any]]:
+    """Generate the category documents"""
+    return [
+        {
+            "_id": _object_id(rng),
+            "name": name,
+            "description": f"{name} used across the company",
+            "radar_quadrant": quadrant,
+            "created_at": BASE_TIME,
+            "updated_at": BASE_TIME,
+        }
+        for name, quadrant in CATEGORIES
+    ]
+
+
+def generate_tag_names(count: int) -> List[str]:
+    """Tag names: the base words first, then numbered variants"""
+    names = [format_tag_name(TAG_WORDS[i % len(TAG_WORDS)]) for i in range(count)]
+    return [name if i < len(TAG_WORDS) else f"{name}-{i // len(TAG_WORDS)}" for i, name in enumerate(names)]
+
+
+def generate_solution(rng: random.Random, index: int, tag_names: List[str], users: int) -> Dict[str, Any]:
+    """Generate a solution document, index keeps names and slugs unique"""
+    name = f"{rng.choice(NAME_WORDS).title()} {rng.choice(NAME_SUFFIXES)} {index}"
+    created_at = _timestamp(rng)
+    maintainer = rng.randrange(users)
+    return {
+        "_id": _object_id(rng),
+        "name": name,
+        "slug": generate_slug(name),
+        "description": _sentence(rng, rng.randint(20, 60)),
+        "brief": _sentence(rng, rng.randint(5, 12))[:200],
+        "logo": "",
+        "category": rng.choice(CATEGORIES)[0],
+        "department": rng.choice(DEPARTMENTS),
+        "team": f"Team {rng.randrange(50)}",
+        "team_email": None,
+        "maintainer_id": f"user{maintainer}",
+        "maintainer_name": f"User {maintainer}",
+        "maintainer_email": f"user{maintainer}@example.com",
+        "official_website": None,
+        "documentation_url": None,
+        "demo_url": None,
+        "version": f"{rng.randint(0, 5)}.{rng.randint(0, 20)}.{rng.randint(0, 9)}",
+        "adoption_level": rng.choice(ADOPTION_LEVELS),
+        "adoption_user_count": rng.randrange(500),
+        "tags": rng.sample(tag_names, rng.randint(1, min(5, len(tag_names)))),
+        "pros": [_sentence(rng, 6) for _ in range(rng.randint(0, 3))],
+        "cons": [_sentence(rng, 6) for _ in range(rng.randint(0, 3))],
+        "stage": rng.choice(STAGES),
+        "recommend_status": rng.choice(RECOMMEND_STATUSES),
+        "review_status": rng.choice(REVIEW_STATUSES),
+        "created_at": created_at,
+        "created_by": f"user{maintainer}",
+        "updated_at": created_at,
+        "updated_by": f"user{maintainer}",
+    }
+
+
+def generate_ratings(rng: random.Random, solution: Dict[str, Any], count: int, users: int) -> List[Dict[str, Any]]:
+    """Generate ratings of a solution, at most one per user"""
+    ratings = []
+    for user in rng.sample(range(users), min(count, users)):
+        created_at = solution["created_at"] + timedelta(seconds=rng.randrange(180 * 86400))
+        ratings.append(
+            {
+                "_id": _object_id(rng),
+                "solution_slug": solution["slug"],
+                "username": f"user{user}",
+                "score": rng.choices(range(1, 6), weights=(1, 2, 4, 6, 4))[0],
+                "comment": _sentence(rng, 8) if rng.random() < 0.3 else None,
+                "is_adopted_user": rng.random() < 0.2,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+    return ratings
+
+
+def rating_stats(ratings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rating statistics stored on the solution, as maintained by RatingService"""
+    scores = Counter(rating["score"] for rating in ratings)
+    rating_sum = sum(score * count for score, count in scores.items())
+    return {
+        "rating": round(rating_sum / len(ratings), 2) if ratings else 0,
+        "rating_sum": rating_sum,
+        "rating_count": len(ratings),
+        "rating_distribution": {str(i): scores.get(i, 0) for i in range(1, 6)},
+    }
+
+
+def generate_comments(rng: random.Random, solution: Dict[str, Any], count: int, users: int) -> List[Dict[str, Any]]:
+    """Generate comments on a solution"""
+    comments = []
+    for _ in range(count):
+        created_at = solution["created_at"] + timedelta(seconds=rng.randrange(180 * 86400))
+        username = f"user{rng.randrange(users)}"
+        comments.append(
+            {
+                "_id": _object_id(rng),
+                "solution_slug": solution["slug"],
+                "username": username,
+                "content": _sentence(rng, rng.randint(5, 40)),
+                "is_adopted_user": rng.random() < 0.2,
+                "type": "OFFICIAL" if rng.random() < 0.05 else "USER",
+                "created_at": created_at,
+                "created_by": username,
+                "updated_at": created_at,
+                "updated_by": username,
+            }
+        )
+    return comments
+
+
+def generate_history(rng: random.Random, solution: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+    """Generate the creation record of a solution followed by count - 1 status updates
+    ending on its current recommend status"""
+    if count <= 0:
+        return []
+
+    records = [
+        {
+            "_id": _object_id(rng),
+            "object_type": "solution",
+            "object_id": str(solution["_id"]),
+            "object_name": solution["name"],
+            "change_type": "create",
+            "changed_fields": [],
+            "change_summary": f"Created solution '{solution['name']}'",
+            "created_at": solution["created_at"],
+            "created_by": solution["created_by"],
+            "updated_at": solution["created_at"],
+            "updated_by": solution["created_by"],
+        }
+    ]
+    # Replaying the updates from the first status must end on the status the solution has now
+    statuses = [rng.choice(RECOMMEND_STATUSES) for _ in range(count - 1)] + [solution["recommend_status"]]
+    changed_at = solution["created_at"]
+    for status, new_status in zip(statuses, statuses[1:]):
+        changed_at += timedelta(seconds=rng.randrange(30 * 86400))
+        records.append(
+            {
+                "_id": _object_id(rng),
+                "object_type": "solution",
+                "object_id": str(solution["_id"]),
+                "object_name": solution["name"],
+                "change_type": "update",
+                "changed_fields": [
+                    {"field_name": "recommend_status", "old_value": status, "new_value": new_status}
+                ],
+                "change_summary": f"Updated solution '{solution['name']}': recommend_status",
+                "created_at": changed_at,
+                "created_by": solution["updated_by"],
+                "updated_at": changed_at,
+                "updated_by": solution["updated_by"],
+            }
+        )
+    return records
+
+
+async def seed_database(
+    db: AsyncIOMotorDatabase,
+    solutions: int = 1000,
+    ratings_per_solution: int = 10,
+    comments_per_solution: int = 5,
+    history_per_solution: int = 3,
+    users: int = 200,
+    tags: int = 100,
+    seed: int = 42,
+    batch_size: int = 1000,
+    concurrency: int = 4,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> Dict[str, int]:
+    """Fill an empty database with generated documents
+
+    Rating statistics and tag usage counts are computed while generating, so the
+    documents look like the API maintained them. Documents are generated one solution
+    at a time and inserted in batches, with up to concurrency insert_many calls in
+    flight while the next batches are generated, so memory stays bounded at any scale.
+
+    Args:
+        on_progress: Called with the number of solutions generated so far after every batch_size solutions
+
+    Returns:
+        Number of documents inserted per collection
+    """
+    rng = random.Random(seed)
+    inserted: Counter = Counter()
+    pending: Dict[str, List[Dict[str, Any]]] = {}
+    slots = asyncio.Semaphore(concurrency)
+    inserts: List[asyncio.Task] = []
+
+    async def insert(collection: str, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await db[collection].insert_many(batch, ordered=False)
+            inserted[collection] += len(batch)
+        finally:
+            slots.release()
+
+    async def write(collection: str, documents: List[Dict[str, Any]], flush: bool = False) -> None:
+        batch = pending.setdefault(collection, [])
+        batch.extend(documents)
+        if batch and (flush or len(batch) >= batch_size):
+            pending[collection] = []
+            await slots.acquire()
+            inserts.append(asyncio.create_task(insert(collection, batch)))
+            # Let the insert start on Motor's executor while the next batch is generated
+            await asyncio.sleep(0)
+
+    await write("users", generate_users(rng, users), flush=True)
+    await write("categories", generate_categories(rng), flush=True)
+
+    tag_names = generate_tag_names(tags)
+    tag_usage: Counter = Counter()
+    for index in range(solutions):
+        solution = generate_solution(rng, index, tag_names, users)
+        ratings = generate_ratings(rng, solution, rng.randint(0, 2 * ratings_per_solution), users)
+        solution.update(rating_stats(ratings))
+        if solution["review_status"] == "APPROVED":
+            tag_usage.update(solution["tags"])
+
+        await write("solutions", [solution])
+        await write("ratings", ratings)
+        await write("comments", generate_comments(rng, solution, rng.randint(0, 2 * comments_per_solution), users))
+        await write("history", generate_history(rng, solution, history_per_solution))
+        if on_progress is not None and (index + 1) % batch_size == 0:
+            on_progress(index + 1)
+
+    await write(
+        "tags",
+        [
+            {
+                "_id": _object_id(rng),
+                "name": name,
+                "description": f"Solutions related to {name}",
+                "usage_count": tag_usage.get(name, 0),
+                "created_at": BASE_TIME,
+                "updated_at": BASE_TIME,
+            }
+            for name in tag_names
+        ],
+    )
+    for collection in list(pending):
+        await write(collection, [], flush=True)
+    # Raises the first failed insert
+    await asyncio.gather(*inserts)
+    return dict(inserted)
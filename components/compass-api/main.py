@@ -4,10 +4,22 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 
-from app.core.mongodb import connect_to_mongo, close_mongo_connection
+from app.core.autocomplete import autocomplete_index
+from app.core.cache import close_cache_registry, init_cache_registry
+from app.core.config import settings
+from app.core.history_recorder import history_recorder
+from app.core.http_client import close_http_client, init_http_client
+from app.core.indexes import ensure_indexes
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, metrics_registry
+from app.core.mongodb import connect_to_mongo, close_mongo_connection, get_database
+from app.core.password import password_hasher
+from app.core.request_context import RequestContextMiddleware
+from app.core.search import search_index
 from app.routers import api_router
+from app.services.rating_service import RatingService
+from app.services.tag_service import TagService
 from app.services.user_service import UserService
 
 # Configure logging
@@ -21,7 +33,28 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    init_cache_registry()
+    password_hasher.start()
+    await init_http_client()
+
+    # Reconcile the index manifest once, outside the request path
+    if settings.MONGODB_ENSURE_INDEXES:
+        try:
+            await ensure_indexes(get_database())
+            logger.info("Index reconciliation completed")
+        except Exception as e:
+            logger.error(f"Error reconciling indexes: {e}")
+
+    # Write history records in batches from a background task
+    if settings.HISTORY_WRITE_MODE == "async":
+        history_recorder.start(get_database().history)
     
+    # Load the in-memory autocomplete index
+    try:
+        await autocomplete_index.start(get_database())
+    except Exception as e:
+        logger.error(f"Error loading autocomplete index: {e}")
+
     # Ensure default admin exists
     user_service = UserService()
     try:
@@ -29,9 +62,38 @@ async def lifespan(app: FastAPI):
         logger.info("Default admin user check completed")
     except Exception as e:
         logger.error(f"Error ensuring default admin user: {e}")
+
+    # Backfill rating statistics for solutions created before they were maintained
+    try:
+        backfilled = await RatingService().backfill_rating_stats()
+        if backfilled:
+            logger.info(f"Backfilled rating statistics for {backfilled} solutions")
+    except Exception as e:
+        logger.error(f"Error backfilling rating statistics: {e}")
+
+    # Repair tag usage counters that drifted, e.g. after direct database changes
+    try:
+        corrected = await TagService().reconcile_usage_counts()
+        if corrected:
+            logger.info(f"Reconciled usage counts for {corrected} tags")
+    except Exception as e:
+        logger.error(f"Error reconciling tag usage counts: {e}")
+
+    # Load the in-memory solution search index, after the backfill so it has the rating statistics
+    if settings.SEARCH_BACKEND == "memory":
+        try:
+            await search_index.start(get_database().solutions)
+        except Exception as e:
+            logger.error(f"Error loading search index, falling back to $text search: {e}")
     
     yield
     # Shutdown
+    await search_index.stop()
+    await autocomplete_index.stop()
+    await history_recorder.stop()
+    close_cache_registry()
+    password_hasher.stop()
+    await close_http_client()
     await close_mongo_connection()
 
 app = FastAPI(
@@ -50,11 +112,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Counts MongoDB queries per request for the Server-Timing header and the query budget
+app.add_middleware(RequestContextMiddleware)
+
+# Request count and latency by route, added last so it also times the other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 @app.get("/", include_in_schema=False)
 async def root():
     """Redirect root path to API documentation"""
     return RedirectResponse(url="/docs")
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Request metrics in the Prometheus text exposition format"""
+        return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
+
 # Include routers
 app.include_router(api_router, prefix="/api")
 
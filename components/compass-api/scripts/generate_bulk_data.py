@@ -0,0 +1,90 @@
+"""
+Script to generate high volumes of test data directly in MongoDB for load testing.
+Unlike generate_test_data.py, which goes through the API one request at a time, this
+script writes with insert_many in concurrent batches:
+1. Optionally drop the existing users, solutions, categories, tags, ratings, comments and history
+2. Insert deterministic users, categories, tags, solutions, ratings, comments and history
+3. Create the indexes of the index manifest once the data is loaded
+
+The same --seed and scale always produce the same data.
+Seeded users can't log in, use the default admin created on API startup.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.indexes import ensure_indexes  # noqa: E402
+from benchmarks.seed import seed_database  # noqa: E402
+
+SEEDED_COLLECTIONS = ["users", "solutions", "categories", "tags", "ratings", "comments", "history"]
+
+
+async def generate(args: argparse.Namespace) -> None:
+    """Generate the data set described by the command line arguments."""
+    client = AsyncIOMotorClient(args.mongodb_url)
+    db = client[args.database]
+    try:
+        if args.drop:
+            for collection in SEEDED_COLLECTIONS:
+                await db[collection].drop()
+            print(f"Dropped {', '.join(SEEDED_COLLECTIONS)}")
+        elif await db.solutions.estimated_document_count():
+            raise SystemExit(f"Database '{args.database}' already has solutions, pass --drop to replace them")
+
+        start = time.perf_counter()
+
+        def report(solutions: int) -> None:
+            elapsed = time.perf_counter() - start
+            print(f"Generated {solutions}/{args.solutions} solutions ({solutions / elapsed:.0f}/s)")
+
+        counts = await seed_database(
+            db,
+            solutions=args.solutions,
+            ratings_per_solution=args.ratings_per_solution,
+            comments_per_solution=args.comments_per_solution,
+            history_per_solution=args.history_per_solution,
+            users=args.users,
+            tags=args.tags,
+            seed=args.seed,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            on_progress=report if args.solutions >= 10 * args.batch_size else None,
+        )
+        print(f"Inserted in {time.perf_counter() - start:.1f}s:")
+        for collection, count in counts.items():
+            print(f"  {collection}: {count}")
+
+        # Building indexes after the load is faster than maintaining them during it
+        if not args.skip_indexes:
+            index_start = time.perf_counter()
+            await ensure_indexes(db)
+            print(f"Created indexes in {time.perf_counter() - index_start:.1f}s")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate high volumes of test data directly in MongoDB")
+    parser.add_argument("--mongodb-url", default=settings.MONGODB_URL, help="MongoDB URL (default: MONGODB_URL)")
+    parser.add_argument("--database", default=settings.DATABASE_NAME, help="Database name (default: DATABASE_NAME)")
+    parser.add_argument("--solutions", type=int, default=100_000, help="Number of solutions")
+    parser.add_argument("--ratings-per-solution", type=int, default=10, help="Average ratings per solution")
+    parser.add_argument("--comments-per-solution", type=int, default=10, help="Average comments per solution")
+    parser.add_argument("--history-per-solution", type=int, default=5, help="History records per solution")
+    parser.add_argument("--users", type=int, default=1000, help="Number of users, also caps ratings per solution")
+    parser.add_argument("--tags", type=int, default=300, help="Number of tags")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed, the same seed generates the same data")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Documents per insert_many")
+    parser.add_argument("--concurrency", type=int, default=8, help="insert_many calls in flight")
+    parser.add_argument("--drop", action="store_true", help="Drop the seeded collections first")
+    parser.add_argument("--skip-indexes", action="store_true", help="Don't create indexes after loading")
+    args = parser.parse_args()
+    asyncio.run(generate(args))
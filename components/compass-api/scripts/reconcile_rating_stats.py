@@ -0,0 +1,42 @@
+"""
+Script to recompute the rating statistics stored on solution documents.
+Solutions keep rating, rating_sum, rating_count and rating_distribution up to date
+on every rating write, this script rebuilds them from the ratings collection:
+1. Backfill solutions that were created before the statistics were maintained
+2. Repair drift after manual changes to the ratings collection
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.mongodb import close_mongo_connection, connect_to_mongo  # noqa: E402
+from app.services.rating_service import RatingService  # noqa: E402
+
+
+async def reconcile(only_missing: bool) -> None:
+    """Reconcile rating statistics for all solutions or only those missing them."""
+    await connect_to_mongo()
+    try:
+        rating_service = RatingService()
+        if only_missing:
+            count = await rating_service.backfill_rating_stats()
+        else:
+            count = await rating_service.reconcile_rating_stats()
+        print(f"Reconciled rating statistics for {count} solutions")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute rating statistics stored on solutions")
+    parser.add_argument(
+        "--only-missing",
+        action="store_true",
+        help="Only backfill solutions that don't have rating statistics yet",
+    )
+    args = parser.parse_args()
+    asyncio.run(reconcile(args.only_missing))
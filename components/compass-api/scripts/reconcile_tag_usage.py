@@ -0,0 +1,29 @@
+"""
+Script to recompute the usage_count stored on tag documents.
+Tags keep usage_count up to date on every solution and tag write, this script
+rebuilds it from the approved solutions to repair drift after manual changes
+to the solutions collection.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.mongodb import close_mongo_connection, connect_to_mongo  # noqa: E402
+from app.services.tag_service import TagService  # noqa: E402
+
+
+async def reconcile() -> None:
+    """Reconcile usage counts for all tags."""
+    await connect_to_mongo()
+    try:
+        count = await TagService().reconcile_usage_counts()
+        print(f"Reconciled usage counts for {count} tags")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(reconcile())
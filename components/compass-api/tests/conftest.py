@@ -4,7 +4,8 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from fastapi.testclient import TestClient
 from main import app
 from app.core.config import settings
-from app.core.security import get_password_hash, create_access_token
+from app.core.password import get_password_hash
+from app.core.security import create_access_token
 from datetime import datetime, timedelta
 from bson import ObjectId
 from app.models.user import User
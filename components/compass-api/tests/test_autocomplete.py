@@ -0,0 +1,58 @@
+import pytest
+
+from app.core.autocomplete import PrefixIndex, normalize
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("Docker Compose", "docker compose"), ("  front-end_tools/UI ", "front end tools ui"), ("", "")],
+)
+def test_normalize(text, expected):
+    assert normalize(text) == expected
+
+
+def test_search_is_case_insensitive_and_sorted():
+    index = PrefixIndex(["Redis", "react", "RabbitMQ", "Kafka"])
+    assert index.search("r") == ["RabbitMQ", "react", "Redis"]
+    assert index.search("RE") == ["react", "Redis"]
+    assert index.search("x") == []
+    assert index.search(" ") == []
+
+
+def test_values_starting_with_prefix_come_before_inner_words():
+    index = PrefixIndex(["Docker Compose", "Compass", "Tech Compass"])
+    assert index.search("comp") == ["Compass", "Tech Compass", "Docker Compose"]
+    assert index.search("docker c") == ["Docker Compose"]
+
+
+def test_separators_match_spaces():
+    index = PrefixIndex(["spring-boot"])
+    assert index.search("spring b") == ["spring-boot"]
+    assert index.search("boot") == ["spring-boot"]
+
+
+def test_search_stops_at_limit_without_duplicates():
+    index = PrefixIndex([f"Service {i}" for i in range(20)] + ["Service Service"])
+    assert len(index.search("serv", limit=5)) == 5
+    results = index.search("service", limit=100)
+    assert len(results) == len(set(results)) == 21
+
+
+def test_values_are_reference_counted():
+    index = PrefixIndex(["Kafka", "Kafka"])
+    index.remove("Kafka")
+    assert index.search("ka") == ["Kafka"]
+    index.remove("Kafka")
+    assert index.search("ka") == []
+    index.remove("Kafka")
+    assert len(index) == 0
+
+
+def test_add_and_remove_keep_inner_words_in_sync():
+    index = PrefixIndex()
+    index.add("Docker Compose")
+    index.add("Compass")
+    assert index.search("comp") == ["Compass", "Docker Compose"]
+    index.remove("Docker Compose")
+    assert index.search("comp") == ["Compass"]
+    assert index.inner_words == []
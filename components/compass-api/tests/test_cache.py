@@ -0,0 +1,73 @@
+from cachetools import TTLCache
+
+from app.core.cache import CACHE_REGIONS, TAGS_CACHE, CacheRegion, CacheRegistry
+
+
+def test_region_counts_hits_and_misses():
+    region = CacheRegion("test", maxsize=10, ttl=60)
+    assert region.get("a") is None
+    region.set("a", 1)
+    assert region.get("a") == 1
+    assert region.stats()["hits"] == 1
+    assert region.stats()["misses"] == 1
+
+
+def test_region_caches_none():
+    region = CacheRegion("test", maxsize=10, ttl=60)
+    region.set("a", None)
+    assert region.get("a", "default") is None
+    assert region.hits == 1
+
+
+def test_region_evicts_least_recently_used():
+    region = CacheRegion("test", maxsize=2, ttl=60)
+    region.set("a", 1)
+    region.set("b", 2)
+    region.get("a")
+    region.set("c", 3)
+    assert region.get("b") is None
+    assert region.get("a") == 1
+    assert region.get("c") == 3
+
+
+def test_region_expires_entries():
+    now = [0.0]
+    region = CacheRegion("test", maxsize=10, ttl=60)
+    region.cache = TTLCache(maxsize=10, ttl=60, timer=lambda: now[0])
+    region.set("a", 1)
+    now[0] = 59
+    assert region.get("a") == 1
+    now[0] = 61
+    assert region.get("a") is None
+
+
+def test_region_invalidate_key_and_all():
+    region = CacheRegion("test", maxsize=10, ttl=60)
+    region.set("a", 1)
+    region.set("b", 2)
+    region.invalidate("a")
+    assert region.get("a") is None
+    assert region.get("b") == 2
+    region.invalidate()
+    assert region.get("b") is None
+    assert region.stats()["invalidations"] == 2
+
+
+def test_registry_creates_configured_regions_once():
+    registry = CacheRegistry()
+    region = registry.region(TAGS_CACHE)
+    assert registry.region(TAGS_CACHE) is region
+    assert (region.cache.maxsize, region.cache.ttl) == CACHE_REGIONS[TAGS_CACHE]
+    assert registry.region("unknown").cache.ttl == 3600
+
+
+def test_registry_invalidate_only_named_regions():
+    registry = CacheRegistry({"a": (10, 60), "b": (10, 60)})
+    registry.region("a").set("key", 1)
+    registry.region("b").set("key", 2)
+    registry.invalidate("a", "never-used")
+    assert registry.region("a").get("key") is None
+    assert registry.region("b").get("key") == 2
+    assert "never-used" not in registry.regions
+    registry.clear()
+    assert registry.region("b").get("key") is None
@@ -6,7 +6,7 @@ from app.models.category import Category, CategoryCreate, CategoryUpdate
 from app.services.category_service import CategoryService
 from app.models.user import User
 from app.core.auth import get_current_active_user
-from app.core.security import get_password_hash
+from app.core.password import get_password_hash
 from main import app
 
 pytestmark = pytest.mark.asyncio
@@ -0,0 +1,68 @@
+import pytest
+
+from app.core.search import FuzzyVocabulary, bounded_edit_distance, max_edit_distance
+from tests.test_search_index import loaded_index, solution_doc
+
+
+@pytest.mark.parametrize(
+    "source, target, distance",
+    [
+        ("kafka", "kafka", 0),
+        ("kafka", "kafkx", 1),
+        ("kafka", "kafk", 1),
+        ("kafka", "akfka", 2),
+        ("", "abc", 3),
+        ("kubernetes", "kuberentes", 2),
+    ],
+)
+def test_bounded_edit_distance_within_bound(source, target, distance):
+    assert bounded_edit_distance(source, target, 3) == distance
+    assert bounded_edit_distance(target, source, 3) == distance
+
+
+@pytest.mark.parametrize(
+    "source, target, max_distance",
+    [("kafka", "redis", 2), ("kafka", "kafkaesque", 2), ("abcdef", "badcfe", 2)],
+)
+def test_bounded_edit_distance_stops_past_bound(source, target, max_distance):
+    assert bounded_edit_distance(source, target, max_distance) == max_distance + 1
+
+
+@pytest.mark.parametrize("term, distance", [("k8s", 0), ("kafka", 1), ("postgres", 2)])
+def test_max_edit_distance(term, distance):
+    assert max_edit_distance(term) == distance
+
+
+def test_vocabulary_similar_terms():
+    vocabulary = FuzzyVocabulary()
+    vocabulary.add(["kafka", "kafkas", "redis", "postgres"])
+    assert vocabulary.similar_terms("kafkaz") == ["kafka", "kafkas"]
+    assert vocabulary.similar_terms("postgers") == ["postgres"]
+    assert vocabulary.similar_terms("k8x") == []
+
+
+def test_vocabulary_is_reference_counted():
+    vocabulary = FuzzyVocabulary()
+    assert vocabulary.add(["kafka"])
+    assert not vocabulary.add(["kafka"])
+    assert not vocabulary.remove(["kafka"])
+    assert "kafka" in vocabulary
+    assert vocabulary.remove(["kafka"])
+    assert "kafka" not in vocabulary
+    assert vocabulary.ngrams == {}
+
+
+async def test_fuzzy_search_corrects_misspelled_terms():
+    index = await loaded_index(solution_doc("Kafka Streams"), solution_doc("Redis"))
+    results, total = await index.search("kafkx streems", fuzzy=True)
+    assert [solution.name for solution in results] == ["Kafka Streams"]
+    assert total == 1
+    assert await index.search("kafkx streems") == ([], 0)
+
+
+async def test_fuzzy_corrections_follow_index_updates():
+    doc = solution_doc("Kafka")
+    index = await loaded_index(doc)
+    assert (await index.search("pulsr", fuzzy=True))[1] == 0
+    index.index_solution({**doc, "tags": ["pulsar"]})
+    assert (await index.search("pulsr", fuzzy=True))[1] == 1
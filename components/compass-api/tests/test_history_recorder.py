@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError, WriteError
+
+from app.core.history_recorder import HistoryRecorder
+
+
+class FakeCollection:
+    """Records the batches passed to insert_many, failing the first ones if asked to.
+    Documents in bad are rejected by every insert."""
+
+    def __init__(self, failures: int = 0, bad=()):
+        self.batches = []
+        self.inserted = []
+        self.failures = failures
+        self.bad = list(bad)
+
+    async def insert_many(self, documents, ordered=True):
+        if self.failures:
+            self.failures -= 1
+            raise AutoReconnect("connection reset")
+        errors = [
+            {"index": index, "code": 121, "errmsg": "validation failed"}
+            for index, document in enumerate(documents)
+            if document in self.bad
+        ]
+        written = [document for document in documents if document not in self.bad]
+        self.batches.append(written)
+        self.inserted.extend(written)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": []})
+
+    async def insert_one(self, document):
+        if document in self.bad:
+            raise WriteError("validation failed", 121)
+        self.inserted.append(document)
+
+
+@pytest.fixture
+def recorder():
+    recorder = HistoryRecorder()
+    recorder.batch_size = 3
+    recorder.flush_interval = 0.05
+    recorder.retry_backoff = 0.001
+    return recorder
+
+
+async def test_records_are_inserted_in_batches(recorder):
+    collection = FakeCollection()
+    recorder.start(collection)
+    await recorder.record([{"n": i} for i in range(7)])
+    await recorder.stop()
+
+    assert [len(batch) for batch in collection.batches] == [3, 3, 1]
+    assert [doc["n"] for batch in collection.batches for doc in batch] == list(range(7))
+    assert not recorder.running
+
+
+async def test_partial_batch_is_flushed_after_interval(recorder):
+    collection = FakeCollection()
+    recorder.start(collection)
+    await recorder.record([{"n": 1}])
+    await asyncio.sleep(recorder.flush_interval * 4)
+
+    assert collection.batches == [[{"n": 1}]]
+    await recorder.stop()
+
+
+async def test_failed_batches_are_retried(recorder):
+    collection = FakeCollection(failures=2)
+    recorder.start(collection)
+    await recorder.record([{"n": i} for i in range(3)])
+    await recorder.stop()
+
+    assert recorder.failed_count == 0
+    assert collection.inserted == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+
+async def test_only_failed_records_are_retried_and_then_dropped(recorder):
+    collection = FakeCollection(bad=[{"n": 1}])
+    recorder.start(collection)
+    await recorder.record([{"n": i} for i in range(3)])
+    await recorder.record([{"n": 3}])
+    await recorder.stop()
+
+    assert recorder.failed_count == 1
+    assert collection.inserted == [{"n": 0}, {"n": 2}, {"n": 3}]
+    # The batch, one retry per attempt for the failed record, then the next batch
+    assert len(collection.batches) == recorder.retries + 2
+
+
+async def test_records_are_written_one_by_one_when_retries_are_exhausted(recorder):
+    collection = FakeCollection(failures=recorder.retries + 1)
+    recorder.start(collection)
+    await recorder.record([{"n": i} for i in range(3)])
+    await recorder.stop()
+
+    assert recorder.failed_count == 0
+    assert collection.batches == []
+    assert collection.inserted == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+
+async def test_start_is_idempotent(recorder):
+    collection = FakeCollection()
+    recorder.start(collection)
+    worker = recorder.worker
+    recorder.start(FakeCollection())
+    assert recorder.worker is worker
+    await recorder.stop()
+    await recorder.stop()
@@ -0,0 +1,130 @@
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.metrics import (
+    UNMATCHED_ROUTE,
+    Counter,
+    Gauge,
+    Histogram,
+    Metric,
+    MetricsMiddleware,
+    MetricsRegistry,
+    http_requests_in_progress,
+    http_requests_total,
+)
+
+
+def test_metric_requires_samples():
+    with pytest.raises(TypeError):
+        Metric("test", "Test")
+
+
+def test_counter_render():
+    counter = Counter("requests_total", "Total requests", ("method", "status"))
+    counter.inc(("GET", "200"))
+    counter.inc(("GET", "200"), 2)
+    counter.inc(("POST", "500"), 0.5)
+    assert counter.render() == [
+        "# HELP requests_total Total requests",
+        "# TYPE requests_total counter",
+        'requests_total{method="GET",status="200"} 3',
+        'requests_total{method="POST",status="500"} 0.5',
+    ]
+
+
+def test_gauge_without_labels():
+    gauge = Gauge("in_progress", "Requests in progress")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert gauge.render()[1:] == ["# TYPE in_progress gauge", "in_progress 1"]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("errors_total", "Errors", ("message",))
+    counter.inc(('say "hi"\\\n',))
+    assert counter.samples() == ['errors_total{message="say \\"hi\\"\\\\\\n"} 1']
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.5, 0.1))
+    for value in (0.05, 0.1, 0.3, 2.0):
+        histogram.observe(("/a",), value)
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="0.5"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 2.45',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_registry_renders_every_metric_and_rejects_duplicates():
+    registry = MetricsRegistry()
+    registry.counter("a_total", "A").inc()
+    registry.histogram("b_seconds", "B", buckets=(1.0,))
+    assert registry.render() == "# HELP a_total A\n# TYPE a_total counter\na_total 1\n" + (
+        "# HELP b_seconds B\n# TYPE b_seconds histogram\n"
+    )
+    with pytest.raises(ValueError):
+        registry.gauge("a_total", "Again")
+
+
+async def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    before = http_requests_total.values.get(("GET", "/items/{item_id}", "200"), 0)
+    unmatched_before = http_requests_total.values.get(("GET", UNMATCHED_ROUTE, "404"), 0)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/items/1")).status_code == 200
+        assert (await client.get("/items/2")).status_code == 200
+        assert (await client.get("/missing")).status_code == 404
+
+    assert http_requests_total.values[("GET", "/items/{item_id}", "200")] == before + 2
+    assert http_requests_total.values[("GET", UNMATCHED_ROUTE, "404")] == unmatched_before + 1
+    assert http_requests_in_progress.values[("GET",)] == 0
+
+
+def test_updates_from_threads_are_not_lost():
+    counter = Counter("calls_total", "Calls", ("thread",))
+    histogram = Histogram("call_seconds", "Calls", ("thread",), buckets=(1.0,))
+    done = threading.Event()
+    errors = []
+
+    def update(thread):
+        for _ in range(5000):
+            counter.inc((str(thread % 2),))
+            counter.inc((f"new-{thread}-{_ % 50}",))
+            histogram.observe((str(thread % 2),), 0.5)
+
+    def render():
+        while not done.is_set():
+            try:
+                counter.samples()
+                histogram.samples()
+            except RuntimeError as e:
+                errors.append(e)
+
+    renderer = threading.Thread(target=render)
+    renderer.start()
+    threads = [threading.Thread(target=update, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    renderer.join()
+
+    assert errors == []
+    assert counter.values[("0",)] + counter.values[("1",)] == 8 * 5000
+    assert sum(sum(counts) for counts, _ in histogram.values.values()) == 8 * 5000
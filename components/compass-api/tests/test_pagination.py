@@ -0,0 +1,158 @@
+import base64
+
+import pytest
+from bson import ObjectId, json_util
+from pymongo import ASCENDING, DESCENDING
+
+from app.core.pagination import (
+    apply_cursor,
+    count_page_total,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    keyset_sort,
+    next_page_cursor,
+)
+
+
+def sort_key(doc, field):
+    """Sort key of a document as MongoDB orders it: missing and null before any value"""
+    value = doc.get(field)
+    return (value is not None, value if value is not None else 0, doc["_id"])
+
+
+def matches(doc, query):
+    """Evaluate the subset of the query language used by keyset filters"""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+            continue
+        if key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+            continue
+        value = doc.get(key)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        for op, operand in condition.items():
+            if op == "$ne" and value == operand:
+                return False
+            if op in ("$gt", "$lt") and (value is None or operand is None):
+                return False
+            if op == "$gt" and not value > operand:
+                return False
+            if op == "$lt" and not value < operand:
+                return False
+    return True
+
+
+def paginate(docs, field, direction, limit):
+    """Walk all pages of docs with keyset cursors and return the items in page order"""
+    ordered = sorted(docs, key=lambda doc: sort_key(doc, field), reverse=direction == DESCENDING)
+    seen, cursor = [], None
+    while True:
+        candidates = [doc for doc in ordered if not cursor or matches(doc, keyset_filter(field, direction, cursor))]
+        page = candidates[:limit]
+        seen.extend(page)
+        cursor = next_page_cursor(page, limit, field if direction == ASCENDING else f"-{field}")
+        if cursor is None:
+            return ordered, seen
+
+
+def test_cursor_round_trip():
+    object_id = ObjectId()
+    assert decode_cursor(encode_cursor(4.5, object_id)) == (4.5, object_id)
+    assert decode_cursor(encode_cursor(None, object_id)) == (None, object_id)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("a/b+c?d", ObjectId())
+    assert "=" not in cursor
+    assert "/" not in cursor and "+" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30", encode_cursor(1, ObjectId())[:-4]])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_decode_cursor_requires_object_id():
+    cursor = base64.urlsafe_b64encode(json_util.dumps({"v": 1, "id": "abc"}).encode()).decode()
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_keyset_filter_ascending():
+    object_id = ObjectId()
+    query = keyset_filter("name", ASCENDING, encode_cursor("b", object_id))
+    assert query == {"$or": [{"name": {"$gt": "b"}}, {"name": "b", "_id": {"$gt": object_id}}]}
+
+
+def test_keyset_filter_descending_includes_nulls():
+    object_id = ObjectId()
+    query = keyset_filter("name", DESCENDING, encode_cursor("b", object_id))
+    assert query == {
+        "$or": [{"$or": [{"name": {"$lt": "b"}}, {"name": None}]}, {"name": "b", "_id": {"$lt": object_id}}]
+    }
+
+
+def test_keyset_filter_null_cursor():
+    object_id = ObjectId()
+    ascending = keyset_filter("name", ASCENDING, encode_cursor(None, object_id))
+    assert ascending == {"$or": [{"name": None, "_id": {"$gt": object_id}}, {"name": {"$ne": None}}]}
+    descending = keyset_filter("name", DESCENDING, encode_cursor(None, object_id))
+    assert descending == {"name": None, "_id": {"$lt": object_id}}
+
+
+@pytest.mark.parametrize("direction", [ASCENDING, DESCENDING])
+@pytest.mark.parametrize("limit", [1, 2, 3, 10])
+def test_pages_visit_every_item_once(direction, limit):
+    values = [3, None, 1, 3, None, 2, 1, None]
+    docs = [{"_id": ObjectId(), "score": value} for value in values]
+    docs.append({"_id": ObjectId()})
+    ordered, seen = paginate(docs, "score", direction, limit)
+    assert [doc["_id"] for doc in seen] == [doc["_id"] for doc in ordered]
+
+
+def test_apply_cursor():
+    assert apply_cursor({"a": 1}, "name", ASCENDING, None) == {"a": 1}
+    cursor = encode_cursor("b", ObjectId())
+    keyset = keyset_filter("name", ASCENDING, cursor)
+    assert apply_cursor({}, "name", ASCENDING, cursor) == keyset
+    assert apply_cursor({"a": 1}, "name", ASCENDING, cursor) == {"$and": [{"a": 1}, keyset]}
+
+
+def test_keyset_sort_breaks_ties_by_id():
+    assert keyset_sort("name", DESCENDING) == [("name", DESCENDING), ("_id", DESCENDING)]
+
+
+def test_next_page_cursor():
+    docs = [{"_id": ObjectId(), "name": name} for name in ("a", "b")]
+    assert next_page_cursor(docs, 3, "name") is None
+    assert next_page_cursor([], 3, "name") is None
+    assert decode_cursor(next_page_cursor(docs, 2, "-name")) == ("b", docs[1]["_id"])
+
+
+class CountingCollection:
+    def __init__(self):
+        self.calls = []
+
+    async def estimated_document_count(self):
+        self.calls.append("estimated_document_count")
+        return 100
+
+    async def count_documents(self, query):
+        self.calls.append("count_documents")
+        return 10
+
+
+async def test_count_page_total():
+    collection = CountingCollection()
+    assert await count_page_total(collection, {"a": 1}, None) == 10
+    assert await count_page_total(collection, {}, None) == 100
+    assert await count_page_total(collection, {"a": 1}, encode_cursor(1, ObjectId())) is None
+    assert collection.calls == ["count_documents", "estimated_document_count"]
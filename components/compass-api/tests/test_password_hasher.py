@@ -0,0 +1,28 @@
+import asyncio
+import threading
+
+from app.core.password import PasswordHasher, password_hash_pending, password_hash_wait_seconds
+
+
+def observed_count():
+    counts, _ = password_hash_wait_seconds.values.get((), ([0], [0.0]))
+    return sum(counts)
+
+
+async def test_run_records_wait_and_pending():
+    hasher = PasswordHasher()
+    before = observed_count()
+    release = threading.Event()
+
+    try:
+        calls = [asyncio.create_task(hasher.run(release.wait, 5)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert password_hash_pending.values[()] >= 3
+        release.set()
+        assert await asyncio.gather(*calls) == [True, True, True]
+    finally:
+        hasher.stop()
+
+    assert password_hash_pending.values[()] == 0
+    assert observed_count() == before + 3
+    assert "password_hash_wait_seconds_count" in "\n".join(password_hash_wait_seconds.render())
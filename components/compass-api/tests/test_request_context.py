@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import re
+from datetime import timedelta
+
+import httpx
+from fastapi import FastAPI
+from pymongo import monitoring
+
+from app.core.command_monitor import CommandMonitor
+from app.core.config import settings
+from app.core.request_context import RequestContextMiddleware
+
+SERVER_TIMING = re.compile(r'^db;dur=([\d.]+);desc="(\d+) queries", total;dur=([\d.]+)$')
+
+
+def run_command(monitor: CommandMonitor, request_id: int, duration_ms: float) -> None:
+    """Send the listener events of one find command, as Motor does from its executor threads"""
+    address = ("localhost", 27017)
+    monitor.started(monitoring.CommandStartedEvent({"find": "solutions"}, "test", request_id, address, request_id))
+    monitor.succeeded(
+        monitoring.CommandSucceededEvent(
+            timedelta(milliseconds=duration_ms), {"ok": 1}, "find", request_id, address, request_id
+        )
+    )
+
+
+def make_app(monitor: CommandMonitor) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/queries/{count}")
+    async def make_queries(count: int):
+        # asyncio.to_thread copies the context like Motor's executor, so the listener sees the request
+        await asyncio.gather(*(asyncio.to_thread(run_command, monitor, i, 5) for i in range(count)))
+        return {"count": count}
+
+    return app
+
+
+async def request(app: FastAPI, path: str) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path)
+
+
+async def test_server_timing_counts_the_queries_of_the_request(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+    app = make_app(CommandMonitor(slow_command_ms=0))
+
+    response = await request(app, "/queries/3")
+
+    match = SERVER_TIMING.match(response.headers["server-timing"])
+    assert match is not None
+    db_ms, queries, total_ms = float(match.group(1)), int(match.group(2)), float(match.group(3))
+    assert queries == 3
+    assert db_ms == 15.0
+    assert total_ms > 0
+
+
+async def test_server_timing_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", False)
+    response = await request(make_app(CommandMonitor(slow_command_ms=0)), "/queries/1")
+    assert "server-timing" not in response.headers
+
+
+async def test_requests_over_the_query_budget_are_logged(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "REQUEST_QUERY_BUDGET", 2)
+    app = make_app(CommandMonitor(slow_command_ms=0))
+
+    with caplog.at_level(logging.WARNING, logger="app.core.request_context"):
+        await request(app, "/queries/2")
+        assert caplog.records == []
+        await request(app, "/queries/3")
+
+    assert len(caplog.records) == 1
+    assert "GET /queries/3 made 3 MongoDB queries" in caplog.records[0].getMessage()
+
+
+async def test_commands_outside_requests_are_monitored_without_a_request():
+    monitor = CommandMonitor(slow_command_ms=0)
+    run_command(monitor, 1, 5)
+    assert monitor.pending == {}
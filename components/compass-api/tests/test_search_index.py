@@ -0,0 +1,188 @@
+import threading
+
+from bson import ObjectId
+
+from app.core.search import InvertedIndex, SolutionSearchIndex, tokenize
+
+
+def solution_doc(name, recommend_status="ADOPT", rating=0.0, **fields):
+    doc = {
+        "_id": ObjectId(),
+        "name": name,
+        "slug": name.lower().replace(" ", "-"),
+        "description": "",
+        "brief": "",
+        "department": "Engineering",
+        "team": "Platform",
+        "recommend_status": recommend_status,
+        "review_status": "APPROVED",
+        "rating": rating,
+    }
+    doc.update(fields)
+    return doc
+
+
+class FakeCursor:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def to_list(self, length=None):
+        documents = [doc for doc in self.collection.documents if doc["review_status"] == "APPROVED"]
+        if self.collection.during_find is not None:
+            self.collection.during_find()
+        return documents
+
+
+class FakeCollection:
+    """Serves the approved documents, optionally running a callback while the query is in flight"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.during_find = None
+
+    def find(self, query):
+        return FakeCursor(self)
+
+
+async def loaded_index(*docs):
+    index = SolutionSearchIndex()
+    await index.load(FakeCollection(list(docs)))
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Redis-Cluster, v2 CACHE") == ["redis", "cluster", "v2", "cache"]
+
+
+def test_bm25_field_weights():
+    index = InvertedIndex({"name": 10, "pros": 1})
+    index.add("name", {"name": "kafka", "pros": "fast"})
+    index.add("pros", {"name": "queue", "pros": "kafka compatible"})
+    scores = index.score(["kafka"])
+    assert scores["name"] > scores["pros"] > 0
+
+
+def test_bm25_rare_terms_score_higher():
+    index = InvertedIndex({"name": 1})
+    index.add("a", {"name": "common rare"})
+    index.add("b", {"name": "common"})
+    index.add("c", {"name": "common"})
+    scores_common = index.score(["common"])
+    scores_rare = index.score(["rare"])
+    assert set(scores_common) == {"a", "b", "c"}
+    assert set(scores_rare) == {"a"}
+    assert scores_rare["a"] > scores_common["a"]
+
+
+def test_bm25_length_normalization():
+    index = InvertedIndex({"name": 1})
+    index.add("short", {"name": "kafka"})
+    index.add("long", {"name": "kafka with many other words in the name"})
+    scores = index.score(["kafka"])
+    assert scores["short"] > scores["long"]
+
+
+def test_inverted_index_update_and_remove():
+    index = InvertedIndex({"name": 1})
+    index.add("a", {"name": "kafka"})
+    index.add("a", {"name": "pulsar"})
+    assert index.score(["kafka"]) == {}
+    assert set(index.score(["pulsar"])) == {"a"}
+    assert len(index) == 1
+
+    index.remove("a")
+    index.remove("missing")
+    assert index.score(["pulsar"]) == {}
+    assert index.postings == {}
+    assert index.total_length == 0
+
+
+async def test_search_ranks_by_status_then_relevance_then_rating():
+    hold = solution_doc("Kafka", recommend_status="HOLD")
+    weak = solution_doc("Queue", brief="kafka", rating=1.0)
+    strong = solution_doc("Kafka Streams")
+    rated = solution_doc("Kafka Connect", rating=5.0)
+    index = await loaded_index(hold, weak, strong, rated)
+
+    results, total = await index.search("kafka")
+
+    assert total == 4
+    assert [solution.name for solution in results] == ["Kafka Connect", "Kafka Streams", "Queue", "Kafka"]
+
+
+async def test_search_top_k_and_pagination():
+    docs = [solution_doc(f"Service {i}", rating=float(i)) for i in range(10)]
+    index = await loaded_index(*docs)
+
+    everything, total = await index.search("service", limit=100)
+    first, first_total = await index.search("service", skip=0, limit=3)
+    second, _ = await index.search("service", skip=3, limit=3)
+    last, _ = await index.search("service", skip=9, limit=3)
+
+    assert total == first_total == 10
+    assert [solution.name for solution in everything] == [f"Service {i}" for i in range(9, -1, -1)]
+    assert first + second == everything[:6]
+    assert last == everything[9:]
+
+
+async def test_search_excludes_unapproved_solutions():
+    pending = solution_doc("Kafka", review_status="PENDING")
+    index = await loaded_index(pending)
+    assert await index.search("kafka") == ([], 0)
+
+
+async def test_incremental_update_and_delete():
+    doc = solution_doc("Kafka")
+    index = await loaded_index(doc)
+
+    index.index_solution({**doc, "name": "Pulsar"})
+    assert (await index.search("kafka"))[1] == 0
+    assert [solution.name for solution in (await index.search("pulsar"))[0]] == ["Pulsar"]
+
+    index.update_rating(doc["slug"], 4.5, 2)
+    assert index.solutions[str(doc["_id"])].rating == 4.5
+
+    index.index_solution({**doc, "review_status": "REJECTED"})
+    assert await index.search("pulsar") == ([], 0)
+
+    added = solution_doc("Redis")
+    index.index_solution(added)
+    index.remove_solution(str(added["_id"]))
+    assert await index.search("redis") == ([], 0)
+    assert index.solutions == {}
+    assert index.slugs == {}
+
+
+async def test_writes_during_rebuild_are_replayed():
+    kept = solution_doc("Kafka")
+    deleted = solution_doc("Redis")
+    collection = FakeCollection([kept, deleted])
+    index = await loaded_index(kept, deleted)
+
+    added = solution_doc("Pulsar")
+
+    def write_during_rebuild():
+        index.index_solution(added)
+        index.remove_solution(str(deleted["_id"]))
+        index.update_rating(kept["slug"], 3.0, 1)
+
+    collection.during_find = write_during_rebuild
+    await index.load(collection)
+
+    assert {solution.name for solution in index.solutions.values()} == {"Kafka", "Pulsar"}
+    assert index.solutions[str(kept["_id"])].rating == 3.0
+    assert index.rebuild_writes is None
+
+
+async def test_rebuild_runs_off_the_event_loop(monkeypatch):
+    threads = []
+    build = SolutionSearchIndex._build
+
+    def record_thread(docs):
+        threads.append(threading.current_thread())
+        return build(docs)
+
+    monkeypatch.setattr(SolutionSearchIndex, "_build", staticmethod(record_thread))
+    index = await loaded_index(solution_doc("Kafka"))
+    assert threads and threads[0] is not threading.main_thread()
+    assert index.ready
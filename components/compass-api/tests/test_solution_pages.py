@@ -0,0 +1,133 @@
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from app.core.pagination import encode_cursor, keyset_filter
+from app.services.solution_service import SolutionService
+
+
+class FakeCursor:
+    """Records the cursor modifiers and returns up to limit of the given documents"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.modifiers = {}
+
+    def sort(self, keys):
+        self.modifiers["sort"] = keys
+        return self
+
+    def skip(self, skip):
+        self.modifiers["skip"] = skip
+        return self
+
+    def limit(self, limit):
+        self.modifiers["limit"] = limit
+        return self
+
+    async def to_list(self, length=None):
+        return self.documents[: self.modifiers.get("limit")]
+
+
+class FakeCollection:
+    """Records the queries run against the solutions collection"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.calls = []
+        self.cursors = []
+
+    def find(self, query):
+        self.calls.append(("find", query))
+        self.cursors.append(FakeCursor(self.documents))
+        return self.cursors[-1]
+
+    async def count_documents(self, query):
+        self.calls.append(("count_documents", query))
+        return len(self.documents)
+
+    def aggregate(self, pipeline, **kwargs):
+        self.calls.append(("aggregate", pipeline))
+        facet = pipeline[-1]["$facet"]
+        result = {"items": self.documents[: facet["items"][-1]["$limit"]]} if "items" in facet else {}
+        if "total" in facet:
+            result["total"] = [{"count": len(self.documents)}]
+        if "category" in facet:
+            result["category"] = [{"_id": "Data", "count": 2}]
+        return FakeCursor([result])
+
+
+def solution_service(documents):
+    service = SolutionService.__new__(SolutionService)
+    service.collection = FakeCollection(documents)
+    return service
+
+
+async def test_cursor_page_reads_only_the_page():
+    docs = [{"_id": ObjectId(), "name": name} for name in ("a", "b", "c")]
+    service = solution_service(docs)
+    cursor = encode_cursor("a", ObjectId())
+
+    page, total, facets = await service._find_solutions(limit=2, category="Data", sort="name", cursor=cursor)
+
+    find, count = service.collection.calls
+    # The keyset condition is part of the find filter, next to the filters, so it can use the indexes
+    assert find == ("find", {"$and": [{"category": "Data"}, keyset_filter("name", ASCENDING, cursor)]})
+    assert service.collection.cursors[0].modifiers == {"sort": [("name", ASCENDING), ("_id", ASCENDING)], "limit": 2}
+    # The total counts every match of the filters, not just the items after the cursor
+    assert count == ("count_documents", {"category": "Data"})
+    assert page == docs[:2]
+    assert (total, facets) == (3, None)
+
+
+async def test_offset_page_is_one_aggregation():
+    docs = [{"_id": ObjectId(), "name": name} for name in ("a", "b", "c")]
+    service = solution_service(docs)
+
+    page, total, facets = await service._find_solutions(skip=20, limit=2, category="Data", sort="-rating")
+
+    [(kind, pipeline)] = service.collection.calls
+    assert kind == "aggregate"
+    assert pipeline[:2] == [{"$match": {"category": "Data"}}, {"$sort": {"rating": DESCENDING, "_id": DESCENDING}}]
+    assert pipeline[2]["$facet"] == {
+        "items": [{"$skip": 20}, {"$limit": 2}],
+        "total": [{"$count": "count"}],
+    }
+    assert page == docs[:2]
+    assert (total, facets) == (3, None)
+
+
+async def test_offset_page_without_total():
+    service = solution_service([])
+
+    _, total, _ = await service._find_solutions(skip=20, limit=10, include_total=False)
+
+    [(_, pipeline)] = service.collection.calls
+    assert pipeline[2]["$facet"] == {"items": [{"$skip": 20}, {"$limit": 10}]}
+    assert total is None
+
+
+async def test_offset_page_counts_facets_in_the_same_aggregation():
+    service = solution_service([{"_id": ObjectId(), "name": "a"}])
+
+    _, total, facets = await service._find_solutions(include_facets=True)
+
+    [(_, pipeline)] = service.collection.calls
+    assert {"items", "total", "category"} <= set(pipeline[2]["$facet"])
+    assert total == 1
+    assert facets["category"] == [{"value": "Data", "count": 2}]
+
+
+async def test_cursor_page_counts_facets_with_the_total_in_one_aggregation():
+    docs = [{"_id": ObjectId(), "name": "a"}, {"_id": ObjectId(), "name": "b"}]
+    service = solution_service(docs)
+    cursor = encode_cursor("a", ObjectId())
+
+    _, total, facets = await service._find_solutions(category="Data", cursor=cursor, include_facets=True)
+
+    kinds = [kind for kind, _ in service.collection.calls]
+    assert kinds == ["find", "aggregate"]
+    pipeline = service.collection.calls[1][1]
+    assert pipeline[0] == {"$match": {"category": "Data"}}
+    assert "items" not in pipeline[1]["$facet"]
+    assert total == 2
+    assert facets["category"] == [{"value": "Data", "count": 2}]
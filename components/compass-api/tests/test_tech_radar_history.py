@@ -0,0 +1,162 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.models.tech_radar import TechRadarData
+from app.services import tech_radar_service
+from app.services.tech_radar_service import TechRadarService, period_bounds
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, keys):
+        for key, direction in reversed(keys):
+            self.documents.sort(key=lambda doc: doc[key], reverse=direction < 0)
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    """Returns the stored documents from find, applying only the created_at bound of the filter.
+    aggregate records the pipeline and returns the given results."""
+
+    def __init__(self, documents, results=()):
+        self.documents = documents
+        self.results = list(results)
+        self.pipelines = []
+
+    async def find_one(self, query, projection=None):
+        created_at = query.get("created_at")
+        if created_at is None:
+            return next((doc for doc in self.documents if doc["_id"] == query["_id"]), None)
+        return next((doc for doc in self.documents if doc["created_at"] < created_at["$lt"]), None)
+
+    async def replace_one(self, query, document, upsert=False):
+        raise AssertionError("past radars must not be stored")
+
+    def aggregate(self, pipeline, **options):
+        self.pipelines.append((pipeline, options))
+        return FakeCursor(self.results)
+
+    def find(self, query, projection=None):
+        created_at = query.get("created_at", {})
+        if "$gte" in created_at:
+            documents = [doc for doc in self.documents if doc["created_at"] >= created_at["$gte"]]
+        else:
+            documents = [doc for doc in self.documents if doc["created_at"] < created_at["$not"]["$gte"]]
+        return FakeCursor([dict(doc) for doc in documents])
+
+
+class FakeDatabase(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+def change(solution_id, created_at, **fields):
+    return {
+        "_id": ObjectId(),
+        "object_id": str(solution_id),
+        "created_at": created_at,
+        "changed_fields": [
+            {"field_name": name, "old_value": old, "new_value": new} for name, (old, new) in fields.items()
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "period, start, end",
+    [
+        ("2024-01", datetime(2024, 1, 1), datetime(2024, 2, 1)),
+        ("2024-12", datetime(2024, 12, 1), datetime(2025, 1, 1)),
+    ],
+)
+def test_period_bounds(period, start, end):
+    assert period_bounds(period) == (start, end)
+
+
+async def test_get_solutions_at_reverts_later_changes(monkeypatch):
+    moved, created_later = ObjectId(), ObjectId()
+    solutions = [
+        {"_id": moved, "name": "B", "recommend_status": "ADOPT", "created_at": datetime(2024, 1, 5)},
+        {"_id": created_later, "name": "C", "recommend_status": "HOLD", "created_at": datetime(2024, 3, 2)},
+    ]
+    history = [
+        change(moved, datetime(2024, 1, 20), recommend_status=("ASSESS", "TRIAL")),
+        change(moved, datetime(2024, 2, 10), recommend_status=("TRIAL", "ADOPT")),
+        change(moved, datetime(2024, 2, 20), name=("A", "B")),
+    ]
+    database = FakeDatabase(
+        solutions=FakeCollection(solutions),
+        categories=FakeCollection([]),
+        history=FakeCollection(history),
+        tech_radar_snapshots=FakeCollection([]),
+    )
+    monkeypatch.setattr(tech_radar_service, "get_database", lambda: database)
+
+    result = await TechRadarService().get_solutions_at(datetime(2024, 2, 1))
+
+    assert len(result) == 1
+    assert result[0]["_id"] == moved
+    assert result[0]["name"] == "A"
+    assert result[0]["recommend_status"] == "TRIAL"
+
+
+async def test_period_start_statuses_follow_the_history_index(monkeypatch):
+    solution_id = str(ObjectId())
+    history = FakeCollection(
+        [], results=[{"_id": solution_id, "change": {"field_name": "recommend_status", "old_value": "TRIAL"}}]
+    )
+    database = FakeDatabase(
+        solutions=FakeCollection([]),
+        categories=FakeCollection([]),
+        history=history,
+        tech_radar_snapshots=FakeCollection([]),
+    )
+    monkeypatch.setattr(tech_radar_service, "get_database", lambda: database)
+
+    statuses = await TechRadarService().get_period_start_statuses(*period_bounds("2024-02"))
+
+    assert statuses == {solution_id: "TRIAL"}
+    [(pipeline, options)] = history.pipelines
+    assert options == {"allowDiskUse": True}
+    # Sorted like the (object_type, object_id, created_at DESC, _id DESC) index, so the oldest change is last
+    assert list(pipeline[1]["$sort"].items()) == [("object_id", 1), ("created_at", -1), ("_id", -1)]
+    assert pipeline[2]["$group"]["changed_fields"] == {"$last": "$changed_fields"}
+
+
+async def test_past_radars_are_rebuilt_without_being_stored(monkeypatch):
+    history = [change(ObjectId(), datetime(2024, 1, 20), recommend_status=("ASSESS", "TRIAL"))]
+    database = FakeDatabase(
+        solutions=FakeCollection([]),
+        categories=FakeCollection([]),
+        history=FakeCollection(history),
+        tech_radar_snapshots=FakeCollection([]),
+    )
+    monkeypatch.setattr(tech_radar_service, "get_database", lambda: database)
+    built = []
+
+    async def build_tech_radar_data(self, date=None):
+        built.append(date)
+        return TechRadarData(date=date, entries=[])
+
+    monkeypatch.setattr(TechRadarService, "build_tech_radar_data", build_tech_radar_data)
+    service = TechRadarService()
+
+    data, etag = await service.get_tech_radar_snapshot("2024-01")
+    assert data.date == "2024-01"
+    assert etag == (await service.get_tech_radar_snapshot("2024-01"))[1]
+    assert built == ["2024-01", "2024-01"]
+
+    # Months before the first history record can't be rebuilt
+    assert await service.get_tech_radar_snapshot("2023-12") is None
+    assert await service.get_tech_radar_snapshot("9999-01") is None
+    assert built == ["2024-01", "2024-01"]
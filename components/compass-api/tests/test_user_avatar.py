@@ -0,0 +1,47 @@
+import httpx
+import pytest
+
+from app.core.cache import CacheRegion
+from app.core.config import settings
+from app.services import user_service
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "AVATAR_SERVER_ENABLED", True)
+    monkeypatch.setattr(settings, "AVATAR_SERVER_URL", "https://avatars.example.com/{username}.png")
+    service = UserService.__new__(UserService)
+    service.avatar_cache = CacheRegion("avatars", maxsize=10, ttl=60)
+    return service
+
+
+def serve_avatars(monkeypatch, handler):
+    requests = []
+
+    def record(request):
+        requests.append(request)
+        return handler(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    monkeypatch.setattr(user_service, "get_http_client", lambda: client)
+    return requests
+
+
+async def test_external_avatar_is_fetched_and_cached(service, monkeypatch):
+    requests = serve_avatars(
+        monkeypatch, lambda request: httpx.Response(200, content=b"png", headers={"content-type": "image/png"})
+    )
+
+    assert await service.get_user_avatar("alice") == (b"png", "image/png")
+    assert await service.get_user_avatar("alice") == (b"png", "image/png")
+    assert [str(request.url) for request in requests] == ["https://avatars.example.com/alice.png"]
+
+
+async def test_external_avatar_falls_back_to_svg(service, monkeypatch):
+    serve_avatars(monkeypatch, lambda request: httpx.Response(404))
+
+    content, media_type = await service.get_user_avatar("alice")
+
+    assert media_type == "image/svg+xml"
+    assert "<svg" in content